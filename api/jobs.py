@@ -0,0 +1,505 @@
+# api/jobs.py
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from api.models import (
+    BatchJob, BatchJobStatus, ResumeScreeningJobInput, ScreeningCriteria, SentimentAnalysisJobInput, SentimentResult,
+    SentimentType
+)
+from src.utils.concurrency import iter_bounded
+from src.utils.result_writer import IncrementalResultWriter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_JOBS_DIR = os.path.join('.cache', 'jobs')
+# A running job's lease is renewed every LEASE_SECONDS / 3; when it lapses the job is requeued
+LEASE_SECONDS = 60
+# Progress is written at most this often per job
+PROGRESS_INTERVAL_SECONDS = 1.0
+# A job whose lease lapses this many times (it keeps killing or wedging its worker) is failed, not requeued
+MAX_JOB_ATTEMPTS = 3
+
+JOB_INPUT_MODELS = {
+    'resume_screening': (ResumeScreeningJobInput, 'resumes'),
+    'sentiment_analysis': (SentimentAnalysisJobInput, 'texts'),
+}
+
+
+class LeaseLost(Exception):
+    """Another worker took over the job (our lease lapsed)"""
+
+
+class JobStore:
+    """SQLite job queue shared by the API workers; claimed jobs are held by a renewed lease and resume from their result rows"""
+
+    def __init__(self, directory: str = None, max_attempts: int = None):
+        self.directory = directory or os.getenv('JOBS_DIR', DEFAULT_JOBS_DIR)
+        self.max_attempts = max_attempts or int(os.getenv('JOB_MAX_ATTEMPTS', str(MAX_JOB_ATTEMPTS)))
+        self.path = os.path.join(self.directory, 'jobs.sqlite')
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(self.directory, exist_ok=True)
+            # Autocommit mode, so claim() can take the write lock up front with BEGIN IMMEDIATE
+            self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+            self._conn.row_factory = sqlite3.Row
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS jobs ('
+                'job_id TEXT PRIMARY KEY, job_type TEXT NOT NULL, status TEXT NOT NULL, '
+                'created_at REAL NOT NULL, started_at REAL, completed_at REAL, '
+                'total_items INTEGER NOT NULL, processed_items INTEGER NOT NULL DEFAULT 0, '
+                'input_data TEXT NOT NULL, callback_url TEXT, callback_status TEXT, error_message TEXT, '
+                'worker_id TEXT, lease_expires_at REAL, attempts INTEGER NOT NULL DEFAULT 0)'
+            )
+            self._conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, created_at)')
+        return self._conn
+
+    def result_path(self, job_id: str) -> str:
+        return os.path.join(self.directory, f'{job_id}.jsonl')
+
+    def create(self, job_type: str, input_data: Dict, total_items: int, callback_url: str = None) -> str:
+        job_id = str(uuid.uuid4())
+        with self._lock:
+            self._connect().execute(
+                'INSERT INTO jobs (job_id, job_type, status, created_at, total_items, input_data, callback_url) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (job_id, job_type, BatchJobStatus.PENDING.value, time.time(), total_items,
+                 json.dumps(input_data), callback_url)
+            )
+        return job_id
+
+    def get(self, job_id: str) -> Optional[sqlite3.Row]:
+        with self._lock:
+            return self._connect().execute('SELECT * FROM jobs WHERE job_id = ?', (job_id,)).fetchone()
+
+    def list(self, status: str = None, limit: int = 50) -> List[sqlite3.Row]:
+        query = 'SELECT * FROM jobs' + (' WHERE status = ?' if status else '') + ' ORDER BY created_at DESC LIMIT ?'
+        with self._lock:
+            return self._connect().execute(query, ((status,) if status else ()) + (limit,)).fetchall()
+
+    def claim(self, worker_id: str) -> Optional[sqlite3.Row]:
+        """Atomically take the oldest pending job, across processes"""
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                row = conn.execute(
+                    'SELECT job_id FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1',
+                    (BatchJobStatus.PENDING.value,)
+                ).fetchone()
+                if row is not None:
+                    conn.execute(
+                        'UPDATE jobs SET status = ?, worker_id = ?, lease_expires_at = ?, attempts = attempts + 1, '
+                        'started_at = COALESCE(started_at, ?) WHERE job_id = ?',
+                        (BatchJobStatus.PROCESSING.value, worker_id, now + LEASE_SECONDS, now, row['job_id'])
+                    )
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+            if row is None:
+                return None
+            return conn.execute('SELECT * FROM jobs WHERE job_id = ?', (row['job_id'],)).fetchone()
+
+    def renew(self, job_id: str, worker_id: str, processed_items: int = None) -> bool:
+        """Extend the lease (and record progress); False if the job is no longer ours"""
+        with self._lock:
+            cursor = self._connect().execute(
+                'UPDATE jobs SET lease_expires_at = ?, processed_items = COALESCE(?, processed_items) '
+                'WHERE job_id = ? AND worker_id = ? AND status = ?',
+                (time.time() + LEASE_SECONDS, processed_items, job_id, worker_id, BatchJobStatus.PROCESSING.value)
+            )
+            return cursor.rowcount == 1
+
+    def owns(self, job_id: str, worker_id: str) -> bool:
+        """Whether ``worker_id`` still holds the job's lease"""
+        with self._lock:
+            row = self._connect().execute(
+                'SELECT 1 FROM jobs WHERE job_id = ? AND worker_id = ? AND status = ? AND lease_expires_at >= ?',
+                (job_id, worker_id, BatchJobStatus.PROCESSING.value, time.time())
+            ).fetchone()
+            return row is not None
+
+    def finish(self, job_id: str, worker_id: str, status: BatchJobStatus, processed_items: int,
+               error_message: str = None) -> bool:
+        with self._lock:
+            cursor = self._connect().execute(
+                'UPDATE jobs SET status = ?, completed_at = ?, processed_items = ?, error_message = ?, '
+                'lease_expires_at = NULL WHERE job_id = ? AND worker_id = ? AND status = ?',
+                (status.value, time.time(), processed_items, error_message, job_id, worker_id,
+                 BatchJobStatus.PROCESSING.value)
+            )
+            return cursor.rowcount == 1
+
+    def release(self, job_id: str, worker_id: str, processed_items: int):
+        """Hand an unfinished job back to the queue, e.g. on shutdown; this does not count as an attempt"""
+        with self._lock:
+            self._connect().execute(
+                'UPDATE jobs SET status = ?, worker_id = NULL, lease_expires_at = NULL, processed_items = ?, '
+                'attempts = attempts - 1 WHERE job_id = ? AND worker_id = ? AND status = ?',
+                (BatchJobStatus.PENDING.value, processed_items, job_id, worker_id, BatchJobStatus.PROCESSING.value)
+            )
+
+    def requeue_expired(self) -> int:
+        """Return jobs whose worker stopped renewing its lease to the queue, unless out of attempts"""
+        with self._lock:
+            cursor = self._connect().execute(
+                'UPDATE jobs SET status = ?, worker_id = NULL, lease_expires_at = NULL '
+                'WHERE status = ? AND lease_expires_at < ? AND attempts < ?',
+                (BatchJobStatus.PENDING.value, BatchJobStatus.PROCESSING.value, time.time(), self.max_attempts)
+            )
+            return cursor.rowcount
+
+    def fail_exhausted(self) -> List[sqlite3.Row]:
+        """Fail jobs whose lease lapsed on their last allowed attempt; returns them as updated"""
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                job_ids = [row['job_id'] for row in conn.execute(
+                    'SELECT job_id FROM jobs WHERE status = ? AND lease_expires_at < ? AND attempts >= ?',
+                    (BatchJobStatus.PROCESSING.value, now, self.max_attempts)
+                )]
+                conn.executemany(
+                    'UPDATE jobs SET status = ?, completed_at = ?, worker_id = NULL, lease_expires_at = NULL, '
+                    'error_message = ? WHERE job_id = ?',
+                    [(BatchJobStatus.FAILED.value, now,
+                      f"Gave up after {self.max_attempts} attempts: the worker stopped responding", job_id)
+                     for job_id in job_ids]
+                )
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+            return [conn.execute('SELECT * FROM jobs WHERE job_id = ?', (job_id,)).fetchone() for job_id in job_ids]
+
+    def set_callback_status(self, job_id: str, callback_status: str):
+        with self._lock:
+            self._connect().execute('UPDATE jobs SET callback_status = ? WHERE job_id = ?', (callback_status, job_id))
+
+    def counts(self) -> Dict[str, int]:
+        """``active_jobs`` (processing) and ``queue_size`` (pending), as in APIMetrics"""
+        with self._lock:
+            rows = dict(self._connect().execute(
+                'SELECT status, COUNT(*) FROM jobs WHERE status IN (?, ?) GROUP BY status',
+                (BatchJobStatus.PENDING.value, BatchJobStatus.PROCESSING.value)
+            ).fetchall())
+        return {
+            'active_jobs': rows.get(BatchJobStatus.PROCESSING.value, 0),
+            'queue_size': rows.get(BatchJobStatus.PENDING.value, 0),
+        }
+
+
+def _timestamp(value: Optional[float]) -> Optional[datetime]:
+    return datetime.utcfromtimestamp(value) if value else None
+
+
+def to_batch_job(row: sqlite3.Row) -> BatchJob:
+    total = row['total_items']
+    completed = row['status'] == BatchJobStatus.COMPLETED.value
+    return BatchJob(
+        job_id=row['job_id'],
+        job_type=row['job_type'],
+        status=row['status'],
+        created_at=_timestamp(row['created_at']),
+        started_at=_timestamp(row['started_at']),
+        completed_at=_timestamp(row['completed_at']),
+        total_items=total,
+        processed_items=row['processed_items'],
+        progress=round(100.0 * row['processed_items'] / total, 2) if total else 100.0,
+        result_url=f"/api/v1/jobs/{row['job_id']}/result" if completed else None,
+        error_message=row['error_message']
+    )
+
+
+def iter_unique_results(result_path: str) -> Iterator[bytes]:
+    """Lines of a results file, keeping only the first row written for each ``item_index``"""
+    seen = set()
+    with open(result_path, 'rb') as file:
+        for line in file:
+            if not line.strip():
+                continue
+            item_index = json.loads(line)['item_index']
+            if item_index not in seen:
+                seen.add(item_index)
+                yield line
+
+
+def compact_results(result_path: str) -> int:
+    """Rewrite a results file without duplicate ``item_index`` rows; returns how many were dropped"""
+    if not os.path.exists(result_path):
+        return 0
+    lines = list(iter_unique_results(result_path))
+    with open(result_path, 'rb') as file:
+        total = sum(1 for line in file if line.strip())
+    if total == len(lines):
+        return 0
+    temp_path = result_path + '.tmp'
+    with open(temp_path, 'wb') as file:
+        file.writelines(lines)
+    os.replace(temp_path, result_path)
+    return total - len(lines)
+
+
+def validate_job_input(job_type: str, input_data: Dict) -> int:
+    """Validate ``input_data`` for ``job_type``; returns the number of items. Raises ValueError."""
+    if job_type not in JOB_INPUT_MODELS:
+        raise ValueError(f"Unknown job type: {job_type}")
+    model, items_field = JOB_INPUT_MODELS[job_type]
+    return len(getattr(model(**input_data), items_field))
+
+
+def build_sentiment_result(text_input, llm_result: Dict, include_themes: bool = False,
+                           analysis_tier: str = None) -> SentimentResult:
+    """Map an LLM (or locally derived) sentiment analysis onto the API's SentimentResult"""
+    score = max(-1.0, min(1.0, float(llm_result.get('sentiment_score', 0) or 0)))
+    label = str(llm_result.get('sentiment_label', 'NEUTRAL')).lower()
+    return SentimentResult(
+        text=text_input.text,
+        sentiment=label if label in SentimentType._value2member_map_ else SentimentType.NEUTRAL,
+        confidence=max(0.0, min(1.0, float(llm_result.get('confidence', abs(score)) or 0))),
+        positive_score=max(score, 0.0),
+        negative_score=max(-score, 0.0),
+        neutral_score=1.0 - abs(score),
+        themes=llm_result.get('key_themes', []) if include_themes else None,
+        source=text_input.source,
+        analysis_tier=analysis_tier
+    )
+
+
+def resume_screening_handler(input_data: Dict) -> Tuple[int, Callable[[int], Dict]]:
+    from api.routes.resume_router import build_candidate_score, build_job_requirements, get_screener
+    from src.resume_screening.local_scorer import LocalResumeScorer
+    from src.resume_screening.resume_parser import parse_resume_texts
+
+    request = ResumeScreeningJobInput(**input_data)
+    job_requirements = build_job_requirements(request.job_description)
+    criteria = request.criteria or ScreeningCriteria()
+    scorer = LocalResumeScorer(criteria)
+
+    def process_item(index: int) -> Dict:
+        resume = request.resumes[index]
+        outcome = parse_resume_texts([resume.content])[0]
+        resume_data = outcome['data'] or {'text': resume.content}
+        llm_result = None
+        if request.include_analysis:
+            llm_result = get_screener().screen_resume(resume_data['text'], job_requirements)
+        return build_candidate_score(
+            resume.filename or f"resume_{index + 1}", resume_data, scorer.score(resume_data, job_requirements),
+            llm_result, scorer, criteria, job_requirements
+        ).dict()
+
+    return len(request.resumes), process_item
+
+
+def sentiment_analysis_handler(input_data: Dict) -> Tuple[int, Callable[[int], Dict]]:
+    from src.sentiment_analysis.data_processor import SentimentDataProcessor
+    from src.sentiment_analysis.llm_sentiment_analyzer import LLMSentimentAnalyzer
+    from src.sentiment_analysis.tier_router import LOCAL_TIER, SentimentTierRouter
+
+    request = SentimentAnalysisJobInput(**input_data)
+    analyzer = LLMSentimentAnalyzer()
+    processor = SentimentDataProcessor()
+    router = SentimentTierRouter()
+
+    def process_item(index: int) -> Dict:
+        text_input = request.texts[index]
+        cleaned = processor.clean_text(text_input.text)
+        sentiment = processor.sentiment_analyzer.analyze(cleaned)
+        tier = router.route(cleaned, sentiment.polarity, request.analysis_type.value)
+        if tier == LOCAL_TIER:
+            result = router.local_result(sentiment.polarity, sentiment.subjectivity)
+        else:
+            result = analyzer.analyze_sentiment(text_input.text)
+        if 'error' in result:
+            return {'text': text_input.text, 'source': text_input.source, 'error': result['error']}
+        return build_sentiment_result(text_input, result, request.include_themes, tier).dict()
+
+    return len(request.texts), process_item
+
+
+JOB_HANDLERS = {
+    'resume_screening': resume_screening_handler,
+    'sentiment_analysis': sentiment_analysis_handler,
+}
+
+
+def deliver_callback(url: str, payload: Dict, attempts: int = 3) -> str:
+    """POST the final job state to ``url``; returns a short delivery status"""
+    import requests
+    error = ''
+    for attempt in range(attempts):
+        try:
+            response = requests.post(url, json=payload, timeout=10)
+            if response.status_code < 500:
+                return f"delivered ({response.status_code})"
+            error = f"HTTP {response.status_code}"
+        except requests.RequestException as e:
+            error = str(e)
+        if attempt < attempts - 1:
+            time.sleep(2 ** attempt)
+    return f"failed: {error}"
+
+
+class JobWorkerPool:
+    """Threads that claim jobs from a JobStore and run up to ``item_concurrency`` items of each at once"""
+
+    def __init__(self, store: JobStore = None, num_workers: int = None, item_concurrency: int = None,
+                 poll_interval: float = 1.0):
+        self.store = store or get_job_store()
+        self.num_workers = num_workers or int(os.getenv('JOB_WORKERS', '2'))
+        self.item_concurrency = item_concurrency or int(os.getenv('JOB_ITEM_CONCURRENCY', '8'))
+        self.poll_interval = poll_interval
+        self._stop = threading.Event()
+        self._threads = []
+
+    def start(self):
+        requeued = self.recover_expired()
+        if requeued:
+            logger.info(f"Requeued {requeued} interrupted job(s)")
+        self._stop.clear()
+        for n in range(self.num_workers):
+            thread = threading.Thread(target=self._worker_loop, args=(n,), name=f'job-worker-{n}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    @property
+    def running(self) -> bool:
+        return any(thread.is_alive() for thread in self._threads)
+
+    def _worker_loop(self, n: int):
+        worker_id = f"{socket.gethostname()}:{os.getpid()}:{n}"
+        while not self._stop.is_set():
+            try:
+                self.recover_expired()
+                job = self.store.claim(worker_id)
+            except sqlite3.Error as e:
+                logger.error(f"Job queue unavailable: {e}")
+                job = None
+            if job is None:
+                self._stop.wait(self.poll_interval)
+                continue
+            self.run_job(job, worker_id)
+
+    def recover_expired(self) -> int:
+        """Fail jobs that are out of attempts and requeue other lapsed ones; returns how many were requeued"""
+        for job in self.store.fail_exhausted():
+            logger.error(f"Job {job['job_id']} failed: {job['error_message']}")
+            self.notify(job)
+        return self.store.requeue_expired()
+
+    def notify(self, job: sqlite3.Row):
+        if job['callback_url']:
+            payload = json.loads(to_batch_job(self.store.get(job['job_id'])).json())
+            self.store.set_callback_status(job['job_id'], deliver_callback(job['callback_url'], payload))
+
+    @staticmethod
+    def completed_items(result_path: str) -> Set[int]:
+        """Item indices already in a results file; a torn last line is cut off"""
+        if not os.path.exists(result_path):
+            return set()
+        with open(result_path, 'rb+') as file:
+            content = file.read()
+            complete = content[:content.rfind(b'\n') + 1]
+            if len(complete) != len(content):
+                file.truncate(len(complete))
+        return {json.loads(line)['item_index'] for line in complete.splitlines() if line.strip()}
+
+    def run_job(self, job: sqlite3.Row, worker_id: str):
+        job_id = job['job_id']
+        result_path = self.store.result_path(job_id)
+        processed = 0
+        heartbeat_stop = threading.Event()
+
+        def heartbeat():
+            while not heartbeat_stop.wait(LEASE_SECONDS / 3):
+                self.store.renew(job_id, worker_id)
+
+        threading.Thread(target=heartbeat, name=f'job-heartbeat-{job_id}', daemon=True).start()
+        try:
+            total, process_item = JOB_HANDLERS[job['job_type']](json.loads(job['input_data']))
+
+            def process_safely(index: int) -> Dict:
+                # One bad item becomes an error row instead of failing the whole job
+                try:
+                    return process_item(index)
+                except Exception as e:
+                    logger.warning(f"Job {job_id}: item {index} failed: {e}")
+                    return {'error': str(e)}
+
+            done = self.completed_items(result_path)
+            pending = [i for i in range(total) if i not in done]
+            processed = len(done)
+            failed = 0
+            logger.info(f"Job {job_id}: {len(pending)} of {total} items to process (attempt {job['attempts']})")
+            last_update = 0.0
+            with IncrementalResultWriter(result_path, append=True) as writer:
+                for position, row in iter_bounded(process_safely, pending, self.item_concurrency):
+                    # A worker whose lease lapsed must not append next to the one that took the job over
+                    if not self.store.owns(job_id, worker_id):
+                        raise LeaseLost(job_id)
+                    writer.write(dict(row, item_index=pending[position]))
+                    processed += 1
+                    failed += 'error' in row
+                    if time.monotonic() - last_update >= PROGRESS_INTERVAL_SECONDS:
+                        last_update = time.monotonic()
+                        if not self.store.renew(job_id, worker_id, processed):
+                            raise LeaseLost(job_id)
+                    if self._stop.is_set():
+                        # Shutting down: the next worker resumes from the rows written so far
+                        self.store.release(job_id, worker_id, processed)
+                        return
+            dropped = compact_results(result_path)
+            if dropped:
+                logger.warning(f"Job {job_id}: dropped {dropped} duplicate result row(s)")
+            processed = len(self.completed_items(result_path))
+            status, error = BatchJobStatus.COMPLETED, f"{failed} item(s) failed" if failed else None
+        except LeaseLost:
+            logger.warning(f"Job {job_id}: lease lost to another worker")
+            return
+        except Exception as e:
+            logger.error(f"Job {job_id} failed: {e}")
+            status, error = BatchJobStatus.FAILED, str(e)
+        finally:
+            heartbeat_stop.set()
+
+        if self.store.finish(job_id, worker_id, status, processed, error):
+            logger.info(f"Job {job_id} {status.value}: {processed} items")
+            self.notify(job)
+
+
+_store = None
+_pool = None
+
+
+def get_job_store() -> JobStore:
+    global _store
+    if _store is None:
+        _store = JobStore()
+    return _store
+
+
+def get_worker_pool() -> JobWorkerPool:
+    global _pool
+    if _pool is None:
+        _pool = JobWorkerPool(get_job_store())
+    return _pool
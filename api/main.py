@@ -11,10 +11,13 @@ from datetime import datetime
 import uuid
 
 # Import your existing modules
-from api.routes import resume_router, sentiment_router, health_router
+from api.routes import resume_router, sentiment_router, health_router, jobs_router
+from api.jobs import get_worker_pool
 from api.middleware import RateLimitMiddleware, LoggingMiddleware
 from api.models import APIResponse, ErrorResponse
 from config.settings import get_settings
+from src.utils.metrics import get_metrics
+from src.utils.rate_limiter import enable_upstream_limits
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -73,6 +76,12 @@ app.include_router(
     tags=["sentiment-analysis"],
     dependencies=[Depends(get_current_user)] if settings.REQUIRE_AUTH else []
 )
+app.include_router(
+    jobs_router.router,
+    prefix="/api/v1/jobs",
+    tags=["batch-jobs"],
+    dependencies=[Depends(get_current_user)] if settings.REQUIRE_AUTH else []
+)
 
 @app.on_event("startup")
 async def startup_event():
@@ -80,11 +89,15 @@ async def startup_event():
     logger.info("Starting HR AI Toolkit API...")
     logger.info(f"Environment: {settings.ENVIRONMENT}")
     logger.info(f"Debug mode: {settings.DEBUG}")
+    enable_upstream_limits()
+    get_metrics().enable_publishing()
+    get_worker_pool().start()
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown"""
     logger.info("Shutting down HR AI Toolkit API...")
+    get_worker_pool().stop()
 
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
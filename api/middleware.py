@@ -0,0 +1,100 @@
+# api/middleware.py
+import asyncio
+import hashlib
+import logging
+import math
+import os
+import time
+from datetime import datetime
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from api.models import ErrorResponse
+from src.utils.metrics import get_metrics
+from src.utils.rate_limiter import SharedTokenBucket
+
+logger = logging.getLogger(__name__)
+
+# Paths that are never rate limited (docs and health probes)
+RATE_LIMIT_EXEMPT_PREFIXES = ('/api/docs', '/api/redoc', '/api/openapi.json', '/api/v1/health', '/api/v1/metrics')
+
+
+def client_key(request) -> str:
+    """Rate-limit identity: the API key when one is sent, otherwise the client address"""
+    authorization = request.headers.get('authorization', '')
+    api_key = authorization[7:].strip() if authorization.lower().startswith('bearer ') else ''
+    api_key = api_key or request.headers.get('x-api-key', '')
+    if api_key:
+        # Only a digest is stored, never the key itself
+        return 'key:' + hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:32]
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+
+class RateLimitMiddleware(BaseHTTPMiddleware):
+    """Per-API-key token bucket (``requests_per_minute``, bursts of ``burst``); over-limit requests get a 429"""
+
+    def __init__(self, app, requests_per_minute: float = None, burst: float = None,
+                 bucket: SharedTokenBucket = None):
+        super().__init__(app)
+        self.requests_per_minute = requests_per_minute or float(os.getenv('API_RATE_LIMIT_PER_MINUTE', '60'))
+        self.burst = burst or float(os.getenv('API_RATE_LIMIT_BURST', str(self.requests_per_minute)))
+        self.rate = self.requests_per_minute / 60.0
+        self.bucket = bucket or SharedTokenBucket()
+
+    async def dispatch(self, request, call_next):
+        if request.url.path.startswith(RATE_LIMIT_EXEMPT_PREFIXES) or request.url.path == '/':
+            return await call_next(request)
+
+        granted, wait, remaining = await asyncio.to_thread(
+            self.bucket.reserve, f'api:{client_key(request)}', self.rate, self.burst
+        )
+        headers = {
+            'X-RateLimit-Limit': str(int(self.requests_per_minute)),
+            'X-RateLimit-Remaining': str(max(0, int(remaining))),
+        }
+        if not granted:
+            get_metrics().inc('rate_limited_requests_total')
+            headers['Retry-After'] = str(max(1, math.ceil(wait)))
+            return JSONResponse(
+                status_code=429,
+                headers=headers,
+                content=jsonable_encoder(ErrorResponse(
+                    message="Rate limit exceeded",
+                    details={'retry_after_seconds': round(wait, 2)}
+                ))
+            )
+        response = await call_next(request)
+        response.headers.update(headers)
+        return response
+
+
+def endpoint_name(request) -> str:
+    """Route template (``/api/v1/jobs/{job_id}``) rather than the raw path, to bound metric labels"""
+    route = request.scope.get('route')
+    return f"{request.method} {getattr(route, 'path', None) or 'unmatched'}"
+
+
+class LoggingMiddleware(BaseHTTPMiddleware):
+    """Log each request with its status and duration, record it in the metrics and return X-Process-Time"""
+
+    async def dispatch(self, request, call_next):
+        start = time.perf_counter()
+        try:
+            response = await call_next(request)
+            status = response.status_code
+        except Exception:
+            status = 500
+            logger.exception(f"{request.method} {request.url.path} failed after {time.perf_counter() - start:.3f}s")
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            metrics = get_metrics()
+            endpoint = endpoint_name(request)
+            metrics.inc('http_requests_total', endpoint=endpoint, status=status)
+            metrics.observe('http_request_duration_seconds', elapsed, endpoint=endpoint)
+            metrics.inc('http_requests_by_hour_total', hour=datetime.utcnow().strftime('%H'))
+        response.headers['X-Process-Time'] = f"{elapsed:.4f}"
+        logger.info(f"{request.method} {request.url.path} {response.status_code} {elapsed:.3f}s")
+        return response
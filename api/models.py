@@ -114,6 +114,7 @@ class SentimentResult(BaseModel):
     emotions: Optional[Dict[str, float]] = None
     categories: Optional[Dict[str, float]] = None
     source: Optional[str] = None
+    analysis_tier: Optional[str] = None  # 'local' (TextBlob) or 'llm'
 
 class SentimentSummary(BaseModel):
     total_texts: int
@@ -165,6 +166,13 @@ class BatchJobRequest(BaseModel):
     input_data: Dict[str, Any]
     callback_url: Optional[str] = None
 
+# input_data payloads; like the synchronous requests but without their item limits
+class ResumeScreeningJobInput(ResumeScreeningRequest):
+    resumes: List[ResumeText] = Field(..., min_items=1, max_items=2000)
+
+class SentimentAnalysisJobInput(SentimentAnalysisRequest):
+    texts: List[TextInput] = Field(..., min_items=1, max_items=20000)
+
 # Health Check Models
 class HealthStatus(BaseModel):
     status: str = "healthy"
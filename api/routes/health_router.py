@@ -0,0 +1,87 @@
+# api/routes/health_router.py
+import asyncio
+import resource
+import sys
+import time
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from api.jobs import get_job_store, get_worker_pool
+from api.models import APIMetrics, HealthStatus, UsageStats
+from src.utils.llm_backend import get_backend
+from src.utils.metrics import get_metrics, series_by_label
+
+router = APIRouter()
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def memory_usage() -> dict:
+    """Peak resident set size of this worker in MB (ru_maxrss is KB on Linux, bytes on macOS)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {'peak_rss_mb': round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 2)}
+
+
+def build_health_status() -> HealthStatus:
+    api_health = {
+        'llm_backend': get_backend().available(),
+        'job_workers': get_worker_pool().running,
+    }
+    return HealthStatus(
+        status='healthy' if all(api_health.values()) else 'degraded',
+        uptime=round(time.time() - get_metrics().started_at, 2),
+        memory_usage=memory_usage(),
+        api_health=api_health
+    )
+
+
+def build_usage_stats(aggregated: dict) -> UsageStats:
+    counters = aggregated['counters']
+    by_status = series_by_label(counters, 'http_requests_total', 'status')
+    total = sum(by_status.values())
+    failed = sum(count for status, count in by_status.items() if int(status) >= 400)
+    durations = [h for (name, _), h in aggregated['histograms'].items() if name == 'http_request_duration_seconds']
+    duration_count = sum(h['count'] for h in durations)
+    return UsageStats(
+        total_requests=int(total),
+        successful_requests=int(total - failed),
+        failed_requests=int(failed),
+        average_response_time=round(sum(h['sum'] for h in durations) / duration_count, 4) if duration_count else 0.0,
+        requests_by_endpoint={
+            endpoint: int(count) for endpoint, count in series_by_label(counters, 'http_requests_total', 'endpoint').items()
+        },
+        requests_by_hour={
+            hour: int(count) for hour, count in sorted(series_by_label(counters, 'http_requests_by_hour_total', 'hour').items())
+        }
+    )
+
+
+@router.get("/health", response_model=HealthStatus)
+async def health() -> HealthStatus:
+    return await asyncio.to_thread(build_health_status)
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    """Metrics of every API worker in Prometheus text format"""
+    registry = get_metrics()
+    aggregated = await asyncio.to_thread(registry.aggregate)
+    counts = await asyncio.to_thread(get_job_store().counts)
+    text = registry.render_prometheus(aggregated) + ''.join(
+        f"# TYPE hr_ai_{name} gauge\nhr_ai_{name} {value}\n" for name, value in sorted(counts.items())
+    )
+    return PlainTextResponse(text, media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+@router.get("/metrics/summary", response_model=APIMetrics)
+async def metrics_summary() -> APIMetrics:
+    """The same metrics as ``/metrics``, summarized into the API models"""
+    aggregated = await asyncio.to_thread(get_metrics().aggregate)
+    counts = await asyncio.to_thread(get_job_store().counts)
+    return APIMetrics(
+        stats=build_usage_stats(aggregated),
+        health=await asyncio.to_thread(build_health_status),
+        active_jobs=counts['active_jobs'],
+        queue_size=counts['queue_size']
+    )
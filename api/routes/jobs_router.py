@@ -0,0 +1,58 @@
+# api/routes/jobs_router.py
+import asyncio
+import os
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+
+from api.jobs import get_job_store, iter_unique_results, to_batch_job, validate_job_input
+from api.models import BatchJob, BatchJobRequest, BatchJobStatus
+
+router = APIRouter()
+
+
+@router.post("", response_model=BatchJob, status_code=202)
+async def submit_job(request: BatchJobRequest) -> BatchJob:
+    """Queue a resume screening or sentiment analysis job; poll it or pass a ``callback_url``"""
+    try:
+        total_items = await asyncio.to_thread(validate_job_input, request.job_type, request.input_data)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=f"Invalid input_data: {e}")
+    store = get_job_store()
+    job_id = await asyncio.to_thread(
+        store.create, request.job_type, request.input_data, total_items, request.callback_url
+    )
+    return to_batch_job(store.get(job_id))
+
+
+@router.get("", response_model=List[BatchJob])
+async def list_jobs(status: Optional[BatchJobStatus] = None, limit: int = 50) -> List[BatchJob]:
+    rows = get_job_store().list(status.value if status else None, min(max(limit, 1), 500))
+    return [to_batch_job(row) for row in rows]
+
+
+@router.get("/{job_id}", response_model=BatchJob)
+async def get_job(job_id: str) -> BatchJob:
+    row = get_job_store().get(job_id)
+    if row is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return to_batch_job(row)
+
+
+@router.get("/{job_id}/result")
+async def download_job_result(job_id: str):
+    """Result rows as JSON lines, one per item (``item_index`` gives its input position)"""
+    store = get_job_store()
+    row = store.get(job_id)
+    if row is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if row['status'] != BatchJobStatus.COMPLETED.value:
+        raise HTTPException(status_code=409, detail=f"Job is {row['status']}")
+    path = store.result_path(job_id)
+    if not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="Result file not found")
+    return StreamingResponse(
+        iter_unique_results(path), media_type='application/x-ndjson',
+        headers={'Content-Disposition': f'attachment; filename="{job_id}.jsonl"'}
+    )
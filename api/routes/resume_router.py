@@ -1,190 +1,212 @@
-# api/models.py
-from pydantic import BaseModel, Field, validator
-from typing import List, Optional, Dict, Any, Union
-from datetime import datetime
-from enum import Enum
-
-class SentimentType(str, Enum):
-    POSITIVE = "positive"
-    NEGATIVE = "negative"
-    NEUTRAL = "neutral"
-
-class AnalysisType(str, Enum):
-    BASIC = "basic"
-    DETAILED = "detailed"
-    COMPREHENSIVE = "comprehensive"
-
-# Base Response Models
-class APIResponse(BaseModel):
-    success: bool = True
-    message: str = "Success"
-    data: Optional[Dict[str, Any]] = None
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
-
-class ErrorResponse(BaseModel):
-    error: bool = True
-    message: str
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
-    details: Optional[Dict[str, Any]] = None
-
-# Resume Screening Models
-class JobDescription(BaseModel):
-    title: str = Field(..., min_length=1, max_length=200)
-    description: str = Field(..., min_length=10, max_length=5000)
-    required_skills: List[str] = Field(..., min_items=1, max_items=50)
-    preferred_skills: Optional[List[str]] = Field(default=[], max_items=30)
-    experience_years: Optional[int] = Field(default=0, ge=0, le=50)
-    education_level: Optional[str] = Field(default="", max_length=100)
-    location: Optional[str] = Field(default="", max_length=100)
-    
-    @validator('required_skills', 'preferred_skills')
-    def validate_skills(cls, v):
-        if v:
-            return [skill.strip() for skill in v if skill.strip()]
-        return v
-
-class ResumeText(BaseModel):
-    content: str = Field(..., min_length=50, max_length=10000)
-    filename: Optional[str] = Field(default="", max_length=255)
-
-class ScreeningCriteria(BaseModel):
-    skills_weight: float = Field(default=0.4, ge=0.0, le=1.0)
-    experience_weight: float = Field(default=0.3, ge=0.0, le=1.0)
-    education_weight: float = Field(default=0.2, ge=0.0, le=1.0)
-    keywords_weight: float = Field(default=0.1, ge=0.0, le=1.0)
-    minimum_score: float = Field(default=0.5, ge=0.0, le=1.0)
-    
-    @validator('skills_weight', 'experience_weight', 'education_weight', 'keywords_weight')
-    def validate_weights_sum(cls, v, values):
-        weights = [v]
-        for field in ['skills_weight', 'experience_weight', 'education_weight']:
-            if field in values:
-                weights.append(values[field])
-        if len(weights) == 4 and sum(weights) != 1.0:
-            raise ValueError('All weights must sum to 1.0')
-        return v
-
-class ResumeScreeningRequest(BaseModel):
-    job_description: JobDescription
-    resumes: List[ResumeText] = Field(..., min_items=1, max_items=100)
-    criteria: Optional[ScreeningCriteria] = Field(default_factory=ScreeningCriteria)
-    include_analysis: bool = Field(default=True)
-
-class CandidateScore(BaseModel):
-    filename: str
-    overall_score: float = Field(..., ge=0.0, le=1.0)
-    skills_score: float = Field(..., ge=0.0, le=1.0)
-    experience_score: float = Field(..., ge=0.0, le=1.0)
-    education_score: float = Field(..., ge=0.0, le=1.0)
-    keywords_score: float = Field(..., ge=0.0, le=1.0)
-    matched_skills: List[str]
-    missing_skills: List[str]
-    analysis: Optional[str] = None
-    recommendation: str
-
-class ResumeScreeningResponse(BaseModel):
-    job_id: str
-    total_resumes: int
-    qualified_candidates: int
-    results: List[CandidateScore]
-    summary: Dict[str, Any]
-    processing_time: float
-
-# Sentiment Analysis Models
-class TextInput(BaseModel):
-    text: str = Field(..., min_length=1, max_length=5000)
-    source: Optional[str] = Field(default="", max_length=100)
-    metadata: Optional[Dict[str, Any]] = Field(default_factory=dict)
-
-class SentimentAnalysisRequest(BaseModel):
-    texts: List[TextInput] = Field(..., min_items=1, max_items=1000)
-    analysis_type: AnalysisType = Field(default=AnalysisType.BASIC)
-    categories: Optional[List[str]] = Field(default=[], max_items=20)
-    include_themes: bool = Field(default=False)
-    include_emotions: bool = Field(default=False)
-
-class SentimentResult(BaseModel):
-    text: str
-    sentiment: SentimentType
-    confidence: float = Field(..., ge=0.0, le=1.0)
-    positive_score: float = Field(..., ge=0.0, le=1.0)
-    negative_score: float = Field(..., ge=0.0, le=1.0)
-    neutral_score: float = Field(..., ge=0.0, le=1.0)
-    themes: Optional[List[str]] = None
-    emotions: Optional[Dict[str, float]] = None
-    categories: Optional[Dict[str, float]] = None
-    source: Optional[str] = None
-
-class SentimentSummary(BaseModel):
-    total_texts: int
-    positive_count: int
-    negative_count: int
-    neutral_count: int
-    average_confidence: float
-    dominant_sentiment: SentimentType
-    key_themes: List[str]
-    sentiment_distribution: Dict[str, float]
-
-class SentimentAnalysisResponse(BaseModel):
-    analysis_id: str
-    results: List[SentimentResult]
-    summary: SentimentSummary
-    processing_time: float
-    analysis_type: AnalysisType
-
-# File Upload Models
-class FileUploadResponse(BaseModel):
-    filename: str
-    file_id: str
-    size: int
-    content_type: str
-    status: str = "uploaded"
-
-# Batch Processing Models
-class BatchJobStatus(str, Enum):
-    PENDING = "pending"
-    PROCESSING = "processing" 
-    COMPLETED = "completed"
-    FAILED = "failed"
-
-class BatchJob(BaseModel):
-    job_id: str
-    job_type: str  # "resume_screening" or "sentiment_analysis"
-    status: BatchJobStatus
-    created_at: datetime
-    started_at: Optional[datetime] = None
-    completed_at: Optional[datetime] = None
-    total_items: int
-    processed_items: int = 0
-    progress: float = Field(default=0.0, ge=0.0, le=100.0)
-    result_url: Optional[str] = None
-    error_message: Optional[str] = None
-
-class BatchJobRequest(BaseModel):
-    job_type: str = Field(..., regex="^(resume_screening|sentiment_analysis)$")
-    input_data: Dict[str, Any]
-    callback_url: Optional[str] = None
-
-# Health Check Models
-class HealthStatus(BaseModel):
-    status: str = "healthy"
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
-    version: str = "1.0.0"
-    uptime: float
-    memory_usage: Dict[str, float]
-    api_health: Dict[str, bool]
-
-# Analytics Models
-class UsageStats(BaseModel):
-    total_requests: int
-    successful_requests: int
-    failed_requests: int
-    average_response_time: float
-    requests_by_endpoint: Dict[str, int]
-    requests_by_hour: Dict[str, int]
-
-class APIMetrics(BaseModel):
-    stats: UsageStats
-    health: HealthStatus
-    active_jobs: int
-    queue_size: int
\ No newline at end of file
+# api/routes/resume_router.py
+import asyncio
+import logging
+import os
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List
+
+from fastapi import APIRouter
+
+from api.models import (
+    CandidateScore, JobDescription, ResumeScreeningRequest, ResumeScreeningResponse, ScreeningCriteria
+)
+from src.resume_screening.job_parser import JobDescriptionParser
+from src.resume_screening.llm_screener import LLMResumeScreener
+from src.resume_screening.local_scorer import LocalResumeScorer
+from src.resume_screening.resume_parser import parse_resume_texts
+from src.utils.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# Upper bound on LLM calls in flight per worker process, shared by all requests
+LLM_CONCURRENCY = int(os.getenv('API_LLM_CONCURRENCY', '32'))
+PARSE_WORKERS = int(os.getenv('API_PARSE_WORKERS', str(os.cpu_count() or 1)))
+# Requests with fewer resumes are parsed in a thread; the process pool round trip costs more
+MIN_RESUMES_FOR_PROCESS_POOL = 16
+
+SCORE_WEIGHTS = {
+    'skills_score': 'skills_weight',
+    'experience_score': 'experience_weight',
+    'education_score': 'education_weight',
+    'keywords_score': 'keywords_weight',
+}
+
+_llm_executor = None
+_parse_executor = None
+_screener = None
+_job_parser = JobDescriptionParser()
+
+
+def get_llm_executor() -> ThreadPoolExecutor:
+    global _llm_executor
+    if _llm_executor is None:
+        _llm_executor = ThreadPoolExecutor(max_workers=LLM_CONCURRENCY, thread_name_prefix='llm')
+    return _llm_executor
+
+
+def get_parse_executor() -> ProcessPoolExecutor:
+    global _parse_executor
+    if _parse_executor is None:
+        _parse_executor = ProcessPoolExecutor(max_workers=PARSE_WORKERS)
+    return _parse_executor
+
+
+def get_screener() -> LLMResumeScreener:
+    global _screener
+    if _screener is None:
+        _screener = LLMResumeScreener()
+    return _screener
+
+
+def build_job_requirements(job: JobDescription) -> Dict:
+    """Requirements parsed from the description, extended with the request's explicit fields"""
+    requirements = _job_parser.extract_requirements(job.description)
+    matcher = _job_parser.skill_matcher
+    skills = list(requirements['skills'])
+    for skill in job.required_skills:
+        for canonical in matcher.find_skills(skill) or [skill.lower()]:
+            if canonical not in skills:
+                skills.append(canonical)
+    requirements['skills'] = skills
+    if job.experience_years:
+        requirements['experience_years'] = job.experience_years
+    if job.education_level:
+        requirements['education'] = sorted(set(requirements['education']) | set(
+            _job_parser.extract_requirements(job.education_level)['education']
+        ))
+    if job.preferred_skills:
+        requirements['keywords'] = sorted(set(requirements['keywords']) | {s.lower() for s in job.preferred_skills})
+    return requirements
+
+
+async def parse_resumes(texts: List[str]) -> List[Dict]:
+    """Parse resume texts off the event loop: a thread for small requests, the process pool otherwise"""
+    loop = asyncio.get_running_loop()
+    if len(texts) < MIN_RESUMES_FOR_PROCESS_POOL or PARSE_WORKERS <= 1:
+        return await asyncio.to_thread(parse_resume_texts, texts)
+    chunk_size = -(-len(texts) // PARSE_WORKERS)
+    chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+    parsed = await asyncio.gather(*(
+        loop.run_in_executor(get_parse_executor(), parse_resume_texts, chunk) for chunk in chunks
+    ))
+    return [outcome for chunk in parsed for outcome in chunk]
+
+
+async def screen_with_llm(resumes_data: List[Dict], job_requirements: Dict) -> List[Dict]:
+    """Run one LLM screening per resume on the shared executor and await them together"""
+    loop = asyncio.get_running_loop()
+    screener = get_screener()
+    return await asyncio.gather(*(
+        loop.run_in_executor(get_llm_executor(), screener.screen_resume, resume_data['text'], job_requirements)
+        for resume_data in resumes_data
+    ))
+
+
+def _unit_score(value) -> float:
+    """LLM scores are 0-100; API scores are 0-1"""
+    try:
+        return min(1.0, max(0.0, float(value) / 100.0))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def build_candidate_score(filename: str, resume_data: Dict, local_scores: Dict, llm_result: Dict,
+                          scorer: LocalResumeScorer, criteria, job_requirements: Dict) -> CandidateScore:
+    scores = {
+        'skills_score': local_scores['local_skills_score'],
+        'experience_score': local_scores['local_experience_score'],
+        'education_score': local_scores['local_education_score'],
+        'keywords_score': local_scores['local_keywords_score'],
+    }
+    matched = [s for s in job_requirements.get('skills', []) if s in set(resume_data.get('skills', []))]
+    missing = [s for s in job_requirements.get('skills', []) if s not in set(matched)]
+    analysis = None
+    llm_ok = llm_result is not None and 'error' not in llm_result
+
+    if llm_ok:
+        skills_match = llm_result.get('skills_match', {})
+        scores['skills_score'] = _unit_score(skills_match.get('skills_score'))
+        scores['experience_score'] = _unit_score(llm_result.get('experience_match', {}).get('experience_score'))
+        scores['education_score'] = _unit_score(llm_result.get('education_match', {}).get('education_score'))
+        matched = skills_match.get('matched_skills', matched)
+        missing = skills_match.get('missing_skills', missing)
+        analysis = '; '.join(filter(None, [
+            f"Strengths: {', '.join(llm_result.get('strengths', []))}" if llm_result.get('strengths') else '',
+            f"Concerns: {', '.join(llm_result.get('concerns', []))}" if llm_result.get('concerns') else '',
+        ])) or None
+    elif llm_result is not None:
+        analysis = f"LLM screening failed, local scores only: {llm_result['error']}"
+
+    total_weight = sum(scorer.weights.values()) or 1.0
+    overall = round(sum(scorer.weights[SCORE_WEIGHTS[name]] * value for name, value in scores.items()) / total_weight, 4)
+    if llm_ok:
+        recommendation = llm_result.get('recommendation', 'REVIEW')
+    else:
+        recommendation = 'CONSIDER' if overall >= criteria.minimum_score else 'REJECT'
+    return CandidateScore(
+        filename=filename,
+        overall_score=overall,
+        matched_skills=matched,
+        missing_skills=missing,
+        analysis=analysis,
+        recommendation=recommendation,
+        **{name: round(value, 4) for name, value in scores.items()}
+    )
+
+
+@router.post("/screen", response_model=ResumeScreeningResponse)
+async def screen_resumes(request: ResumeScreeningRequest) -> ResumeScreeningResponse:
+    """Screen up to 100 resumes against one job description, parsing and calling the LLM off the event loop"""
+    start = time.perf_counter()
+    job_id = str(uuid.uuid4())
+    # The field is Optional, so an explicit "criteria": null falls back to the defaults
+    criteria = request.criteria or ScreeningCriteria()
+    metrics = get_metrics()
+    with metrics.stage('api_resume_screening', 'job_parse'):
+        job_requirements = await asyncio.to_thread(build_job_requirements, request.job_description)
+
+    with metrics.stage('api_resume_screening', 'document_parse'):
+        parsed = await parse_resumes([resume.content for resume in request.resumes])
+    for outcome in parsed:
+        metrics.observe('document_parse_seconds', outcome['parse_time'], format='text')
+    filenames = [resume.filename or f"resume_{i + 1}" for i, resume in enumerate(request.resumes)]
+    resumes_data = [outcome['data'] or {'text': resume.content} for outcome, resume in zip(parsed, request.resumes)]
+
+    scorer = LocalResumeScorer(criteria)
+    local_scores = [scorer.score(resume_data, job_requirements) for resume_data in resumes_data]
+    llm_results = [None] * len(resumes_data)
+    if request.include_analysis:
+        with metrics.stage('api_resume_screening', 'llm_screening'):
+            llm_results = await screen_with_llm(resumes_data, job_requirements)
+
+    with metrics.stage('api_resume_screening', 'compile'):
+        results = [
+            build_candidate_score(filename, resume_data, local, llm_result, scorer, criteria, job_requirements)
+            for filename, resume_data, local, llm_result in zip(filenames, resumes_data, local_scores, llm_results)
+        ]
+        results.sort(key=lambda r: r.overall_score, reverse=True)
+        qualified = [r for r in results if r.overall_score >= criteria.minimum_score]
+
+    processing_time = round(time.perf_counter() - start, 4)
+    logger.info(f"Screened {len(results)} resumes for job {job_id} in {processing_time:.2f}s")
+    return ResumeScreeningResponse(
+        job_id=job_id,
+        total_resumes=len(results),
+        qualified_candidates=len(qualified),
+        results=results,
+        summary={
+            'job_title': request.job_description.title,
+            'average_score': round(sum(r.overall_score for r in results) / len(results), 4),
+            'top_candidate': results[0].filename,
+            'recommendations': dict(Counter(r.recommendation for r in results)),
+            'minimum_score': criteria.minimum_score,
+            'parse_errors': sum(1 for outcome in parsed if outcome['error']),
+            'llm_errors': sum(1 for r in llm_results if r is not None and 'error' in r),
+        },
+        processing_time=processing_time
+    )
@@ -0,0 +1,302 @@
+# benchmarks/bench_pipeline.py
+"""Throughput/latency suite for parsing, feedback processing and the full pipelines.
+
+A synthetic corpus is generated first (see benchmarks.corpus), then every
+benchmark runs in a fresh interpreter so its peak RSS is its own. LLM calls go
+to the offline stub backend with the configured latency and error rate.
+Results are written as JSON so runs of different versions can be compared.
+
+Usage: python -m benchmarks.bench_pipeline [--resumes 120] [--feedback-rows 1000 100000]
+       [--llm-latency-ms 50] [--output bench_results.json] [--only parse_resume ...]
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks import corpus
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def summarize(latencies: list, items: int, elapsed: float, unit: str) -> dict:
+    latencies_ms = np.asarray(latencies, dtype=float) * 1000
+    return {
+        'items': items,
+        'unit': unit,
+        'seconds': round(elapsed, 4),
+        'throughput_per_s': round(items / elapsed, 2) if elapsed else None,
+        'p50_ms': round(float(np.percentile(latencies_ms, 50)), 3) if len(latencies_ms) else None,
+        'p95_ms': round(float(np.percentile(latencies_ms, 95)), 3) if len(latencies_ms) else None,
+    }
+
+
+def peak_rss_mb() -> dict:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return {'peak_rss_mb': None, 'peak_children_rss_mb': None}
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    scale = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return {
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale, 1),
+        'peak_children_rss_mb': round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale, 1),
+    }
+
+
+def timed_backend():
+    """Register a wrapper around the stub backend that records every call's latency"""
+    from src.utils.llm_backend import LLMBackend, get_backend, set_backend
+
+    class TimedBackend(LLMBackend):
+        def __init__(self, backend):
+            self.backend = backend
+            self.model_name = backend.model_name
+            self.latencies = []
+
+        def generate(self, prompt, **kwargs):
+            start = time.perf_counter()
+            try:
+                return self.backend.generate(prompt, **kwargs)
+            finally:
+                self.latencies.append(time.perf_counter() - start)
+
+    backend = TimedBackend(get_backend('stub'))
+    set_backend(backend, 'stub')
+    return backend
+
+
+def bench_parse_resume(args) -> dict:
+    from src.resume_screening.resume_parser import ResumeParser
+    from src.resume_screening.screening_pipeline import ResumeScreeningPipeline
+    folder = os.path.join(args.workdir, 'resumes')
+    paths = sorted(os.path.join(folder, f) for f in os.listdir(folder))
+    parser = ResumeParser()
+    parser.skill_matcher  # Build the matcher outside the timed region
+
+    results = {}
+    for fmt in corpus.RESUME_FORMATS:
+        fmt_paths = [p for p in paths if p.endswith('.' + fmt)]
+        latencies = []
+        start = time.perf_counter()
+        for path in fmt_paths:
+            call_start = time.perf_counter()
+            parser.parse_resume(path)
+            latencies.append(time.perf_counter() - call_start)
+        results[f'parse_resume[{fmt}]'] = summarize(latencies, len(fmt_paths), time.perf_counter() - start, 'resumes')
+
+    pipeline = ResumeScreeningPipeline(use_cache=False, use_resume_store=False)
+    start = time.perf_counter()
+    parsed = pipeline.process_resumes_folder(folder)
+    results['process_resumes_folder[parallel]'] = summarize(
+        [r['parse_time'] for r in parsed], len(parsed), time.perf_counter() - start, 'resumes'
+    )
+    return results
+
+
+def bench_extract_requirements(args) -> dict:
+    from src.resume_screening.job_parser import JobDescriptionParser
+    parser = JobDescriptionParser()
+    job_descriptions = list(corpus.synthetic_job_descriptions(args.jobs, args.seed).values())
+    parser.extract_requirements(job_descriptions[0])  # Warm up shared matchers
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(args.repeats):
+        for text in job_descriptions:
+            call_start = time.perf_counter()
+            parser.extract_requirements(text)
+            latencies.append(time.perf_counter() - call_start)
+    return {'extract_requirements': summarize(
+        latencies, len(latencies), time.perf_counter() - start, 'job descriptions'
+    )}
+
+
+def bench_feedback(args) -> dict:
+    from src.sentiment_analysis.data_processor import SentimentDataProcessor
+    from src.sentiment_analysis.sentiment_pipeline import SentimentAnalysisPipeline
+    loader = SentimentAnalysisPipeline(use_cache=False)
+    processor = SentimentDataProcessor()
+    results = {}
+    for rows in args.feedback_rows:
+        for ext in ('csv', 'xlsx'):
+            path = os.path.join(args.workdir, f'feedback_{rows}.{ext}')
+            if not os.path.exists(path):
+                continue
+            start = time.perf_counter()
+            df = loader.load_feedback_data(path)
+            elapsed = time.perf_counter() - start
+            results[f'load_feedback_data[{ext},{rows}]'] = summarize([elapsed], rows, elapsed, 'rows')
+
+        latencies = []
+        for _ in range(args.repeats):
+            start = time.perf_counter()
+            processor.process_feedback_data(df, 'feedback')
+            latencies.append(time.perf_counter() - start)
+        results[f'process_feedback_data[{rows}]'] = summarize(
+            latencies, rows * args.repeats, sum(latencies), 'rows'
+        )
+    return results
+
+
+def bench_resume_pipeline(args) -> dict:
+    from src.resume_screening.screening_pipeline import ResumeScreeningPipeline
+    backend = timed_backend()
+    folder = os.path.join(args.workdir, 'resumes')
+    job_descriptions = corpus.synthetic_job_descriptions(args.jobs, args.seed)
+    job_description = next(iter(job_descriptions.values()))
+    results = {}
+    for name, packed in (('resume_pipeline', False), ('resume_pipeline[packed]', True)):
+        pipeline = ResumeScreeningPipeline(
+            max_concurrency=args.llm_concurrency, use_cache=False, packed_screening=packed, use_resume_store=False
+        )
+        backend.latencies = []
+        start = time.perf_counter()
+        df = pipeline.run_screening(folder, job_description)
+        results[name] = summarize(backend.latencies, len(df), time.perf_counter() - start, 'resumes')
+        results[name]['llm_calls'] = len(backend.latencies)
+        results[name]['median_prompt_tokens'] = float(df['prompt_tokens'].median())
+        results[name]['prompt_tokens_saved'] = int(df['prompt_tokens_saved'].sum())
+
+    pipeline = ResumeScreeningPipeline(max_concurrency=args.llm_concurrency, use_cache=False, use_resume_store=False)
+    backend.latencies = []
+    start = time.perf_counter()
+    frames = pipeline.run_multi_job_screening(folder, job_descriptions, top_k_per_job=10)
+    results['multi_job_pipeline'] = summarize(
+        backend.latencies, sum(len(df) for df in frames.values()), time.perf_counter() - start, 'screenings'
+    )
+    results['multi_job_pipeline']['llm_calls'] = len(backend.latencies)
+    return results
+
+
+def bench_sentiment_pipeline(args) -> dict:
+    from src.sentiment_analysis.sentiment_pipeline import SentimentAnalysisPipeline
+    backend = timed_backend()
+    df = corpus.synthetic_feedback(args.sentiment_rows, args.seed)
+    results = {}
+    for name, packed in (('sentiment_pipeline', False), ('sentiment_pipeline[packed]', True)):
+        pipeline = SentimentAnalysisPipeline(use_cache=False, packed_analysis=packed)
+        backend.latencies = []
+        start = time.perf_counter()
+        result = pipeline.run_sentiment_analysis(df, 'feedback')
+        results[name] = summarize(backend.latencies, len(result), time.perf_counter() - start, 'rows')
+        results[name]['llm_calls'] = len(backend.latencies)
+        results[name]['llm_errors'] = int((result['llm_error'] != '').sum())
+    return results
+
+
+BENCHMARKS = {
+    'parse_resume': bench_parse_resume,
+    'extract_requirements': bench_extract_requirements,
+    'feedback': bench_feedback,
+    'resume_pipeline': bench_resume_pipeline,
+    'sentiment_pipeline': bench_sentiment_pipeline,
+}
+
+
+def build_corpus(args):
+    resumes_folder = os.path.join(args.workdir, 'resumes')
+    if not os.path.isdir(resumes_folder) or len(os.listdir(resumes_folder)) != args.resumes:
+        corpus.generate_resume_corpus(resumes_folder, args.resumes, seed=args.seed)
+    for rows in args.feedback_rows:
+        csv_path = os.path.join(args.workdir, f'feedback_{rows}.csv')
+        if os.path.exists(csv_path):
+            continue
+        df = corpus.synthetic_feedback(rows, args.seed)
+        corpus.write_feedback(csv_path, df)
+        if rows <= args.max_xlsx_rows:
+            corpus.write_feedback(os.path.join(args.workdir, f'feedback_{rows}.xlsx'), df)
+
+
+def run_isolated(name: str, argv: list, args) -> dict:
+    env = dict(
+        os.environ,
+        LLM_BACKEND='stub',
+        LLM_STUB_LATENCY_MS=str(args.llm_latency_ms),
+        LLM_STUB_ERROR_RATE=str(args.llm_error_rate),
+        LLM_STUB_SEED=str(args.seed),
+        LLM_CACHE_DISABLED='1',
+    )
+    completed = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.bench_pipeline', *argv, '--child', name],
+        cwd=ROOT, env=env, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        return {'error': completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else 'failed'}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--resumes', type=int, default=120)
+    parser.add_argument('--jobs', type=int, default=20)
+    parser.add_argument('--feedback-rows', type=int, nargs='+', default=[1000, 100000])
+    parser.add_argument('--max-xlsx-rows', type=int, default=100000)
+    parser.add_argument('--sentiment-rows', type=int, default=200)
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--llm-latency-ms', type=float, default=50)
+    parser.add_argument('--llm-error-rate', type=float, default=0.0)
+    parser.add_argument('--llm-concurrency', type=int, default=8)
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--workdir', help='corpus directory (reused between runs); default: a temp dir')
+    parser.add_argument('--only', nargs='+', choices=list(BENCHMARKS))
+    parser.add_argument('--output', help='write the JSON report here as well as to stdout')
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        results = BENCHMARKS[args.child](args)
+        rss = peak_rss_mb()
+        for result in results.values():
+            result.update(rss)
+        # Progress output from the pipelines goes to stdout too; the report is the last line
+        print(json.dumps(results))
+        return
+
+    args.workdir = args.workdir or os.path.join(tempfile.gettempdir(), f'resume_screening_bench_{args.seed}')
+    os.makedirs(args.workdir, exist_ok=True)
+    print(f"Generating corpus in {args.workdir}...", file=sys.stderr)
+    build_corpus(args)
+
+    argv = sys.argv[1:]
+    if '--workdir' not in argv:
+        argv += ['--workdir', args.workdir]
+    report = {
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'config': {k: v for k, v in vars(args).items() if k not in ('child', 'output', 'only')},
+        'results': {},
+    }
+    for name in args.only or BENCHMARKS:
+        print(f"Running {name}...", file=sys.stderr)
+        outcome = run_isolated(name, argv, args)
+        if 'error' in outcome:
+            print(f"{name} failed: {outcome['error']}", file=sys.stderr)
+            outcome = {name: outcome}
+        report['results'].update(outcome)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(output)
+    print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+# benchmarks/bench_startup.py
+"""Measure cold-start cost (import + construction) of each pipeline module.
+
+Every measurement runs in a fresh interpreter, as a new uvicorn worker or
+Streamlit process would. Usage: python -m benchmarks.bench_startup [--runs 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+TARGETS = {
+    'ResumeScreeningPipeline': ('src.resume_screening.screening_pipeline', 'ResumeScreeningPipeline()'),
+    'SentimentAnalysisPipeline': ('src.sentiment_analysis.sentiment_pipeline', 'SentimentAnalysisPipeline()'),
+    'SentimentDataProcessor': ('src.sentiment_analysis.data_processor', 'SentimentDataProcessor()'),
+    'JobDescriptionParser': ('src.resume_screening.job_parser', 'JobDescriptionParser()'),
+}
+
+PROBE = """
+import json, time
+start = time.perf_counter()
+import {module} as m
+imported = time.perf_counter()
+m.{constructor}
+constructed = time.perf_counter()
+print(json.dumps({{'import': imported - start, 'construct': constructed - imported}}))
+"""
+
+
+def measure(module: str, constructor: str) -> dict:
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run(
+        [sys.executable, '-c', PROBE.format(module=module, constructor=constructor)],
+        cwd=root, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'target':<28}{'import (ms)':>14}{'construct (ms)':>16}")
+    for name, (module, constructor) in TARGETS.items():
+        samples = [measure(module, constructor) for _ in range(args.runs)]
+        import_ms = statistics.median(s['import'] for s in samples) * 1000
+        construct_ms = statistics.median(s['construct'] for s in samples) * 1000
+        print(f"{name:<28}{import_ms:>14.1f}{construct_ms:>16.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+# benchmarks/compare_compression.py
+"""Check that resume compression does not change screening scores.
+
+Every resume is screened twice against the same job description, once with
+its full text and once compressed to ``--budget`` tokens, and the two score
+columns are compared: mean/max absolute difference, Spearman rank correlation
+and overlap of the top-k shortlist. Local (LLM-free) scores of the parsed full
+and compressed text are compared the same way. Run it on a held-out folder of
+real resumes with LLM_BACKEND=gemini before enabling compression by default;
+the stub backend's scores are hashes of the prompt and only exercise the script.
+
+Usage: python -m benchmarks.compare_compression --resumes-folder held_out/ --job-description jd.txt
+       [--budget 2000] [--top-k 10] [--max-mean-diff 5] [--min-top-k-overlap 0.8]
+"""
+import argparse
+import json
+import sys
+import tempfile
+
+import pandas as pd
+
+from benchmarks import corpus
+
+
+def compare_scores(full: pd.Series, compressed: pd.Series, top_k: int) -> dict:
+    diff = (full - compressed).abs()
+    k = min(top_k, len(full))
+    top_full = set(full.nlargest(k).index)
+    top_compressed = set(compressed.nlargest(k).index)
+    return {
+        'mean_abs_diff': round(float(diff.mean()), 3),
+        'max_abs_diff': round(float(diff.max()), 3),
+        'spearman': round(float(full.corr(compressed, method='spearman')), 4) if len(full) > 1 else None,
+        'top_k_overlap': round(len(top_full & top_compressed) / k, 3) if k else None,
+    }
+
+
+def load_resumes(args) -> dict:
+    from src.resume_screening.screening_pipeline import ResumeScreeningPipeline
+    folder = args.resumes_folder
+    if folder is None:
+        folder = tempfile.mkdtemp(prefix='compression_')
+        corpus.generate_resume_corpus(folder, args.resumes, formats=('txt',), seed=args.seed)
+    pipeline = ResumeScreeningPipeline(use_cache=False, use_resume_store=False)
+    return {resume['filename']: resume for resume in pipeline.iter_resumes_folder(folder, parallel=False)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--resumes-folder', help="Held-out resumes; a synthetic corpus is generated when omitted")
+    parser.add_argument('--job-description', help="Job description text file; a synthetic one when omitted")
+    parser.add_argument('--resumes', type=int, default=40)
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--budget', type=int, default=2000)
+    parser.add_argument('--top-k', type=int, default=10)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--max-mean-diff', type=float, default=5.0, help="Allowed mean |LLM score change| out of 100")
+    parser.add_argument('--min-top-k-overlap', type=float, default=0.8)
+    parser.add_argument('--output')
+    args = parser.parse_args()
+
+    from src.resume_screening.job_parser import JobDescriptionParser
+    from src.resume_screening.llm_screener import LLMResumeScreener
+    from src.resume_screening.local_scorer import LocalResumeScorer
+    from src.resume_screening.resume_parser import ResumeParser
+    from src.utils.result_cache import ResultCache
+
+    if args.job_description:
+        with open(args.job_description, encoding='utf-8') as f:
+            job_description = f.read()
+    else:
+        job_description = next(iter(corpus.synthetic_job_descriptions(1, args.seed).values()))
+    job_requirements = JobDescriptionParser().extract_requirements(job_description)
+    resumes = load_resumes(args)
+    names = sorted(resumes)
+    print(f"Comparing {len(names)} resumes at a {args.budget}-token budget")
+
+    resume_parser = ResumeParser()
+    scorer = LocalResumeScorer()
+    compressed_screener = LLMResumeScreener(
+        max_concurrency=args.concurrency, cache=ResultCache(enabled=False), resume_token_budget=args.budget
+    )
+    compressed_text = {name: compressed_screener.compress_resume(resumes[name]['text'], job_requirements)['text']
+                       for name in names}
+    local = pd.DataFrame({
+        'full': [scorer.score(resumes[name], job_requirements)['local_score'] for name in names],
+        'compressed': [scorer.score(resume_parser.parse_text(compressed_text[name]), job_requirements)['local_score']
+                       for name in names],
+    }, index=names)
+
+    scores = {}
+    for label, budget in (('full', None), ('compressed', args.budget)):
+        screener = LLMResumeScreener(
+            max_concurrency=args.concurrency, cache=ResultCache(enabled=False), resume_token_budget=budget
+        )
+        results = screener.batch_screen_resumes([{'text': resumes[name]['text']} for name in names], job_requirements)
+        scores[label] = [float(result.get('overall_score', 0) or 0) for result in results]
+        if label == 'compressed':
+            tokens_saved = sum(result.get('prompt_tokens_saved', 0) for result in results)
+    llm = pd.DataFrame(scores, index=names)
+
+    report = {
+        'resumes': len(names),
+        'budget': args.budget,
+        'prompt_tokens_saved': int(tokens_saved),
+        'llm': compare_scores(llm['full'], llm['compressed'], args.top_k),
+        'local': compare_scores(local['full'] * 100, local['compressed'] * 100, args.top_k),
+    }
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    stable = (report['llm']['mean_abs_diff'] <= args.max_mean_diff and
+              (report['llm']['top_k_overlap'] or 0) >= args.min_top_k_overlap)
+    print("Scores stable under compression" if stable else "Compression changes screening scores beyond the limits")
+    sys.exit(0 if stable else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,166 @@
+# benchmarks/corpus.py
+"""Synthetic corpora for the benchmarks: resumes (PDF/DOCX/TXT), job descriptions and feedback.
+
+Everything is generated from a seed, so two runs (or two versions of the code)
+measure identical inputs. Usage: python -m benchmarks.corpus --resumes 200 --feedback-rows 10000 --out bench_data
+"""
+import argparse
+import os
+import random
+
+import pandas as pd
+
+from src.resume_screening.skill_matcher import get_skill_matcher
+
+FIRST_NAMES = ['Asha', 'Ben', 'Chen', 'Diego', 'Eva', 'Farah', 'Gita', 'Hiro', 'Ines', 'Jonas']
+LAST_NAMES = ['Patel', 'Smith', 'Wang', 'Garcia', 'Novak', 'Khan', 'Rao', 'Sato', 'Silva', 'Berg']
+DEGREES = ['Bachelor of Science', 'Master of Science', 'PhD', 'B.Tech', 'M.Tech', 'MCA']
+ROLES = ['Software Engineer', 'Data Scientist', 'Backend Developer', 'ML Engineer', 'DevOps Engineer']
+SENTENCES = [
+    "Designed and shipped services used by thousands of customers",
+    "Collaborated with product and design to deliver features on schedule",
+    "Mentored junior engineers and led code reviews",
+    "Improved reliability and reduced incident count across the platform",
+    "Automated deployment pipelines and monitoring",
+    "Owned data models, migrations and reporting for the team",
+]
+RESUME_FORMATS = ('pdf', 'docx', 'txt')
+
+PHRASES = [
+    "I really enjoy working with my team", "Management does not listen to our concerns",
+    "The workload has been overwhelming lately!!", "Great benefits, but pay is below market",
+    "no comments", "N/A", "good", "Considering other opportunities in 2024",
+    "My manager is supportive and gives clear feedback", "Too many meetings, not enough focus time",
+    "Career growth is limited here", "Flexible hours are the best part of the job :)",
+]
+DEPARTMENTS = ['Engineering', 'Sales', 'Support', 'Finance', 'Operations']
+
+
+def skill_names() -> list:
+    return sorted(get_skill_matcher().categories)
+
+
+def synthetic_resume_text(rng: random.Random, skills: list, sections: int = 3) -> str:
+    """A plain-text resume; ``sections`` roles of experience control its length"""
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    lines = [
+        name,
+        f"{name.lower().replace(' ', '.')}{rng.randint(1, 999)}@example.com | +1{rng.randint(2000000000, 9999999999)}",
+        "",
+        "SUMMARY",
+        f"{rng.choice(ROLES)} with {rng.randint(1, 15)} years of experience.",
+        "",
+        "SKILLS",
+        ', '.join(rng.sample(skills, rng.randint(5, 15))),
+        "",
+        "EXPERIENCE",
+    ]
+    for _ in range(sections):
+        lines.append(f"{rng.choice(ROLES)}, Company {rng.randint(1, 500)} ({rng.randint(2005, 2023)})")
+        for _ in range(rng.randint(3, 6)):
+            lines.append(f"- {rng.choice(SENTENCES)} using {rng.choice(skills)}.")
+        lines.append("")
+    lines += ["EDUCATION", f"{rng.choice(DEGREES)}, University {rng.randint(1, 100)}"]
+    return '\n'.join(lines)
+
+
+def write_resume(path: str, text: str):
+    """Write a resume as .txt, .docx (python-docx) or .pdf (PyMuPDF), by extension"""
+    if path.endswith('.docx'):
+        import docx
+        document = docx.Document()
+        for line in text.split('\n'):
+            document.add_paragraph(line)
+        document.save(path)
+    elif path.endswith('.pdf'):
+        import fitz
+        pdf = fitz.open()
+        lines = text.split('\n')
+        # ~50 lines fit on a page at the default font size
+        for start in range(0, len(lines), 50):
+            page = pdf.new_page()
+            page.insert_text((50, 60), '\n'.join(lines[start:start + 50]), fontsize=10)
+        pdf.save(path)
+        pdf.close()
+    else:
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(text)
+
+
+def generate_resume_corpus(folder: str, count: int, formats=RESUME_FORMATS, seed: int = 7) -> list:
+    """Write ``count`` resumes of varied length, cycling through ``formats``; returns the paths"""
+    rng = random.Random(seed)
+    skills = skill_names()
+    os.makedirs(folder, exist_ok=True)
+    paths = []
+    for i in range(count):
+        path = os.path.join(folder, f"resume_{i:06d}.{formats[i % len(formats)]}")
+        write_resume(path, synthetic_resume_text(rng, skills, sections=rng.choice([1, 2, 4, 8])))
+        paths.append(path)
+    return paths
+
+
+def synthetic_job_description(rng: random.Random, skills: list) -> str:
+    role = rng.choice(ROLES)
+    return '\n'.join([
+        f"We are hiring a {role}.",
+        f"Requirements: {rng.randint(1, 10)}+ years of experience in a similar role.",
+        f"Must have: {', '.join(rng.sample(skills, rng.randint(4, 10)))}.",
+        f"Nice to have: {', '.join(rng.sample(skills, rng.randint(2, 5)))}.",
+        f"Education: {rng.choice(DEGREES)} in Computer Science or related field.",
+        ' '.join(rng.sample(SENTENCES, 3)) + '.',
+    ])
+
+
+def synthetic_job_descriptions(count: int, seed: int = 7) -> dict:
+    rng = random.Random(seed)
+    skills = skill_names()
+    return {f"job_{i:04d}": synthetic_job_description(rng, skills) for i in range(count)}
+
+
+def synthetic_feedback(rows: int, seed: int = 7) -> pd.DataFrame:
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(rows):
+        texts.append('. '.join(rng.sample(PHRASES, rng.randint(1, 3))))
+    return pd.DataFrame({
+        'employee_id': [rng.randint(1, max(1, rows // 5)) for _ in range(rows)],
+        'department': [rng.choice(DEPARTMENTS) for _ in range(rows)],
+        'feedback': texts
+    })
+
+
+def write_feedback(path: str, df: pd.DataFrame):
+    """Write feedback as CSV or XLSX (openpyxl), by extension"""
+    if path.endswith('.xlsx'):
+        df.to_excel(path, index=False)
+    else:
+        df.to_csv(path, index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--resumes', type=int, default=200)
+    parser.add_argument('--jobs', type=int, default=5)
+    parser.add_argument('--feedback-rows', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--out', default='bench_data')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    generate_resume_corpus(os.path.join(args.out, 'resumes'), args.resumes, seed=args.seed)
+    jobs_folder = os.path.join(args.out, 'jobs')
+    os.makedirs(jobs_folder, exist_ok=True)
+    for job_id, text in synthetic_job_descriptions(args.jobs, args.seed).items():
+        with open(os.path.join(jobs_folder, f"{job_id}.txt"), 'w', encoding='utf-8') as file:
+            file.write(text)
+    for rows in args.feedback_rows:
+        df = synthetic_feedback(rows, args.seed)
+        write_feedback(os.path.join(args.out, f"feedback_{rows}.csv"), df)
+        # Excel caps sheets at 1,048,576 rows and writing is slow, so only small sizes get an .xlsx
+        if rows <= 100000:
+            write_feedback(os.path.join(args.out, f"feedback_{rows}.xlsx"), df)
+    print(f"Corpus written to {args.out}")
+
+
+if __name__ == '__main__':
+    main()
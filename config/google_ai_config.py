@@ -1,15 +1,34 @@
 import os
-import google.generativeai as genai
+import threading
 from dotenv import load_dotenv
 
+_shared_lock = threading.Lock()
+_shared_models = {}
+
 
 class GoogleAIConfig:
+    model_name = "gemini-1.5-pro"
+
     def __init__(self):
         load_dotenv()
         self.api_key = os.getenv("GOOGLE_API_KEY")
         if not self.api_key:
             raise ValueError("GOOGLE_API_KEY not found in environment variables.")
+        # Imported here rather than at module level: the SDK takes ~1s to import
+        import google.generativeai as genai
+        self.genai = genai
         genai.configure(api_key=self.api_key)
 
     def get_model(self):
-        return genai.GenerativeModel(model_name="gemini-1.5-pro")
+        return self.genai.GenerativeModel(model_name=self.model_name)
+
+
+def get_shared_model(model_name: str = None):
+    """Return a process-wide model client, configuring the SDK on first use"""
+    model_name = model_name or GoogleAIConfig.model_name
+    with _shared_lock:
+        if model_name not in _shared_models:
+            config = GoogleAIConfig()
+            config.model_name = model_name
+            _shared_models[model_name] = config.get_model()
+        return _shared_models[model_name]
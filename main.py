@@ -28,6 +28,7 @@ def resume_screening_app():
         accept_multiple_files=True,
         type=['pdf', 'docx', 'txt']
     )
+    use_cache = not st.checkbox("Bypass result cache (force fresh LLM calls)")
     
     if st.button("Screen Resumes") and job_desc and uploaded_files:
         # Save uploaded files temporarily
@@ -36,22 +37,33 @@ def resume_screening_app():
             with open(f"temp_resumes/{uploaded_file.name}", "wb") as f:
                 f.write(uploaded_file.getbuffer())
         
-        # Run screening
-        pipeline = ResumeScreeningPipeline()
-        results = pipeline.run_screening("temp_resumes", job_desc)
-        
-        # Display results
+        # Run screening, updating the table as each resume is scored
+        pipeline = ResumeScreeningPipeline(use_cache=use_cache)
         st.subheader("Screening Results")
-        st.dataframe(results[['filename', 'overall_score', 'recommendation']])
+        progress = st.progress(0.0)
+        table = st.empty()
+        rows = []
+        for row in pipeline.iter_screening("temp_resumes", job_desc):
+            rows.append(row)
+            progress.progress(min(1.0, len(rows) / len(uploaded_files)))
+            results = pd.DataFrame(rows).sort_values('overall_score', ascending=False)
+            table.dataframe(results[['filename', 'overall_score', 'recommendation']])
+        progress.empty()
         
-        # Download results
-        csv = results.to_csv(index=False)
-        st.download_button(
-            label="Download Results as CSV",
-            data=csv,
-            file_name="resume_screening_results.csv",
-            mime="text/csv"
-        )
+        if rows:
+            cache_stats = pipeline.llm_screener.cache.stats()
+            st.caption(f"Cache hits: {cache_stats['hits']}, misses: {cache_stats['misses']}")
+            
+            # Download results
+            csv = results.to_csv(index=False)
+            st.download_button(
+                label="Download Results as CSV",
+                data=csv,
+                file_name="resume_screening_results.csv",
+                mime="text/csv"
+            )
+        else:
+            st.warning("No resumes could be processed.")
         
         # Clean up temporary files
         import shutil
@@ -1,15 +1,21 @@
 # src/resume_screening/job_parser.py
 import re
 from typing import Dict, List
+from .skill_matcher import get_skill_matcher
+
+KEYWORD_STOPWORDS = {
+    'the', 'and', 'for', 'with', 'you', 'our', 'are', 'will', 'have', 'has', 'this', 'that',
+    'from', 'your', 'who', 'all', 'any', 'can', 'not', 'but', 'their', 'they', 'them', 'about',
+    'into', 'over', 'more', 'must', 'should', 'would', 'able', 'also', 'including', 'such',
+    'work', 'working', 'role', 'team', 'looking', 'years', 'year', 'yrs', 'experience',
+    'required', 'requirements', 'preferred', 'skills', 'strong', 'good', 'plus', 'related',
+    'field', 'degree', 'education', 'etc', 'using', 'well', 'what', 'we', 'is', 'in', 'of', 'to'
+}
 
 class JobDescriptionParser:
-    def __init__(self):
-        self.skill_patterns = {
-            'programming': r'\b(python|java|javascript|c\+\+|react|angular|node\.js)\b',
-            'databases': r'\b(mysql|postgresql|mongodb|redis|oracle)\b',
-            'frameworks': r'\b(django|flask|spring|express|laravel)\b',
-            'tools': r'\b(git|docker|kubernetes|jenkins|aws|azure)\b'
-        }
+    @property
+    def skill_matcher(self):
+        return get_skill_matcher()
     
     def extract_requirements(self, job_description: str) -> Dict:
         """Extract key requirements from job description"""
@@ -17,14 +23,14 @@ class JobDescriptionParser:
             'skills': [],
             'experience_years': 0,
             'education': [],
-            'certifications': []
+            'certifications': [],
+            'keywords': []
         }
         
         # Extract skills
         text_lower = job_description.lower()
-        for category, pattern in self.skill_patterns.items():
-            matches = re.findall(pattern, text_lower, re.IGNORECASE)
-            requirements['skills'].extend(matches)
+        # Original case: capitalization tells the product "Swift" from the word "swift"
+        requirements['skills'] = self.skill_matcher.find_skills(job_description)
         
         # Extract experience years
         exp_pattern = r'(\d+)[\s\-\+]*(?:years?|yrs?)'
@@ -37,14 +43,20 @@ class JobDescriptionParser:
         edu_matches = re.findall(edu_pattern, text_lower, re.IGNORECASE)
         requirements['education'] = list(set(edu_matches))
         
+        # Extract significant keywords for local (pre-LLM) matching
+        words = re.findall(r'[a-z][a-z0-9+#.]*', text_lower)
+        keywords = {w.rstrip('.') for w in words if len(w) > 2 and w not in KEYWORD_STOPWORDS}
+        requirements['keywords'] = sorted(k for k in keywords if k not in KEYWORD_STOPWORDS)
+        
         return requirements
 
-# Usage example
-job_parser = JobDescriptionParser()
-job_desc = """
-We are looking for a Software Engineer with 3+ years of experience.
-Required skills: Python, Django, PostgreSQL, Docker, AWS.
-Education: Bachelor's degree in Computer Science or related field.
-"""
-job_requirements = job_parser.extract_requirements(job_desc)
-print(job_requirements)
\ No newline at end of file
+if __name__ == "__main__":
+    # Usage example
+    job_parser = JobDescriptionParser()
+    job_desc = """
+    We are looking for a Software Engineer with 3+ years of experience.
+    Required skills: Python, Django, PostgreSQL, Docker, AWS.
+    Education: Bachelor's degree in Computer Science or related field.
+    """
+    job_requirements = job_parser.extract_requirements(job_desc)
+    print(job_requirements)
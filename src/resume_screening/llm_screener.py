@@ -1,11 +1,84 @@
 # src/resume_screening/llm_screener.py
-from config.google_ai_config import GoogleAIConfig
-import json
+from src.utils.concurrency import iter_bounded, map_bounded, retry_with_backoff
+from src.utils.llm_backend import LLMBackend, get_backend
+from src.utils.prompt_packing import estimate_tokens, pack_items, parse_json_array, resolve_pack
+from src.utils.result_cache import ResultCache
+from src.utils.structured_output import conform, generate_structured, string_enum
+from .resume_compressor import ResumeCompressor
+
+STRING_LIST = {'type': 'ARRAY', 'items': {'type': 'STRING'}}
+# Response schema for one screening; required fields are re-asked if missing
+SCREENING_SCHEMA = {
+    'type': 'OBJECT',
+    'properties': {
+        'overall_score': {'type': 'NUMBER'},
+        'skills_match': {
+            'type': 'OBJECT',
+            'properties': {
+                'matched_skills': STRING_LIST,
+                'missing_skills': STRING_LIST,
+                'skills_score': {'type': 'NUMBER'}
+            },
+            'required': ['matched_skills', 'missing_skills', 'skills_score']
+        },
+        'experience_match': {
+            'type': 'OBJECT',
+            'properties': {
+                'candidate_experience': {'type': 'NUMBER'},
+                'meets_requirement': {'type': 'BOOLEAN'},
+                'experience_score': {'type': 'NUMBER'}
+            },
+            'required': ['experience_score']
+        },
+        'education_match': {
+            'type': 'OBJECT',
+            'properties': {
+                'candidate_education': STRING_LIST,
+                'meets_requirement': {'type': 'BOOLEAN'},
+                'education_score': {'type': 'NUMBER'}
+            },
+            'required': ['education_score']
+        },
+        'strengths': STRING_LIST,
+        'concerns': STRING_LIST,
+        'recommendation': string_enum('HIRE', 'CONSIDER', 'REJECT')
+    },
+    'required': ['overall_score', 'skills_match', 'experience_match', 'education_match', 'recommendation']
+}
+PACKED_SCREENING_SCHEMA = {
+    'type': 'ARRAY',
+    'items': dict(
+        SCREENING_SCHEMA,
+        properties=dict(SCREENING_SCHEMA['properties'], resume_id={'type': 'STRING'}),
+        required=['resume_id'] + SCREENING_SCHEMA['required']
+    )
+}
 
 class LLMResumeScreener:
-    def __init__(self):
-        self.ai_config = GoogleAIConfig()
-        self.model = self.ai_config.get_model()
+    # Bump whenever create_screening_prompt changes so cached results are not reused
+    PROMPT_VERSION = "screening-v1"
+    PACKED_PROMPT_VERSION = "screening-packed-v1"
+
+    def __init__(self, max_concurrency: int = 8, max_retries: int = 3, retry_base_delay: float = 1.0,
+                 cache: ResultCache = None, pack_token_budget: int = 8000, max_pack_size: int = 10,
+                 backend: LLMBackend = None, resume_token_budget: int = None, max_field_reasks: int = 1):
+        self._backend = backend
+        # Opt-in: resume text is compressed to this many tokens before prompting; None sends it verbatim.
+        # Check score stability with benchmarks/compare_compression.py before turning it on.
+        self.compressor = ResumeCompressor(resume_token_budget) if resume_token_budget else None
+        self.max_field_reasks = max_field_reasks
+        self.cache = cache if cache is not None else ResultCache()
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.pack_token_budget = pack_token_budget
+        self.max_pack_size = max_pack_size
+    
+    @property
+    def backend(self) -> LLMBackend:
+        if self._backend is None:
+            self._backend = get_backend()
+        return self._backend
     
     def create_screening_prompt(self, resume_text: str, job_requirements: dict) -> str:
         prompt = f"""
@@ -45,15 +118,89 @@ class LLMResumeScreener:
         """
         return prompt
     
-    def screen_resume(self, resume_text: str, job_requirements: dict) -> dict:
+    def create_packed_screening_prompt(self, resumes: list, job_requirements: dict) -> str:
+        """Build one prompt that screens several (resume_id, resume_text) pairs at once"""
+        resume_blocks = "\n".join(
+            f"=== RESUME ID: {resume_id} ===\n{resume_text}\n=== END RESUME {resume_id} ==="
+            for resume_id, resume_text in resumes
+        )
+        prompt = f"""
+        You are an expert HR recruiter. Analyze each of the following {len(resumes)} resumes independently against the job requirements and provide a detailed evaluation for every one of them.
+
+        JOB REQUIREMENTS:
+        - Required Skills: {', '.join(job_requirements.get('skills', []))}
+        - Experience Required: {job_requirements.get('experience_years', 0)} years
+        - Education: {', '.join(job_requirements.get('education', []))}
+
+        RESUMES:
+        {resume_blocks}
+
+        Respond with a single JSON array containing exactly one object per resume, in the following format:
+        [
+            {{
+                "resume_id": "<the RESUME ID exactly as given>",
+                "overall_score": <score out of 100>,
+                "skills_match": {{
+                    "matched_skills": [list of matched skills],
+                    "missing_skills": [list of missing critical skills],
+                    "skills_score": <score out of 100>
+                }},
+                "experience_match": {{
+                    "candidate_experience": <years>,
+                    "meets_requirement": <true/false>,
+                    "experience_score": <score out of 100>
+                }},
+                "education_match": {{
+                    "candidate_education": [list],
+                    "meets_requirement": <true/false>,
+                    "education_score": <score out of 100>
+                }},
+                "strengths": [list of candidate strengths],
+                "concerns": [list of potential concerns],
+                "recommendation": "HIRE/CONSIDER/REJECT"
+            }}
+        ]
+        Be objective and thorough, and evaluate each resume only on its own content.
+        """
+        return prompt
+
+    def cache_key(self, resume_text: str, job_requirements: dict, packed: bool = False) -> str:
+        return ResultCache.make_key(
+            'screening', self.PACKED_PROMPT_VERSION if packed else self.PROMPT_VERSION,
+            self.backend.model_name, job_requirements, resume_text
+        )
+
+    def compress_resume(self, resume_text: str, job_requirements: dict) -> dict:
+        """Prompt-ready resume text plus token accounting (see ResumeCompressor.compress)"""
+        if self.compressor is None:
+            tokens = estimate_tokens(resume_text)
+            return {'text': resume_text, 'original_tokens': tokens, 'compressed_tokens': tokens, 'tokens_saved': 0}
+        return self.compressor.compress(resume_text, job_requirements)
+
+    @staticmethod
+    def _add_prompt_stats(result: dict, compression: dict) -> dict:
+        result['prompt_tokens'] = compression['compressed_tokens']
+        result['prompt_tokens_saved'] = compression['tokens_saved']
+        return result
+
+    def screen_resume(self, resume_text: str, job_requirements: dict, bypass_cache: bool = False) -> dict:
+        compression = self.compress_resume(resume_text, job_requirements)
+        result = self._screen_text(compression['text'], job_requirements, bypass_cache)
+        return self._add_prompt_stats(result, compression)
+
+    def _screen_text(self, resume_text: str, job_requirements: dict, bypass_cache: bool = False) -> dict:
+        """Screen already-compressed resume text with one (cached) LLM call"""
+        key = self.cache_key(resume_text, job_requirements)
+        if not bypass_cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
         prompt = self.create_screening_prompt(resume_text, job_requirements)
         try:
-            response = self.model.generate_content(prompt)
-            response_text = response.text
-            start_idx = response_text.find('{')
-            end_idx = response_text.rfind('}') + 1
-            json_str = response_text[start_idx:end_idx]
-            return json.loads(json_str)
+            result = generate_structured(self._generate, prompt, SCREENING_SCHEMA, self.max_field_reasks)
+            self.cache.set(key, result)
+            return result
         except Exception as e:
             print(f"Error in resume screening: {e}")
             return {
@@ -61,12 +208,114 @@ class LLMResumeScreener:
                 "error": str(e)
             }
     
-    def batch_screen_resumes(self, resumes_data: list, job_requirements: dict) -> list:
-        results = []
+    def _generate(self, prompt: str, **kwargs):
+        """One backend call, retried with backoff on transient errors"""
+        return retry_with_backoff(
+            lambda: self.backend.generate(prompt, **kwargs),
+            max_retries=self.max_retries,
+            base_delay=self.retry_base_delay
+        )
+
+    def _screen_pack(self, pack: list, job_requirements: dict) -> dict:
+        prompt = self.create_packed_screening_prompt(pack, job_requirements)
+        response = self._generate(prompt, response_schema=PACKED_SCREENING_SCHEMA)
+        return parse_json_array(response.text, 'resume_id')
+
+    @staticmethod
+    def _is_valid_screening(result: dict) -> bool:
+        return not conform(result, SCREENING_SCHEMA)
+
+    def screen_resumes_packed(self, resumes_data: list, job_requirements: dict,
+                              max_concurrency: int = None, bypass_cache: bool = False) -> list:
+        """Screen several resumes per request; entries that come back missing or malformed are re-asked"""
+        max_concurrency = max_concurrency or self.max_concurrency
+        results = {}
+        pending = []
+        compressions = [self.compress_resume(r['text'], job_requirements) for r in resumes_data]
+        for i, compression in enumerate(compressions):
+            key = self.cache_key(compression['text'], job_requirements, packed=True)
+            cached = None if bypass_cache else self.cache.get(key)
+            if cached is not None:
+                results[i] = cached
+            else:
+                pending.append((i, compression['text']))
+
+        # The instruction block is shared by the whole pack, so only resume text counts against the budget
+        budget = max(1, self.pack_token_budget - estimate_tokens(self.create_packed_screening_prompt([], job_requirements)))
+        packs = pack_items(pending, budget, self.max_pack_size)
+        print(f"Screening {len(pending)} resumes in {len(packs)} packed requests ({len(results)} cached)")
+
+        def screen_one(i, resume_text):
+            return self._screen_text(resume_text, job_requirements, bypass_cache)
+
+        def run_pack(pack):
+            pack_results = resolve_pack(
+                pack,
+                lambda p: self._screen_pack(p, job_requirements),
+                self._is_valid_screening,
+                screen_one
+            )
+            texts = dict(pack)
+            for i, result in pack_results.items():
+                result.pop('resume_id', None)
+                if 'error' not in result:
+                    self.cache.set(self.cache_key(texts[i], job_requirements, packed=True), result)
+            return pack_results
+
+        for pack_results in map_bounded(run_pack, packs, max_concurrency):
+            results.update(pack_results)
+
+        screened = []
         for i, resume_data in enumerate(resumes_data):
-            print(f"Screening resume {i+1}/{len(resumes_data)}")
-            result = self.screen_resume(resume_data['text'], job_requirements)
+            result = self._add_prompt_stats(results[i], compressions[i])
+            result['resume_id'] = resume_data.get('id', i)
+            result['candidate_email'] = resume_data.get('email', '')
+            screened.append(result)
+        return screened
+
+    def batch_screen_resumes(self, resumes_data: list, job_requirements: dict,
+                             max_concurrency: int = None, bypass_cache: bool = False,
+                             packed: bool = False) -> list:
+        """Screen resumes concurrently; results are returned in input order"""
+        if packed:
+            return self.screen_resumes_packed(resumes_data, job_requirements, max_concurrency, bypass_cache)
+        max_concurrency = max_concurrency or self.max_concurrency
+        total = len(resumes_data)
+
+        def screen_one(indexed):
+            i, resume_data = indexed
+            result = self.screen_resume(resume_data['text'], job_requirements, bypass_cache)
             result['resume_id'] = resume_data.get('id', i)
             result['candidate_email'] = resume_data.get('email', '')
-            results.append(result)
-        return results
+            print(f"Screened resume {i+1}/{total}")
+            return result
+
+        return map_bounded(screen_one, enumerate(resumes_data), max_concurrency)
+
+    def batch_screen_pairs(self, pairs: list, max_concurrency: int = None, bypass_cache: bool = False) -> list:
+        """Screen (resume_data, job_requirements) pairs concurrently; results are in input order"""
+        max_concurrency = max_concurrency or self.max_concurrency
+
+        def screen_one(pair):
+            resume_data, job_requirements = pair
+            result = self.screen_resume(resume_data['text'], job_requirements, bypass_cache)
+            result['resume_id'] = resume_data.get('id')
+            result['candidate_email'] = resume_data.get('email', '')
+            return result
+
+        return map_bounded(screen_one, pairs, max_concurrency)
+
+    def iter_screen_resumes(self, resumes_data, job_requirements: dict,
+                            max_concurrency: int = None, bypass_cache: bool = False):
+        """Yield (resume_data, result) pairs as each call returns, consuming ``resumes_data`` lazily"""
+        max_concurrency = max_concurrency or self.max_concurrency
+
+        def screen_one(indexed):
+            i, resume_data = indexed
+            result = self.screen_resume(resume_data['text'], job_requirements, bypass_cache)
+            result['resume_id'] = resume_data.get('id', i)
+            result['candidate_email'] = resume_data.get('email', '')
+            return resume_data, result
+
+        for _, pair in iter_bounded(screen_one, enumerate(resumes_data), max_concurrency):
+            yield pair
@@ -0,0 +1,170 @@
+# src/resume_screening/local_scorer.py
+import re
+from typing import Dict, List, Tuple
+
+import numpy as np
+from scipy import sparse
+
+EDUCATION_RANKS = {
+    'bca': 1, 'b.e': 1, 'b.tech': 1, 'bachelor': 1,
+    'mca': 2, 'm.e': 2, 'm.tech': 2, 'master': 2,
+    'phd': 3
+}
+
+class LocalResumeScorer:
+    """Deterministic, LLM-free scoring of parsed resumes with the ``ScreeningCriteria`` weights"""
+
+    DEFAULT_WEIGHTS = {
+        'skills_weight': 0.4,
+        'experience_weight': 0.3,
+        'education_weight': 0.2,
+        'keywords_weight': 0.1
+    }
+
+    def __init__(self, criteria=None):
+        self.weights = {}
+        for name, default in self.DEFAULT_WEIGHTS.items():
+            if isinstance(criteria, dict):
+                self.weights[name] = criteria.get(name, default)
+            else:
+                self.weights[name] = getattr(criteria, name, default)
+        # ScreeningCriteria.minimum_score; the default floor for shortlist()
+        if isinstance(criteria, dict):
+            self.minimum_score = criteria.get('minimum_score')
+        else:
+            self.minimum_score = getattr(criteria, 'minimum_score', None)
+
+    def skills_score(self, resume_data: Dict, job_requirements: Dict) -> float:
+        required = set(job_requirements.get('skills', []))
+        if not required:
+            return 1.0
+        return len(required & set(resume_data.get('skills', []))) / len(required)
+
+    def experience_score(self, resume_data: Dict, job_requirements: Dict) -> float:
+        required = job_requirements.get('experience_years', 0)
+        if not required:
+            return 1.0
+        return min(1.0, resume_data.get('experience', 0) / required)
+
+    def education_score(self, resume_data: Dict, job_requirements: Dict) -> float:
+        required = [EDUCATION_RANKS.get(e, 0) for e in job_requirements.get('education', [])]
+        if not required:
+            return 1.0
+        candidate = [EDUCATION_RANKS.get(e, 0) for e in resume_data.get('education', [])]
+        if not candidate:
+            return 0.0
+        return 1.0 if max(candidate) >= min(required) else 0.5
+
+    @staticmethod
+    def resume_words(resume_data: Dict) -> set:
+        return {w.rstrip('.') for w in re.findall(r'[a-z][a-z0-9+#.]*', resume_data.get('text', '').lower())}
+
+    def keywords_score(self, resume_data: Dict, job_requirements: Dict) -> float:
+        keywords = set(job_requirements.get('keywords', []))
+        if not keywords:
+            return 1.0
+        return len(keywords & self.resume_words(resume_data)) / len(keywords)
+
+    def score(self, resume_data: Dict, job_requirements: Dict) -> Dict[str, float]:
+        """Return the weighted local score and its sub-scores, all in [0, 1]"""
+        scores = {
+            'local_skills_score': self.skills_score(resume_data, job_requirements),
+            'local_experience_score': self.experience_score(resume_data, job_requirements),
+            'local_education_score': self.education_score(resume_data, job_requirements),
+            'local_keywords_score': self.keywords_score(resume_data, job_requirements)
+        }
+        total_weight = sum(self.weights.values()) or 1.0
+        scores['local_score'] = round((
+            self.weights['skills_weight'] * scores['local_skills_score'] +
+            self.weights['experience_weight'] * scores['local_experience_score'] +
+            self.weights['education_weight'] * scores['local_education_score'] +
+            self.weights['keywords_weight'] * scores['local_keywords_score']
+        ) / total_weight, 4)
+        return scores
+
+    @staticmethod
+    def _overlap(resume_sets: List[set], job_sets: List[set]) -> np.ndarray:
+        """Fraction of each job's items present in each resume, via one sparse product"""
+        vocabulary = {}
+        for items in job_sets:
+            for item in items:
+                vocabulary.setdefault(item, len(vocabulary))
+
+        def incidence(sets):
+            rows, cols = [], []
+            for row, items in enumerate(sets):
+                for item in items:
+                    col = vocabulary.get(item)
+                    if col is not None:
+                        rows.append(row)
+                        cols.append(col)
+            return sparse.csr_matrix(
+                (np.ones(len(rows), dtype=np.float32), (rows, cols)),
+                shape=(len(sets), max(1, len(vocabulary)))
+            )
+
+        matches = np.asarray(incidence(resume_sets).dot(incidence(job_sets).T).todense())
+        sizes = np.array([len(items) for items in job_sets], dtype=np.float32)
+        return np.where(sizes > 0, matches / np.maximum(sizes, 1), 1.0)
+
+    def score_matrix(self, resumes_data: List[Dict], jobs_requirements: List[Dict]) -> Dict[str, np.ndarray]:
+        """Score every resume against every job; returns the keys of ``score`` as (n_resumes, n_jobs) arrays"""
+        skills = self._overlap(
+            [set(r.get('skills', [])) for r in resumes_data],
+            [set(j.get('skills', [])) for j in jobs_requirements]
+        )
+        keywords = self._overlap(
+            [self.resume_words(r) for r in resumes_data],
+            [set(j.get('keywords', [])) for j in jobs_requirements]
+        )
+
+        candidate_years = np.array([r.get('experience', 0) for r in resumes_data], dtype=np.float32)[:, None]
+        required_years = np.array([j.get('experience_years', 0) for j in jobs_requirements], dtype=np.float32)[None, :]
+        experience = np.where(
+            required_years > 0, np.minimum(1.0, candidate_years / np.maximum(required_years, 1)), 1.0
+        )
+
+        candidate_rank = np.array([
+            max([EDUCATION_RANKS.get(e, 0) for e in r.get('education', [])], default=-1) for r in resumes_data
+        ], dtype=np.float32)[:, None]
+        required_rank = np.array([
+            min([EDUCATION_RANKS.get(e, 0) for e in j.get('education', [])], default=-1) for j in jobs_requirements
+        ], dtype=np.float32)[None, :]
+        education = np.where(
+            required_rank < 0, 1.0,
+            np.where(candidate_rank < 0, 0.0, np.where(candidate_rank >= required_rank, 1.0, 0.5))
+        )
+
+        total_weight = sum(self.weights.values()) or 1.0
+        local_score = (
+            self.weights['skills_weight'] * skills +
+            self.weights['experience_weight'] * experience +
+            self.weights['education_weight'] * education +
+            self.weights['keywords_weight'] * keywords
+        ) / total_weight
+        return {
+            'local_skills_score': skills,
+            'local_experience_score': experience,
+            'local_education_score': education,
+            'local_keywords_score': keywords,
+            'local_score': np.round(local_score, 4)
+        }
+
+    def shortlist(self, resumes_data: List[Dict], job_requirements: Dict,
+                  top_k: int = None, min_score: float = None) -> Tuple[List[Dict], List[Dict]]:
+        """Split resumes into (shortlisted, not_shortlisted) by ``min_score`` (default: criteria's minimum_score) and ``top_k``"""
+        if min_score is None:
+            min_score = self.minimum_score
+        for resume_data in resumes_data:
+            resume_data['local_scores'] = self.score(resume_data, job_requirements)
+
+        ranked = sorted(resumes_data, key=lambda r: r['local_scores']['local_score'], reverse=True)
+        if min_score is not None:
+            ranked = [r for r in ranked if r['local_scores']['local_score'] >= min_score]
+        if top_k is not None:
+            ranked = ranked[:top_k]
+
+        selected = {id(r) for r in ranked}
+        shortlisted = [r for r in resumes_data if id(r) in selected]
+        rejected = [r for r in resumes_data if id(r) not in selected]
+        return shortlisted, rejected
@@ -0,0 +1,174 @@
+# src/resume_screening/resume_compressor.py
+import re
+import unicodedata
+from collections import Counter
+from typing import Dict, List
+
+from src.utils.prompt_packing import estimate_tokens
+
+# Section headings by canonical name; a line is a heading if it is one of these on its own
+SECTION_HEADINGS = {
+    'summary': ['summary', 'profile', 'objective', 'about me', 'professional summary', 'career objective',
+                'career summary', 'professional profile'],
+    'experience': ['experience', 'work experience', 'professional experience', 'employment history',
+                   'work history', 'career history', 'employment', 'relevant experience'],
+    'skills': ['skills', 'technical skills', 'core competencies', 'key skills', 'technologies',
+               'tools', 'skills and tools', 'competencies', 'technical expertise'],
+    'education': ['education', 'academic background', 'qualifications', 'academic qualifications',
+                  'education and training'],
+    'projects': ['projects', 'key projects', 'personal projects', 'selected projects'],
+    'certifications': ['certifications', 'certificates', 'licenses', 'licenses and certifications',
+                       'training', 'courses'],
+    'publications': ['publications', 'papers', 'research'],
+    'awards': ['awards', 'honors', 'honours', 'achievements', 'accomplishments'],
+    'languages': ['languages'],
+    'volunteer': ['volunteer', 'volunteering', 'volunteer experience', 'community'],
+    'interests': ['interests', 'hobbies', 'personal interests', 'hobbies and interests'],
+    'references': ['references'],
+}
+HEADING_LOOKUP = {alias: name for name, aliases in SECTION_HEADINGS.items() for alias in aliases}
+
+# Base relevance of each section type for screening; job-term hits are added on top
+SECTION_PRIORITY = {
+    'header': 3.0, 'skills': 3.0, 'experience': 2.5, 'summary': 2.0, 'education': 2.0,
+    'certifications': 1.5, 'projects': 1.5, 'other': 1.0, 'awards': 0.8, 'publications': 0.8,
+    'languages': 0.5, 'volunteer': 0.5, 'interests': 0.2, 'references': 0.0,
+}
+
+BOILERPLATE_PATTERNS = [re.compile(p, re.IGNORECASE) for p in (
+    r'^(page\s*)?\d+\s*(of|/)\s*\d+$',
+    r'^page\s+\d+$',
+    r'^[-–\s]*\d+[-–\s]*$',
+    r'^(curriculum vitae|resume|résumé|cv)$',
+    r'references\s+(are\s+)?(available\s+)?(up)?on\s+request',
+    r'^(strictly\s+)?(private\s+and\s+)?confidential$',
+)]
+BULLETS = re.compile('[\u2022\u25aa\u25cf\u25e6\u2023\u27a2\u25ba\u25a0\u2043\uf0b7]')
+CONTROL_CHARS = re.compile('[\u0000-\u0008\u000b\u000e-\u001f\u007f\u200b-\u200d\ufeff]')
+
+
+class ResumeCompressor:
+    """Shrink resume text to a token budget, keeping the sections most relevant to the job"""
+
+    def __init__(self, token_budget: int = 2000, repeated_line_threshold: int = 3):
+        self.token_budget = token_budget
+        self.repeated_line_threshold = repeated_line_threshold
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        text = unicodedata.normalize('NFKC', text)
+        text = text.replace('\r\n', '\n').replace('\r', '\n').replace('\f', '\n')
+        text = CONTROL_CHARS.sub('', text)
+        text = BULLETS.sub('-', text)
+        text = re.sub(r'(\w)-\n(\w)', r'\1\2', text)
+        text = re.sub(r'[ \t\u00a0]+', ' ', text)
+        lines = [line.strip() for line in text.split('\n')]
+        return re.sub(r'\n{3,}', '\n\n', '\n'.join(lines)).strip()
+
+    def drop_boilerplate(self, lines: List[str]) -> List[str]:
+        # Short lines repeated on every page are headers/footers; keep only their first occurrence
+        counts = Counter(line for line in lines if line and len(line) < 80)
+        seen = set()
+        kept = []
+        for line in lines:
+            if line and not any(c.isalnum() for c in line):
+                continue
+            if any(pattern.search(line) for pattern in BOILERPLATE_PATTERNS):
+                continue
+            if counts.get(line, 0) >= self.repeated_line_threshold:
+                if line in seen:
+                    continue
+                seen.add(line)
+            kept.append(line)
+        return kept
+
+    @staticmethod
+    def heading_name(line: str) -> str:
+        if not line or len(line) > 40:
+            return ''
+        key = re.sub(r'[^a-z ]', '', line.lower().replace('&', 'and')).strip()
+        return HEADING_LOOKUP.get(' '.join(key.split()), '')
+
+    def split_sections(self, lines: List[str]) -> List[Dict]:
+        sections = [{'name': 'header', 'lines': []}]
+        for line in lines:
+            name = self.heading_name(line)
+            if name:
+                sections.append({'name': name, 'lines': [line]})
+            else:
+                sections[-1]['lines'].append(line)
+        return [s for s in sections if any(s['lines'])]
+
+    @staticmethod
+    def requirement_terms(job_requirements: dict) -> List[str]:
+        terms = set()
+        for field in ('skills', 'keywords', 'education', 'certifications'):
+            terms.update(str(term).lower() for term in (job_requirements or {}).get(field, []) if term)
+        return sorted(terms)
+
+    @staticmethod
+    def relevance(section: Dict, terms: List[str]) -> float:
+        if section['name'] == 'references':
+            return 0.0
+        text = ' '.join(section['lines']).lower()
+        hits = sum(1 for term in terms if re.search(rf'(?<![a-z0-9+#]){re.escape(term)}(?![a-z0-9+#])', text))
+        return SECTION_PRIORITY.get(section['name'], SECTION_PRIORITY['other']) + hits
+
+    @staticmethod
+    def section_tokens(lines: List[str]) -> int:
+        return sum(estimate_tokens(line + '\n') for line in lines)
+
+    @staticmethod
+    def truncate(lines: List[str], token_budget: float) -> List[str]:
+        """Longest prefix of ``lines`` within ``token_budget``"""
+        kept = []
+        used = 0
+        for line in lines:
+            tokens = estimate_tokens(line + '\n')
+            if used + tokens > token_budget:
+                break
+            kept.append(line)
+            used += tokens
+        return kept
+
+    def compress(self, resume_text: str, job_requirements: dict = None) -> Dict:
+        """Return {'text', 'original_tokens', 'compressed_tokens', 'tokens_saved', 'sections_dropped', 'sections_truncated'}"""
+        original_tokens = estimate_tokens(resume_text or '')
+        lines = self.drop_boilerplate(self.normalize(resume_text or '').split('\n'))
+        sections = self.split_sections(lines)
+        terms = self.requirement_terms(job_requirements)
+        weights = [self.relevance(section, terms) for section in sections]
+
+        total_weight = sum(weights) or 1.0
+        allowances = [self.token_budget * weight / total_weight for weight in weights]
+        kept = [self.truncate(section['lines'], allowance) for section, allowance in zip(sections, allowances)]
+        remaining = self.token_budget - sum(self.section_tokens(k) for k in kept)
+        for i in sorted(range(len(sections)), key=lambda i: (-weights[i], i)):
+            if remaining <= 0:
+                break
+            if weights[i] > 0 and len(kept[i]) < len(sections[i]['lines']):
+                used = self.section_tokens(kept[i])
+                kept[i] = self.truncate(sections[i]['lines'], used + remaining)
+                remaining -= self.section_tokens(kept[i]) - used
+
+        dropped = []
+        truncated = []
+        for i, section in enumerate(sections):
+            # A lone heading is useless; only keep a partial section with content
+            if len(kept[i]) <= (0 if section['name'] == 'header' else 1):
+                kept[i] = []
+                dropped.append(section['name'])
+            elif len(kept[i]) < len(section['lines']):
+                truncated.append(section['name'])
+
+        text = '\n\n'.join('\n'.join(k).strip() for k in kept if k)
+        text = re.sub(r'\n{3,}', '\n\n', text)
+        compressed_tokens = estimate_tokens(text)
+        return {
+            'text': text,
+            'original_tokens': original_tokens,
+            'compressed_tokens': compressed_tokens,
+            'tokens_saved': max(0, original_tokens - compressed_tokens),
+            'sections_dropped': dropped,
+            'sections_truncated': truncated
+        }
@@ -1,16 +1,29 @@
 # src/resume_screening/resume_parser.py
-import PyPDF2
-import docx
 import re
+import time
 from typing import Dict, List
+from .skill_matcher import get_skill_matcher
 
 class ResumeParser:
+    # Bump whenever parse_resume output changes so stored parses are not reused
+    PARSER_VERSION = "3"
+
     def __init__(self):
         self.email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
         self.phone_pattern = r'[\+]?[1-9]?[0-9]{7,14}'
-        
+    
+    @property
+    def skill_matcher(self):
+        return get_skill_matcher()
+    
+    @property
+    def version(self) -> str:
+        """Parser version plus skill taxonomy fingerprint"""
+        return f"{self.PARSER_VERSION}:{self.skill_matcher.fingerprint}"
+    
     def extract_text_from_pdf(self, pdf_path: str) -> str:
         """Extract text from PDF resume"""
+        import PyPDF2
         with open(pdf_path, 'rb') as file:
             reader = PyPDF2.PdfReader(file)
             text = ""
@@ -20,6 +33,7 @@ class ResumeParser:
     
     def extract_text_from_docx(self, docx_path: str) -> str:
         """Extract text from DOCX resume"""
+        import docx
         doc = docx.Document(docx_path)
         text = ""
         for paragraph in doc.paragraphs:
@@ -36,6 +50,10 @@ class ResumeParser:
             with open(file_path, 'r', encoding='utf-8') as file:
                 text = file.read()
         
+        return self.parse_text(text)
+    
+    def parse_text(self, text: str) -> Dict:
+        """Extract key information from resume text that is already extracted"""
         resume_data = {
             'text': text,
             'email': self.extract_email(text),
@@ -56,20 +74,7 @@ class ResumeParser:
         return phones[0] if phones else ""
     
     def extract_skills(self, text: str) -> List[str]:
-        # Define skill keywords
-        skills_keywords = [
-            'python', 'java', 'javascript', 'react', 'angular', 'node.js',
-            'django', 'flask', 'spring', 'mysql', 'postgresql', 'mongodb',
-            'git', 'docker', 'kubernetes', 'aws', 'azure', 'jenkins'
-        ]
-        
-        found_skills = []
-        text_lower = text.lower()
-        for skill in skills_keywords:
-            if skill in text_lower:
-                found_skills.append(skill)
-        
-        return found_skills
+        return self.skill_matcher.find_skills(text)
     
     def extract_experience(self, text: str) -> int:
         # Extract years of experience
@@ -86,6 +91,38 @@ class ResumeParser:
         return 0
     
     def extract_education(self, text: str) -> List[str]:
-        edu_pattern = r'\b(bachelor|master|phd|b\.tech|m\.tech|bca|mca|be|me)\b'
+        # B.E./M.E. only in their dotted form: bare "be"/"me" are ordinary words
+        edu_pattern = r'\b(bachelor|master|phd|b\.tech|m\.tech|bca|mca|b\.e|m\.e)\b'
         education = re.findall(edu_pattern, text.lower(), re.IGNORECASE)
-        return list(set(education))
\ No newline at end of file
+        return list(set(education))
+
+
+_worker_parser = None
+
+def _get_worker_parser() -> ResumeParser:
+    global _worker_parser
+    if _worker_parser is None:
+        _worker_parser = ResumeParser()
+    return _worker_parser
+
+def parse_resume_file(file_path: str) -> Dict:
+    """Parse one resume in a worker process: {'data': dict or None, 'error': str, 'parse_time': seconds}"""
+    start = time.perf_counter()
+    try:
+        data, error = _get_worker_parser().parse_resume(file_path), ''
+    except Exception as e:
+        data, error = None, str(e)
+    return {'data': data, 'error': error, 'parse_time': time.perf_counter() - start}
+
+def parse_resume_texts(texts: List[str]) -> List[Dict]:
+    """Parse a chunk of resume texts in a worker process (same result shape as parse_resume_file)"""
+    results = []
+    for text in texts:
+        start = time.perf_counter()
+        try:
+            data, error = _get_worker_parser().parse_text(text), ''
+        except Exception as e:
+            data, error = None, str(e)
+        results.append({'data': data, 'error': error, 'parse_time': time.perf_counter() - start})
+    return results
+
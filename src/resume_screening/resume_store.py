@@ -0,0 +1,116 @@
+# src/resume_screening/resume_store.py
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Tuple
+
+DEFAULT_STORE_PATH = os.path.join('.cache', 'parsed_resumes.sqlite')
+# Parse outputs hold full resume text, so they are kept no longer than the LLM result cache keeps its entries
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+
+
+def file_content_hash(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def normalize_path(path: str) -> str:
+    """Absolute, normalized form of ``path``, so "resumes/", "./resumes" and "/abs/resumes" compare equal"""
+    return os.path.normpath(os.path.abspath(path))
+
+
+class ParsedResumeStore:
+    """SQLite store of ``parse_resume`` outputs keyed by file content hash and ``parser_version``"""
+
+    def __init__(self, path: str = None, parser_version: str = '', ttl_seconds: float = None):
+        self.path = path or os.getenv('RESUME_STORE_PATH', DEFAULT_STORE_PATH)
+        self.parser_version = parser_version
+        self.ttl_seconds = ttl_seconds or float(os.getenv('RESUME_STORE_TTL_SECONDS', DEFAULT_TTL_SECONDS))
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS files ('
+                'path TEXT PRIMARY KEY, folder TEXT NOT NULL, mtime REAL NOT NULL, '
+                'size INTEGER NOT NULL, content_hash TEXT NOT NULL)'
+            )
+            self._conn.execute('CREATE INDEX IF NOT EXISTS idx_files_folder ON files(folder)')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS parsed ('
+                'content_hash TEXT PRIMARY KEY, parser_version TEXT NOT NULL, '
+                'data TEXT NOT NULL, parse_time REAL NOT NULL, parsed_at REAL NOT NULL)'
+            )
+            self._conn.commit()
+        return self._conn
+
+    def lookup(self, file_paths: List[str]) -> Tuple[Dict[str, dict], List[str]]:
+        """Split paths into ({path: stored parse output}, [paths that need parsing])"""
+        found = {}
+        missing = []
+        with self._lock:
+            conn = self._connect()
+            for file_path in file_paths:
+                stat = os.stat(file_path)
+                stored_path = normalize_path(file_path)
+                row = conn.execute(
+                    'SELECT mtime, size, content_hash FROM files WHERE path = ?', (stored_path,)
+                ).fetchone()
+                if row is not None and row[0] == stat.st_mtime and row[1] == stat.st_size:
+                    content_hash = row[2]
+                else:
+                    content_hash = file_content_hash(file_path)
+                    conn.execute(
+                        'INSERT OR REPLACE INTO files (path, folder, mtime, size, content_hash) VALUES (?, ?, ?, ?, ?)',
+                        (stored_path, os.path.dirname(stored_path), stat.st_mtime, stat.st_size, content_hash)
+                    )
+                parsed = conn.execute(
+                    'SELECT data FROM parsed WHERE content_hash = ? AND parser_version = ? AND parsed_at >= ?',
+                    (content_hash, self.parser_version, time.time() - self.ttl_seconds)
+                ).fetchone()
+                if parsed is not None:
+                    found[file_path] = json.loads(parsed[0])
+                else:
+                    missing.append(file_path)
+            conn.commit()
+        return found, missing
+
+    def save(self, file_path: str, data: dict, parse_time: float):
+        """Store a fresh parse output for the file's current content"""
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute('SELECT content_hash FROM files WHERE path = ?', (normalize_path(file_path),)).fetchone()
+            content_hash = row[0] if row is not None else file_content_hash(file_path)
+            conn.execute(
+                'INSERT OR REPLACE INTO parsed (content_hash, parser_version, data, parse_time, parsed_at) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (content_hash, self.parser_version, json.dumps(data), parse_time, time.time())
+            )
+            conn.commit()
+
+    def prune(self, folder: str, current_paths: List[str]) -> int:
+        """Forget files of ``folder`` that no longer exist, expired parse outputs and ones nothing references"""
+        keep = {normalize_path(path) for path in current_paths}
+        with self._lock:
+            conn = self._connect()
+            stale = [
+                path for (path,) in conn.execute('SELECT path FROM files WHERE folder = ?', (normalize_path(folder),))
+                if path not in keep
+            ]
+            conn.executemany('DELETE FROM files WHERE path = ?', [(path,) for path in stale])
+            conn.execute('DELETE FROM parsed WHERE content_hash NOT IN (SELECT content_hash FROM files)')
+            conn.execute('DELETE FROM parsed WHERE parsed_at < ?', (time.time() - self.ttl_seconds,))
+            conn.commit()
+        return len(stale)
@@ -1,77 +1,271 @@
 # src/resume_screening/screening_pipeline.py
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+import numpy as np
 import pandas as pd
-from .resume_parser import ResumeParser
+from .resume_parser import ResumeParser, parse_resume_file
 from .job_parser import JobDescriptionParser
 from .llm_screener import LLMResumeScreener
+from .local_scorer import LocalResumeScorer
+from .vector_index import ResumeVectorIndex
+from .resume_store import ParsedResumeStore
+from src.utils.concurrency import iter_bounded
+from src.utils.metrics import get_metrics
+from src.utils.result_cache import ResultCache
+from src.utils.result_writer import IncrementalResultWriter
 
 class ResumeScreeningPipeline:
-    def __init__(self):
+    SUPPORTED_EXTENSIONS = ('.pdf', '.docx', '.txt')
+    # Below this many files the process pool start-up costs more than it saves
+    MIN_FILES_FOR_PARALLEL_PARSING = 8
+
+    def __init__(self, max_concurrency: int = 8, use_cache: bool = True, packed_screening: bool = False,
+                 parse_workers: int = None, use_resume_store: bool = None, resume_token_budget: int = None):
         self.resume_parser = ResumeParser()
         self.job_parser = JobDescriptionParser()
-        self.llm_screener = LLMResumeScreener()
+        self.llm_screener = LLMResumeScreener(
+            max_concurrency=max_concurrency,
+            cache=ResultCache(enabled=use_cache),
+            resume_token_budget=resume_token_budget
+        )
+        self.packed_screening = packed_screening
+        self.parse_workers = parse_workers or os.cpu_count() or 1
+        # Opt-in: the store keeps full resume text (personal data) on disk between runs
+        if use_resume_store is None:
+            use_resume_store = os.getenv('RESUME_STORE', '').lower() in ('1', 'true', 'yes')
+        self.resume_store = ParsedResumeStore(parser_version=self.resume_parser.version) if use_resume_store else None
     
-    def process_resumes_folder(self, resumes_folder: str) -> list:
-        """Process all resumes in a folder"""
-        resumes_data = []
+    def iter_resumes_folder(self, resumes_folder: str, parallel: bool = True):
+        """Yield parsed resumes as each file is parsed, reusing the resume store for unchanged files"""
+        filenames = sorted(f for f in os.listdir(resumes_folder) if f.endswith(self.SUPPORTED_EXTENSIONS))
+        file_paths = [os.path.join(resumes_folder, f) for f in filenames]
+        file_ids = {path: file_id for file_id, path in enumerate(file_paths)}
+        to_parse = file_paths
         
-        for filename in os.listdir(resumes_folder):
-            if filename.endswith(('.pdf', '.docx', '.txt')):
-                file_path = os.path.join(resumes_folder, filename)
-                try:
-                    resume_data = self.resume_parser.parse_resume(file_path)
-                    resume_data['filename'] = filename
-                    resume_data['id'] = len(resumes_data)
-                    resumes_data.append(resume_data)
-                except Exception as e:
-                    print(f"Error processing {filename}: {e}")
+        if self.resume_store is not None:
+            self.resume_store.prune(resumes_folder, file_paths)
+            stored, to_parse = self.resume_store.lookup(file_paths)
+            print(f"Resume store: {len(stored)} unchanged, {len(to_parse)} to parse")
+            for path, resume_data in stored.items():
+                yield self._finish_resume(resume_data, filenames[file_ids[path]], file_ids[path], 0.0)
         
-        return resumes_data
+        if parallel and self.parse_workers > 1 and len(to_parse) >= self.MIN_FILES_FOR_PARALLEL_PARSING:
+            workers = min(self.parse_workers, len(to_parse))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                parsed = iter_bounded(parse_resume_file, to_parse, workers * 4, executor)
+                yield from self._collect_parsed(to_parse, file_ids, parsed)
+        else:
+            parsed = ((i, parse_resume_file(path)) for i, path in enumerate(to_parse))
+            yield from self._collect_parsed(to_parse, file_ids, parsed)
     
-    def run_screening(self, resumes_folder: str, job_description: str) -> pd.DataFrame:
-        """Run complete screening pipeline"""
+    def _collect_parsed(self, paths: list, file_ids: dict, parsed):
+        for index, outcome in parsed:
+            path = paths[index]
+            filename = os.path.basename(path)
+            if outcome['error']:
+                print(f"Error processing {filename}: {outcome['error']}")
+                continue
+            if self.resume_store is not None:
+                self.resume_store.save(path, outcome['data'], outcome['parse_time'])
+            get_metrics().observe('document_parse_seconds', outcome['parse_time'],
+                                  format=os.path.splitext(filename)[1].lstrip('.').lower())
+            yield self._finish_resume(outcome['data'], filename, file_ids[path], outcome['parse_time'])
+    
+    @staticmethod
+    def _finish_resume(resume_data: dict, filename: str, file_id: int, parse_time: float) -> dict:
+        resume_data['filename'] = filename
+        resume_data['id'] = file_id
+        resume_data['parse_time'] = parse_time
+        return resume_data
+    
+    def process_resumes_folder(self, resumes_folder: str, parallel: bool = True) -> list:
+        """Process all resumes in a folder, returned in stable id order"""
+        return sorted(self.iter_resumes_folder(resumes_folder, parallel), key=lambda r: r['id'])
+    
+    def combine_result(self, resume_data: dict, screening_result: dict, index: int = 0) -> dict:
+        """Flatten parsed resume data and an LLM screening result into one output row"""
+        combined_result = {
+            'filename': resume_data.get('filename', f'resume_{index}'),
+            'candidate_email': resume_data.get('email', ''),
+            'candidate_phone': resume_data.get('phone', ''),
+            'extracted_skills': ', '.join(resume_data.get('skills', [])),
+            'extracted_experience': resume_data.get('experience', 0),
+            'extracted_education': ', '.join(resume_data.get('education', [])),
+            'parse_time': resume_data.get('parse_time', 0),
+            'overall_score': screening_result.get('overall_score', 0),
+            'recommendation': screening_result.get('recommendation', 'REVIEW'),
+            'skills_score': screening_result.get('skills_match', {}).get('skills_score', 0),
+            'experience_score': screening_result.get('experience_match', {}).get('experience_score', 0),
+            'education_score': screening_result.get('education_match', {}).get('education_score', 0),
+            'matched_skills': ', '.join(screening_result.get('skills_match', {}).get('matched_skills', [])),
+            'missing_skills': ', '.join(screening_result.get('skills_match', {}).get('missing_skills', [])),
+            'strengths': ', '.join(screening_result.get('strengths', [])),
+            'concerns': ', '.join(screening_result.get('concerns', [])),
+            'prompt_tokens': screening_result.get('prompt_tokens', 0),
+            'prompt_tokens_saved': screening_result.get('prompt_tokens_saved', 0),
+            'error': screening_result.get('error', '')
+        }
+        if 'semantic_score' in resume_data:
+            combined_result['semantic_score'] = resume_data['semantic_score']
+        if 'local_scores' in resume_data:
+            combined_result.update(resume_data['local_scores'])
+        if 'semantic_score' in resume_data or 'local_scores' in resume_data:
+            combined_result['llm_screened'] = screening_result.get('llm_screened', True)
+        return combined_result
+    
+    def semantic_shortlist(self, resumes_data: list, job_description: str, top_k: int):
+        """Keep the ``top_k`` resumes most similar to the job description (TF-IDF cosine)"""
+        index = ResumeVectorIndex().build(resumes_data)
+        scores = index.similarities([job_description])[:, 0]
+        for resume_data, score in zip(resumes_data, scores):
+            resume_data['semantic_score'] = round(float(score), 4)
+        selected = {resume_id for resume_id, _ in index.rank(job_description, top_k)}
+        shortlisted = [r for r in resumes_data if r.get('id') in selected]
+        rejected = [r for r in resumes_data if r.get('id') not in selected]
+        return shortlisted, rejected
+
+    def iter_screening(self, resumes_folder: str, job_description: str, criteria=None,
+                       top_k: int = None, min_local_score: float = None, semantic_top_k: int = None):
+        """Yield one combined result row per resume as soon as its LLM call returns"""
+        metrics = get_metrics()
         print("Step 1: Parsing job description...")
-        job_requirements = self.job_parser.extract_requirements(job_description)
+        with metrics.stage('resume_screening', 'job_parse'):
+            job_requirements = self.job_parser.extract_requirements(job_description)
         
         print("Step 2: Processing resumes...")
-        resumes_data = self.process_resumes_folder(resumes_folder)
-        
-        if not resumes_data:
-            return pd.DataFrame()
+        not_shortlisted = []
+        if semantic_top_k is not None or top_k is not None or min_local_score is not None:
+            with metrics.stage('resume_screening', 'document_parse'):
+                resumes_data = resumes = self.process_resumes_folder(resumes_folder)
+            if semantic_top_k is not None:
+                print("Step 2b: Shortlisting by semantic similarity...")
+                resumes, rejected = self.semantic_shortlist(resumes, job_description, semantic_top_k)
+                not_shortlisted.extend(rejected)
+            if top_k is not None or min_local_score is not None:
+                print("Step 2c: Shortlisting with local scoring...")
+                scorer = LocalResumeScorer(criteria)
+                resumes, rejected = scorer.shortlist(
+                    resumes, job_requirements, top_k=top_k, min_score=min_local_score
+                )
+                not_shortlisted.extend(rejected)
+            print(f"Shortlisted {len(resumes)} of {len(resumes_data)} resumes")
+        else:
+            resumes = self.iter_resumes_folder(resumes_folder)
         
         print("Step 3: Screening with LLM...")
-        screening_results = self.llm_screener.batch_screen_resumes(resumes_data, job_requirements)
+        # When resumes stream in, this stage also covers the parsing that overlaps with screening
+        llm_stage_start = time.perf_counter()
+        if self.packed_screening:
+            group_size = self.llm_screener.max_pack_size * self.llm_screener.max_concurrency
+            resumes = iter(resumes)
+            while True:
+                group = list(islice(resumes, group_size))
+                if not group:
+                    break
+                results = self.llm_screener.batch_screen_resumes(group, job_requirements, packed=True)
+                for resume_data, screening_result in zip(group, results):
+                    yield self.combine_result(resume_data, screening_result, resume_data.get('id', 0))
+        else:
+            for resume_data, screening_result in self.llm_screener.iter_screen_resumes(resumes, job_requirements):
+                yield self.combine_result(resume_data, screening_result, resume_data.get('id', 0))
+        metrics.observe('stage_duration_seconds', time.perf_counter() - llm_stage_start,
+                        pipeline='resume_screening', stage='llm_screening')
         
-        print("Step 4: Compiling results...")
-        # Combine resume data with screening results
-        combined_results = []
-        for i, (resume_data, screening_result) in enumerate(zip(resumes_data, screening_results)):
-            combined_result = {
-                'filename': resume_data.get('filename', f'resume_{i}'),
-                'candidate_email': resume_data.get('email', ''),
-                'candidate_phone': resume_data.get('phone', ''),
-                'extracted_skills': ', '.join(resume_data.get('skills', [])),
-                'extracted_experience': resume_data.get('experience', 0),
-                'extracted_education': ', '.join(resume_data.get('education', [])),
-                'overall_score': screening_result.get('overall_score', 0),
-                'recommendation': screening_result.get('recommendation', 'REVIEW'),
-                'skills_score': screening_result.get('skills_match', {}).get('skills_score', 0),
-                'experience_score': screening_result.get('experience_match', {}).get('experience_score', 0),
-                'education_score': screening_result.get('education_match', {}).get('education_score', 0),
-                'matched_skills': ', '.join(screening_result.get('skills_match', {}).get('matched_skills', [])),
-                'missing_skills': ', '.join(screening_result.get('skills_match', {}).get('missing_skills', [])),
-                'strengths': ', '.join(screening_result.get('strengths', [])),
-                'concerns': ', '.join(screening_result.get('concerns', [])),
-                'error': screening_result.get('error', '')
-            }
-            combined_results.append(combined_result)
+        for resume_data in sorted(not_shortlisted, key=lambda r: r['id']):
+            yield self.combine_result(
+                resume_data,
+                {'overall_score': 0, 'recommendation': 'NOT_SHORTLISTED', 'llm_screened': False},
+                resume_data.get('id', 0)
+            )
+    
+    def run_screening(self, resumes_folder: str, job_description: str, criteria=None,
+                      top_k: int = None, min_local_score: float = None,
+                      semantic_top_k: int = None) -> pd.DataFrame:
+        """Run complete screening pipeline"""
+        combined_results = list(self.iter_screening(
+            resumes_folder, job_description, criteria, top_k=top_k,
+            min_local_score=min_local_score, semantic_top_k=semantic_top_k
+        ))
         
-        df_results = pd.DataFrame(combined_results)
-        df_results = df_results.sort_values('overall_score', ascending=False)
+        if not combined_results:
+            return pd.DataFrame()
+        
+        print("Step 4: Compiling results...")
+        with get_metrics().stage('resume_screening', 'compile'):
+            df_results = pd.DataFrame(combined_results)
+            sort_columns = ['overall_score'] + [c for c in ('local_score', 'semantic_score') if c in df_results.columns]
+            df_results = df_results.sort_values(sort_columns, ascending=False)
         
         return df_results
     
-    def save_results(self, results_df: pd.DataFrame, output_path: str):
-        """Save screening results"""
-        results_df.to_csv(output_path, index=False)
-        print(f"Results saved to {output_path}")
\ No newline at end of file
+    def run_multi_job_screening(self, resumes_folder: str, job_descriptions: dict, criteria=None,
+                                top_k_per_job: int = 10, min_local_score: float = None) -> dict:
+        """Screen one resume pool against many job descriptions; returns {job_id: results DataFrame}"""
+        job_ids = list(job_descriptions)
+        metrics = get_metrics()
+        
+        print(f"Step 1: Parsing {len(job_ids)} job descriptions...")
+        with metrics.stage('multi_job_screening', 'job_parse'):
+            jobs_requirements = [self.job_parser.extract_requirements(job_descriptions[job_id]) for job_id in job_ids]
+        
+        print("Step 2: Processing resumes...")
+        with metrics.stage('multi_job_screening', 'document_parse'):
+            resumes_data = self.process_resumes_folder(resumes_folder)
+        if not resumes_data or not job_ids:
+            return {job_id: pd.DataFrame() for job_id in job_ids}
+        
+        print("Step 3: Scoring resume x job matrix...")
+        with metrics.stage('multi_job_screening', 'local_scoring'):
+            local_scores = LocalResumeScorer(criteria).score_matrix(resumes_data, jobs_requirements)
+            semantic_scores = ResumeVectorIndex().build(resumes_data).similarities(
+                [job_descriptions[job_id] for job_id in job_ids]
+            )
+        
+        pairs = []
+        for j in range(len(job_ids)):
+            # Rank by local score, breaking ties by semantic similarity
+            order = np.lexsort((-semantic_scores[:, j], -local_scores['local_score'][:, j]))
+            if min_local_score is not None:
+                order = order[local_scores['local_score'][order, j] >= min_local_score]
+            pairs.extend((i, j) for i in order[:top_k_per_job])
+        
+        print(f"Step 4: Screening {len(pairs)} (resume, job) pairs with LLM...")
+        with metrics.stage('multi_job_screening', 'llm_screening'):
+            screening_results = self.llm_screener.batch_screen_pairs(
+                [(resumes_data[i], jobs_requirements[j]) for i, j in pairs]
+            )
+        
+        print("Step 5: Compiling results...")
+        with metrics.stage('multi_job_screening', 'compile'):
+            screened = dict(zip(pairs, screening_results))
+            not_shortlisted = {'overall_score': 0, 'recommendation': 'NOT_SHORTLISTED', 'llm_screened': False}
+            results = {}
+            for j, job_id in enumerate(job_ids):
+                # Every resume gets a row per job, as in iter_screening; unscreened ones carry their local scores
+                rows = []
+                for i, resume_data in enumerate(resumes_data):
+                    row = self.combine_result(resume_data, screened.get((i, j), not_shortlisted), i)
+                    row['job_id'] = job_id
+                    row['semantic_score'] = round(float(semantic_scores[i, j]), 4)
+                    row.update({name: round(float(scores[i, j]), 4) for name, scores in local_scores.items()})
+                    row['llm_screened'] = (i, j) in screened
+                    rows.append(row)
+                results[job_id] = pd.DataFrame(rows).sort_values(
+                    ['overall_score', 'local_score', 'semantic_score'], ascending=False
+                )
+            return results
+    
+    def save_results(self, results, output_path: str):
+        """Save screening results (a DataFrame or an iterable of rows) as CSV or JSONL, by extension"""
+        if isinstance(results, pd.DataFrame):
+            if output_path.endswith(('.jsonl', '.ndjson')):
+                results.to_json(output_path, orient='records', lines=True)
+            else:
+                results.to_csv(output_path, index=False)
+            print(f"Results saved to {output_path}")
+            return
+        with IncrementalResultWriter(output_path) as writer:
+            writer.write_all(results)
+        print(f"Results saved to {output_path} ({writer.rows_written} rows)")
@@ -0,0 +1,131 @@
+# src/resume_screening/skill_matcher.py
+import csv
+import hashlib
+import json
+import os
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List
+
+DEFAULT_TAXONOMY_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    'data', 'skills_taxonomy.json'
+)
+
+# Characters that may be part of a skill token ("c++", "c#", "node.js"), so a
+# match must not be preceded or followed by one of them ("java" in "javascript")
+WORD_CHARS = 'a-z0-9+#'
+# A skill name that is also an ordinary word ("swift", "rust") only counts with an unambiguous skill this
+# close, or when capitalized mid-sentence as a proper noun ("apps written in Swift")
+CONTEXT_WINDOW_CHARS = 60
+SENTENCE_START = re.compile(r'(?:^|[.!?\n])[\s\-*\u2022]*$')
+
+
+def normalize_skill(text: str) -> str:
+    return ' '.join(text.lower().split())
+
+
+class SkillMatcher:
+    """Single-pass matcher compiling every skill name and alias of a taxonomy into one regex"""
+
+    def __init__(self, skills: Iterable[Dict]):
+        self.canonical = {}
+        self.categories = {}
+        self.ambiguous_forms = set()
+        for skill in skills:
+            name = normalize_skill(skill['name'])
+            self.categories[name] = skill.get('category', '')
+            forms = [normalize_skill(alias) for alias in skill.get('aliases', [])]
+            if skill.get('match_name', True):
+                forms.append(name)
+                if skill.get('ambiguous', False):
+                    self.ambiguous_forms.add(name)
+            for form in forms:
+                self.canonical.setdefault(form, name)
+        self.pattern = self._compile(self.canonical.keys())
+        # Identifies the taxonomy contents, e.g. to invalidate stored parse outputs
+        self.fingerprint = hashlib.sha1(
+            json.dumps([sorted(self.canonical.items()), sorted(self.ambiguous_forms)]).encode('utf-8')
+        ).hexdigest()[:12]
+
+    @classmethod
+    def from_file(cls, path: str) -> 'SkillMatcher':
+        """Load a taxonomy from JSON ({"skills": [...]}) or CSV (name,category,aliases[,ambiguous])"""
+        if path.endswith('.csv'):
+            with open(path, newline='', encoding='utf-8') as file:
+                skills = [
+                    {
+                        'name': row['name'],
+                        'category': row.get('category', ''),
+                        'aliases': [a for a in (row.get('aliases') or '').split('|') if a.strip()],
+                        'ambiguous': (row.get('ambiguous') or '').strip().lower() in ('1', 'true', 'yes')
+                    }
+                    for row in csv.DictReader(file)
+                ]
+        else:
+            with open(path, encoding='utf-8') as file:
+                skills = json.load(file)['skills']
+        return cls(skills)
+
+    @staticmethod
+    def _trie_regex(trie: Dict) -> str:
+        if '' in trie and len(trie) == 1:
+            return ''
+        branches = []
+        optional = False
+        for char in sorted(trie):
+            if char == '':
+                optional = True
+                continue
+            token = r'\s+' if char == ' ' else re.escape(char)
+            branches.append(token + SkillMatcher._trie_regex(trie[char]))
+        if len(branches) == 1 and not optional:
+            return branches[0]
+        body = '(?:' + '|'.join(branches) + ')'
+        # Greedy optional keeps the longest alternative first ("javascript" before "java")
+        return body + '?' if optional else body
+
+    def _compile(self, forms: Iterable[str]):
+        trie = {}
+        for form in forms:
+            node = trie
+            for char in form:
+                node = node.setdefault(char, {})
+            node[''] = {}
+        if not trie:
+            return re.compile(r'(?!x)x')
+        return re.compile(
+            rf'(?<![{WORD_CHARS}])({self._trie_regex(trie)})(?![{WORD_CHARS}])',
+            re.IGNORECASE
+        )
+
+    def find_skills(self, text: str) -> List[str]:
+        """Return canonical skills found in text, in order of first appearance"""
+        matches = []
+        for match in self.pattern.finditer(text):
+            form = normalize_skill(match.group(1))
+            skill = self.canonical.get(form)
+            if skill is not None:
+                matches.append((match.start(), match.end(), skill, form in self.ambiguous_forms))
+        found = {}
+        for start, end, skill, ambiguous in matches:
+            if ambiguous and not self._proper_noun(text, start) and not any(
+                not other_ambiguous and other_start < end + CONTEXT_WINDOW_CHARS and other_end > start - CONTEXT_WINDOW_CHARS
+                for other_start, other_end, _, other_ambiguous in matches
+            ):
+                continue
+            found.setdefault(skill, None)
+        return list(found)
+
+    @staticmethod
+    def _proper_noun(text: str, start: int) -> bool:
+        return text[start].isupper() and not SENTENCE_START.search(text, max(0, start - 20), start)
+
+    def category(self, skill: str) -> str:
+        return self.categories.get(skill, '')
+
+
+@lru_cache(maxsize=None)
+def get_skill_matcher(path: str = None) -> SkillMatcher:
+    """Build the matcher for a taxonomy file once per process and share it"""
+    return SkillMatcher.from_file(path or os.getenv('SKILLS_TAXONOMY_PATH', DEFAULT_TAXONOMY_PATH))
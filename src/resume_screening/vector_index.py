@@ -0,0 +1,114 @@
+# src/resume_screening/vector_index.py
+import re
+import zlib
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+from scipy import sparse
+
+TOKEN_PATTERN = re.compile(r'[a-z][a-z0-9+#]*(?:\.[a-z0-9]+)*')
+
+
+class HashingVectorizer:
+    """Offline text vectorizer using feature-hashed (CRC32) unigrams and bigrams"""
+
+    BIGRAM_MULTIPLIER = np.uint64(1000003)
+
+    def __init__(self, n_features: int = 2 ** 18, bigrams: bool = True):
+        self.n_features = n_features
+        self.bigrams = bigrams
+        self._token_hashes = {}
+
+    def token_hashes(self, tokens: List[str]) -> List[int]:
+        cache = self._token_hashes
+        for token in set(tokens).difference(cache):
+            cache[token] = zlib.crc32(token.encode('utf-8'))
+        return list(map(cache.__getitem__, tokens))
+
+    def transform(self, texts: Iterable[str]) -> sparse.csr_matrix:
+        """Return sublinear term frequencies (1 + log tf) as a CSR matrix"""
+        hashes = []
+        doc_ids = []
+        n_docs = 0
+        for doc_id, text in enumerate(texts):
+            tokens = TOKEN_PATTERN.findall(text.lower())
+            hashes.extend(self.token_hashes(tokens))
+            doc_ids.extend([doc_id] * len(tokens))
+            n_docs = doc_id + 1
+
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        doc_ids = np.asarray(doc_ids, dtype=np.int64)
+        features = [hashes % np.uint64(self.n_features)]
+        rows = [doc_ids]
+        if self.bigrams and len(hashes) > 1:
+            same_doc = doc_ids[:-1] == doc_ids[1:]
+            bigram = (hashes[:-1] * self.BIGRAM_MULTIPLIER) ^ hashes[1:]
+            features.append(bigram[same_doc] % np.uint64(self.n_features))
+            rows.append(doc_ids[:-1][same_doc])
+
+        features = np.concatenate(features).astype(np.int32)
+        rows = np.concatenate(rows)
+        matrix = sparse.csr_matrix(
+            (np.ones(len(features), dtype=np.float32), (rows, features)),
+            shape=(n_docs, self.n_features)
+        )
+        matrix.sum_duplicates()
+        matrix.data = 1.0 + np.log(matrix.data)
+        return matrix
+
+
+def l2_normalize(matrix: sparse.csr_matrix) -> sparse.csr_matrix:
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.diags(1.0 / norms).dot(matrix).tocsr()
+
+
+class ResumeVectorIndex:
+    """TF-IDF index over a resume pool for batched cosine-similarity ranking"""
+
+    def __init__(self, vectorizer: HashingVectorizer = None):
+        self.vectorizer = vectorizer or HashingVectorizer()
+        self.ids = []
+        self.idf = None
+        self.matrix = None
+
+    def build(self, resumes_data: List[Dict]) -> 'ResumeVectorIndex':
+        self.ids = [resume_data.get('id', i) for i, resume_data in enumerate(resumes_data)]
+        counts = self.vectorizer.transform(resume_data.get('text', '') for resume_data in resumes_data)
+        document_frequency = np.bincount(counts.indices, minlength=self.vectorizer.n_features)
+        self.idf = (np.log((1 + len(self.ids)) / (1 + document_frequency)) + 1.0).astype(np.float32)
+        self.matrix = l2_normalize(counts.multiply(self.idf).tocsr())
+        return self
+
+    def vectorize_queries(self, texts: List[str]) -> sparse.csr_matrix:
+        return l2_normalize(self.vectorizer.transform(texts).multiply(self.idf).tocsr())
+
+    def similarities(self, query_texts: List[str]) -> np.ndarray:
+        """Cosine similarity of every resume against every query: shape (n_resumes, n_queries)"""
+        if self.matrix is None or not self.ids:
+            return np.zeros((0, len(query_texts)), dtype=np.float32)
+        queries = self.vectorize_queries(query_texts)
+        return np.asarray(self.matrix.dot(queries.T).todense(), dtype=np.float32)
+
+    def rank(self, query_text: str, top_k: int = None) -> List[Tuple[object, float]]:
+        """Return (resume_id, similarity) pairs, best first"""
+        scores = self.similarities([query_text])[:, 0]
+        if top_k is not None and top_k < len(scores):
+            candidates = np.argpartition(-scores, top_k)[:top_k]
+        else:
+            candidates = np.arange(len(scores))
+        order = candidates[np.argsort(-scores[candidates], kind='stable')]
+        return [(self.ids[i], float(scores[i])) for i in order]
+
+    def save(self, path: str):
+        sparse.save_npz(path, self.matrix)
+        np.savez(path + '.meta.npz', ids=np.asarray(self.ids, dtype=object), idf=self.idf)
+
+    @classmethod
+    def load(cls, path: str, vectorizer: HashingVectorizer = None) -> 'ResumeVectorIndex':
+        index = cls(vectorizer)
+        index.matrix = sparse.load_npz(path if path.endswith('.npz') else path + '.npz')
+        meta = np.load(path + '.meta.npz', allow_pickle=True)
+        index.ids = meta['ids'].tolist()
+        index.idf = meta['idf']
+        return index
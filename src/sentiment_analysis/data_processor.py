@@ -1,18 +1,56 @@
 # src/sentiment_analysis/data_processor.py
 import pandas as pd
 import re
-from textblob import TextBlob
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 
-# Download required NLTK data
-nltk.download('punkt')
-nltk.download('stopwords')
+# NLTK/TextBlob are imported on first use: importing them costs most of a
+# second, and their corpora are only downloaded if missing locally.
+NLTK_RESOURCES = {
+    'stopwords': 'corpora/stopwords',
+    'punkt': 'tokenizers/punkt',
+    'punkt_tab': 'tokenizers/punkt_tab'
+}
+_nltk_lock = threading.Lock()
+# Resources already found or downloaded in this process; checked without taking the lock
+_nltk_ready = set()
+
+def ensure_nltk_data(*names: str):
+    """Download the named NLTK resources only if they are not already installed"""
+    if _nltk_ready.issuperset(names):
+        return
+    import nltk
+    with _nltk_lock:
+        for name in names:
+            if name in _nltk_ready:
+                continue
+            try:
+                nltk.data.find(NLTK_RESOURCES[name])
+            except LookupError:
+                if not nltk.download(name, quiet=True):
+                    continue
+            _nltk_ready.add(name)
+
+@lru_cache(maxsize=None)
+def get_stopwords(language: str = 'english') -> frozenset:
+    ensure_nltk_data('stopwords')
+    from nltk.corpus import stopwords
+    return frozenset(stopwords.words(language))
+
+@lru_cache(maxsize=None)
+def get_sentiment_analyzer():
+    from textblob.en.sentiments import PatternAnalyzer
+    return PatternAnalyzer()
 
 class SentimentDataProcessor:
-    def __init__(self):
-        self.stop_words = set(stopwords.words('english'))
+    @property
+    def stop_words(self) -> frozenset:
+        return get_stopwords('english')
+    
+    @property
+    def sentiment_analyzer(self):
+        return get_sentiment_analyzer()
     
     def clean_text(self, text: str) -> str:
         """Clean and preprocess text"""
@@ -32,12 +70,52 @@ class SentimentDataProcessor:
     
     def remove_stopwords(self, text: str) -> str:
         """Remove stopwords from text"""
+        ensure_nltk_data('punkt', 'punkt_tab')
+        from nltk.tokenize import word_tokenize
         words = word_tokenize(text)
         filtered_words = [word for word in words if word not in self.stop_words]
         return ' '.join(filtered_words)
     
-    def process_feedback_data(self, df: pd.DataFrame, text_column: str) -> pd.DataFrame:
+    def process_feedback_data(self, df: pd.DataFrame, text_column: str, fast: bool = True,
+                              n_jobs: int = 1, chunk_size: int = 50000) -> pd.DataFrame:
         """Process employee feedback data"""
+        if not fast:
+            return self._process_feedback_data_rowwise(df, text_column)
+        
+        if n_jobs > 1 and len(df) > chunk_size:
+            chunks = [df.iloc[start:start + chunk_size] for start in range(0, len(df), chunk_size)]
+            with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                processed = executor.map(_process_chunk, chunks, [text_column] * len(chunks))
+                return pd.concat(list(processed))
+        
+        df_processed = df.copy()
+        
+        # Clean text: lowercase, keep letters/whitespace only, collapse whitespace
+        cleaned = (
+            df_processed[text_column].fillna('').astype(str)
+            .str.lower()
+            .str.replace(r'[^a-z\s]', '', regex=True)
+            .str.replace(r'\s+', ' ', regex=True)
+            .str.strip()
+        )
+        df_processed['cleaned_text'] = cleaned
+        
+        # Cleaned text is letters and single spaces only, so split() tokenizes it
+        stop_words = self.stop_words
+        df_processed['processed_text'] = [
+            ' '.join(word for word in text.split() if word not in stop_words)
+            for text in cleaned
+        ]
+        
+        # One sentiment evaluation per distinct text gives both columns
+        sentiments = {text: self.sentiment_analyzer.analyze(text) for text in cleaned.unique()}
+        df_processed['textblob_sentiment'] = cleaned.map(lambda text: sentiments[text].polarity)
+        df_processed['textblob_subjectivity'] = cleaned.map(lambda text: sentiments[text].subjectivity)
+        
+        return df_processed
+    
+    def _process_feedback_data_rowwise(self, df: pd.DataFrame, text_column: str) -> pd.DataFrame:
+        from textblob import TextBlob
         df_processed = df.copy()
         
         # Clean text
@@ -52,4 +130,13 @@ class SentimentDataProcessor:
             lambda x: TextBlob(x).sentiment.subjectivity
         )
         
-        return df_processed
\ No newline at end of file
+        return df_processed
+
+
+_worker_processor = None
+
+def _process_chunk(chunk: pd.DataFrame, text_column: str) -> pd.DataFrame:
+    global _worker_processor
+    if _worker_processor is None:
+        _worker_processor = SentimentDataProcessor()
+    return _worker_processor.process_feedback_data(chunk, text_column)
@@ -0,0 +1,117 @@
+# src/sentiment_analysis/feedback_dedup.py
+import re
+import zlib
+from collections import Counter
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+# Universal hashing (a * h + b) mod p: with 31-bit a, b and 32-bit CRC32 h this never overflows uint64
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64((1 << 32) - 1)
+# Texts are never merged as near duplicates unless they contain the same negations
+NEGATION_TOKENS = frozenset((
+    'not', 'no', 'never', 'nor', 'none', 'nothing', 'nobody', 'neither', 'nowhere', 'cannot', 'without',
+    'dont', 'doesnt', 'didnt', 'isnt', 'wasnt', 'arent', 'werent', 'wont', 'wouldnt', 'cant', 'couldnt',
+    'shouldnt', 'hasnt', 'havent', 'hadnt', 'aint',
+))
+
+
+class FeedbackDeduplicator:
+    """Group feedback rows whose text is identical or nearly identical (MinHash + LSH)"""
+
+    def __init__(self, threshold: float = 0.85, num_perm: int = 64, bands: int = 8,
+                 shingle_size: int = 2, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.shingle_size = shingle_size
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 1 << 31, size=num_perm).astype(np.uint64)
+        self._b = rng.randint(0, 1 << 31, size=num_perm).astype(np.uint64)
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        return ' '.join(str(text).lower().split())
+
+    @staticmethod
+    def negations(text: str) -> Counter:
+        return Counter(word for word in re.findall(r"[a-z']+", text.replace("n't", 'nt').replace("'", ''))
+                       if word in NEGATION_TOKENS)
+
+    def shingles(self, text: str) -> List[str]:
+        words = text.split()
+        if len(words) <= self.shingle_size:
+            return [text]
+        return [' '.join(words[i:i + self.shingle_size]) for i in range(len(words) - self.shingle_size + 1)]
+
+    def signature(self, text: str) -> np.ndarray:
+        hashes = np.array([zlib.crc32(s.encode('utf-8')) for s in set(self.shingles(text))], dtype=np.uint64)
+        permuted = (self._a[:, None] * hashes[None, :] + self._b[:, None]) % MERSENNE_PRIME & MAX_HASH
+        return permuted.min(axis=1)
+
+    def candidate_pairs(self, signatures: np.ndarray) -> Dict[int, set]:
+        """Texts sharing at least one LSH band bucket, as {text: {other texts}}"""
+        rows = self.num_perm // self.bands
+        candidates = {}
+        for band in range(self.bands):
+            buckets = {}
+            for i, band_signature in enumerate(signatures[:, band * rows:(band + 1) * rows]):
+                buckets.setdefault(band_signature.tobytes(), []).append(i)
+            for members in buckets.values():
+                if len(members) > 1:
+                    for i in members:
+                        candidates.setdefault(i, set()).update(members)
+        return candidates
+
+    def group(self, texts: Sequence[str], near_duplicates: bool = True) -> Tuple[List[int], List[int], Dict[str, int]]:
+        """Return (group id per row, representative row per group, stats)"""
+        unique_index = {}
+        unique_texts = []
+        row_unique = []
+        for text in texts:
+            key = self.normalize(text)
+            if key not in unique_index:
+                unique_index[key] = len(unique_texts)
+                unique_texts.append(key)
+            row_unique.append(unique_index[key])
+
+        # Map each distinct text to the distinct text that represents its near-duplicate group
+        unique_group = list(range(len(unique_texts)))
+        near = 0
+        nonempty = [i for i, text in enumerate(unique_texts) if text]
+        if near_duplicates and len(nonempty) > 1:
+            signatures = np.vstack([self.signature(unique_texts[i]) for i in nonempty])
+            candidates = self.candidate_pairs(signatures)
+            assigned = set()
+            for position, i in enumerate(nonempty):
+                if position in assigned or position not in candidates:
+                    continue
+                for other in sorted(candidates[position]):
+                    if other <= position or other in assigned:
+                        continue
+                    if np.mean(signatures[position] == signatures[other]) < self.threshold:
+                        continue
+                    if self.negations(unique_texts[i]) == self.negations(unique_texts[nonempty[other]]):
+                        assigned.add(other)
+                        unique_group[nonempty[other]] = i
+                        near += 1
+
+        group_ids = {}
+        representatives = []
+        row_groups = []
+        for row, u in enumerate(row_unique):
+            root = unique_group[u]
+            if root not in group_ids:
+                group_ids[root] = len(representatives)
+                representatives.append(row)
+            row_groups.append(group_ids[root])
+        stats = {
+            'rows': len(row_unique),
+            'groups': len(representatives),
+            'exact_duplicates': len(row_unique) - len(unique_texts),
+            'near_duplicates': near,
+        }
+        return row_groups, representatives, stats
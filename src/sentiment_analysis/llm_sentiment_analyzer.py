@@ -1,16 +1,106 @@
-import json
 import pandas as pd
-from config.google_ai_config import GoogleAIConfig
+from src.utils.concurrency import map_bounded, retry_with_backoff
+from src.utils.llm_backend import LLMBackend, get_backend
+from src.utils.prompt_packing import estimate_tokens, pack_items, parse_json_array, resolve_pack
+from src.utils.result_cache import ResultCache
+from src.utils.structured_output import conform, generate_structured, string_enum
+
+STRING_LIST = {'type': 'ARRAY', 'items': {'type': 'STRING'}}
+LEVEL = string_enum('LOW', 'MEDIUM', 'HIGH')
+# Response schemas; required fields are re-asked if missing
+SENTIMENT_SCHEMA = {
+    'type': 'OBJECT',
+    'properties': {
+        'sentiment_score': {'type': 'NUMBER'},
+        'sentiment_label': string_enum('POSITIVE', 'NEUTRAL', 'NEGATIVE'),
+        'confidence': {'type': 'NUMBER'},
+        'key_themes': STRING_LIST,
+        'emotional_indicators': STRING_LIST,
+        'attrition_risk': {
+            'type': 'OBJECT',
+            'properties': {'risk_level': LEVEL, 'risk_score': {'type': 'NUMBER'}, 'risk_factors': STRING_LIST},
+            'required': ['risk_level', 'risk_score']
+        },
+        'engagement_level': {
+            'type': 'OBJECT',
+            'properties': {
+                'level': string_enum('HIGH', 'MEDIUM', 'LOW'),
+                'score': {'type': 'NUMBER'},
+                'positive_indicators': STRING_LIST,
+                'negative_indicators': STRING_LIST
+            },
+            'required': ['level']
+        },
+        'actionable_insights': STRING_LIST
+    },
+    'required': ['sentiment_score', 'sentiment_label', 'key_themes', 'attrition_risk', 'engagement_level']
+}
+PACKED_SENTIMENT_SCHEMA = {
+    'type': 'ARRAY',
+    'items': dict(
+        SENTIMENT_SCHEMA,
+        properties=dict(SENTIMENT_SCHEMA['properties'], item_index={'type': 'INTEGER'}),
+        required=['item_index'] + SENTIMENT_SCHEMA['required']
+    )
+}
+ATTRITION_SCHEMA = {
+    'type': 'OBJECT',
+    'properties': {
+        'attrition_probability': {'type': 'NUMBER'},
+        'risk_category': LEVEL,
+        'key_risk_factors': STRING_LIST,
+        'protective_factors': STRING_LIST,
+        'recommended_interventions': STRING_LIST,
+        'priority_level': string_enum('LOW', 'MEDIUM', 'HIGH', 'URGENT'),
+        'confidence': {'type': 'NUMBER'}
+    },
+    'required': ['attrition_probability', 'risk_category']
+}
+PACKED_ATTRITION_SCHEMA = {
+    'type': 'ARRAY',
+    'items': dict(
+        ATTRITION_SCHEMA,
+        properties=dict(ATTRITION_SCHEMA['properties'], item_index={'type': 'INTEGER'}),
+        required=['item_index'] + ATTRITION_SCHEMA['required']
+    )
+}
 
 
 class LLMSentimentAnalyzer:
-    def __init__(self):
-        try:
-            self.ai_config = GoogleAIConfig()
-            self.model = self.ai_config.get_model()
-        except Exception as e:
-            print(f"[ERROR] Failed to initialize GoogleAIConfig: {e}")
-            self.model = None  # Gracefully fallback
+    # Bump whenever create_sentiment_prompt changes so cached results are not reused
+    PROMPT_VERSION = "sentiment-v1"
+    PACKED_PROMPT_VERSION = "sentiment-packed-v1"
+    # Bump whenever the attrition prompts change
+    ATTRITION_PROMPT_VERSION = "attrition-v1"
+
+    def __init__(self, cache: ResultCache = None, backend: LLMBackend = None, max_field_reasks: int = 1,
+                 max_concurrency: int = 8, max_retries: int = 3, retry_base_delay: float = 1.0,
+                 pack_token_budget: int = 3000, max_pack_size: int = 20, attrition_cache: ResultCache = None):
+        self.cache = cache if cache is not None else ResultCache()
+        # Attrition predictions are reused across (e.g. monthly) runs, so they may want a longer-lived cache
+        self.attrition_cache = attrition_cache if attrition_cache is not None else self.cache
+        self.max_field_reasks = max_field_reasks
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        # Each packed answer is ~200 output tokens, so max_pack_size also bounds the response length
+        self.pack_token_budget = pack_token_budget
+        self.max_pack_size = max_pack_size
+        self._backend = backend
+        self._available = None
+
+    @property
+    def backend(self) -> LLMBackend:
+        if self._backend is None:
+            self._backend = get_backend()
+        return self._backend
+
+    @property
+    def model_ready(self) -> bool:
+        """Whether the backend is usable; checked once so a bad configuration fails fast"""
+        if self._available is None:
+            self._available = self.backend.available()  # Gracefully fallback
+        return self._available
 
     def create_sentiment_prompt(self, feedback_text: str) -> str:
         return f"""
@@ -44,44 +134,161 @@ class LLMSentimentAnalyzer:
         Focus on identifying subtle indicators of job satisfaction, engagement, and attrition risk.
         """
 
-    def analyze_sentiment(self, feedback_text: str) -> dict:
+    def create_packed_sentiment_prompt(self, pack: list) -> str:
+        """One instruction block for several (item_index, feedback_text) items"""
+        items = "\n\n".join(f'=== FEEDBACK ITEM {item_index} ===\n"{text}"' for item_index, text in pack)
+        return f"""
+        You are an expert HR analyst specializing in employee sentiment analysis. 
+        Analyze EACH of the following employee feedback items independently and provide a comprehensive assessment.
+
+        EMPLOYEE FEEDBACK ITEMS:
+        {items}
+
+        Respond with a JSON array containing one object per feedback item, in the following format:
+        [
+            {{
+                "item_index": <the number from the item's === FEEDBACK ITEM n === header>,
+                "sentiment_score": <score from -1 to 1>,
+                "sentiment_label": "<POSITIVE/NEUTRAL/NEGATIVE>",
+                "confidence": <0 to 1>,
+                "key_themes": [themes],
+                "emotional_indicators": [phrases],
+                "attrition_risk": {{
+                    "risk_level": "<LOW/MEDIUM/HIGH>",
+                    "risk_score": <0 to 1>,
+                    "risk_factors": [factors]
+                }},
+                "engagement_level": {{
+                    "level": "<HIGH/MEDIUM/LOW>",
+                    "score": <0 to 1>,
+                    "positive_indicators": [signals],
+                    "negative_indicators": [signals]
+                }},
+                "actionable_insights": [recommendations]
+            }}
+        ]
+
+        Focus on identifying subtle indicators of job satisfaction, engagement, and attrition risk.
+        """
+
+    def _generate(self, prompt: str, **kwargs):
+        """One backend call, retried with backoff on transient errors"""
+        return retry_with_backoff(
+            lambda: self.backend.generate(prompt, **kwargs),
+            max_retries=self.max_retries,
+            base_delay=self.retry_base_delay
+        )
+
+    def analyze_sentiment(self, feedback_text: str, bypass_cache: bool = False) -> dict:
         if not feedback_text.strip():
             return {"error": "Empty feedback text"}
 
-        if not self.model:
+        key = ResultCache.make_key('sentiment', self.PROMPT_VERSION, self.backend.model_name, feedback_text)
+        if not bypass_cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        if not self.model_ready:
             return {"error": "LLM model not initialized due to configuration error."}
 
         prompt = self.create_sentiment_prompt(feedback_text)
 
         try:
-            response = self.model.generate_content(prompt)
-            response_text = response.text
-            json_str = response_text[response_text.find('{'):response_text.rfind('}') + 1]
-            return json.loads(json_str)
+            result = generate_structured(self._generate, prompt, SENTIMENT_SCHEMA, self.max_field_reasks)
+            self.cache.set(key, result)
+            return result
         except Exception as e:
             print(f"[ERROR] Sentiment analysis failed: {e}")
             return {"sentiment_score": 0, "error": str(e)}
 
-    def batch_analyze_sentiments(self, feedback_list: list) -> list:
-        results = []
+    def batch_analyze_sentiments(self, feedback_list: list, bypass_cache: bool = False, packed: bool = False,
+                                 max_concurrency: int = None) -> list:
+        """Analyze feedback items concurrently; results are returned in input order"""
+        if packed:
+            return self.analyze_sentiments_packed(feedback_list, max_concurrency, bypass_cache=bypass_cache)
+        max_concurrency = max_concurrency or self.max_concurrency
+        total = len(feedback_list)
+
+        def analyze_one(indexed):
+            i, feedback = indexed
+            result = self.analyze_sentiment(feedback, bypass_cache)
+            print(f"Analyzed feedback {i+1}/{total}")
+            return result
+
+        return map_bounded(analyze_one, enumerate(feedback_list), max_concurrency)
+
+    def _analyze_pack(self, pack: list) -> dict:
+        prompt = self.create_packed_sentiment_prompt(pack)
+        response = self._generate(prompt, response_schema=PACKED_SENTIMENT_SCHEMA)
+        return parse_json_array(response.text, 'item_index')
+
+    @staticmethod
+    def _is_valid_sentiment(result: dict) -> bool:
+        return not conform(result, SENTIMENT_SCHEMA)
+
+    def packed_cache_key(self, feedback_text: str) -> str:
+        return ResultCache.make_key('sentiment', self.PACKED_PROMPT_VERSION, self.backend.model_name, feedback_text)
+
+    def analyze_sentiments_packed(self, feedback_list: list, max_concurrency: int = None,
+                                  bypass_cache: bool = False) -> list:
+        """Analyze several feedback items per request; results are in input order"""
+        max_concurrency = max_concurrency or self.max_concurrency
+        results = {}
+        pending = []
         for i, feedback in enumerate(feedback_list):
-            print(f"Analyzing feedback {i+1}/{len(feedback_list)}")
-            results.append(self.analyze_sentiment(feedback))
-        return results
+            if not str(feedback).strip():
+                results[i] = {"error": "Empty feedback text"}
+                continue
+            cached = None if bypass_cache else self.cache.get(self.packed_cache_key(feedback))
+            if cached is not None:
+                results[i] = cached
+            else:
+                pending.append((i, feedback))
 
-    def create_attrition_prediction_prompt(self, employee_data: dict) -> str:
-        return f"""
-        You are an expert HR data scientist. Based on the employee data provided, 
-        predict the likelihood of this employee leaving the company.
+        if pending and not self.model_ready:
+            for i, _ in pending:
+                results[i] = {"error": "LLM model not initialized due to configuration error."}
+            pending = []
 
-        EMPLOYEE DATA:
-        - Recent Feedback Sentiment: {employee_data.get('avg_sentiment', 0)}
+        # The instruction block is shared by the whole pack, so only feedback text counts against the budget
+        budget = max(1, self.pack_token_budget - estimate_tokens(self.create_packed_sentiment_prompt([])))
+        packs = pack_items(pending, budget, self.max_pack_size)
+        print(f"Analyzing {len(pending)} feedback items in {len(packs)} packed requests ({len(results)} cached or empty)")
+
+        def analyze_one(i, feedback):
+            return self.analyze_sentiment(feedback, bypass_cache)
+
+        def run_pack(pack):
+            pack_results = resolve_pack(pack, self._analyze_pack, self._is_valid_sentiment, analyze_one)
+            texts = dict(pack)
+            for i, result in pack_results.items():
+                result.pop('item_index', None)
+                if 'error' not in result:
+                    self.cache.set(self.packed_cache_key(texts[i]), result)
+            return pack_results
+
+        for pack_results in map_bounded(run_pack, packs, max_concurrency):
+            results.update(pack_results)
+        return [results[i] for i in range(len(feedback_list))]
+
+    @staticmethod
+    def format_employee_data(employee_data: dict) -> str:
+        return f"""- Recent Feedback Sentiment: {employee_data.get('avg_sentiment', 0)}
         - Engagement Level: {employee_data.get('engagement_level', 'Unknown')}
         - Tenure: {employee_data.get('tenure_months', 0)} months
         - Recent Feedback Count: {employee_data.get('feedback_count', 0)}
         - Department: {employee_data.get('department', 'Unknown')}
         - Role Level: {employee_data.get('role_level', 'Unknown')}
-        RECENT FEEDBACK THEMES: {employee_data.get('recent_themes', [])}
+        RECENT FEEDBACK THEMES: {employee_data.get('recent_themes', [])}"""
+
+    def create_attrition_prediction_prompt(self, employee_data: dict) -> str:
+        return f"""
+        You are an expert HR data scientist. Based on the employee data provided, 
+        predict the likelihood of this employee leaving the company.
+
+        EMPLOYEE DATA:
+        {self.format_employee_data(employee_data)}
 
         Respond in JSON:
         {{
@@ -95,17 +302,90 @@ class LLMSentimentAnalyzer:
         }}
         """
 
+    def create_packed_attrition_prompt(self, pack: list) -> str:
+        """One instruction block for several (item_index, formatted employee data) items"""
+        employees = "\n\n".join(f"=== EMPLOYEE {item_index} ===\n        {data}" for item_index, data in pack)
+        return f"""
+        You are an expert HR data scientist. Based on the data provided for EACH of the following employees,
+        independently predict the likelihood of that employee leaving the company.
+
+        EMPLOYEES:
+        {employees}
+
+        Respond with a JSON array containing one object per employee:
+        [
+            {{
+                "item_index": <the number from the employee's === EMPLOYEE n === header>,
+                "attrition_probability": <0 to 1>,
+                "risk_category": "<LOW/MEDIUM/HIGH>",
+                "key_risk_factors": [factors],
+                "protective_factors": [factors],
+                "recommended_interventions": [actions],
+                "priority_level": "<LOW/MEDIUM/HIGH/URGENT>",
+                "confidence": <0 to 1>
+            }}
+        ]
+        """
+
     def predict_attrition(self, employee_data: dict) -> dict:
-        if not self.model:
+        if not self.model_ready:
             return {"error": "LLM model not initialized due to configuration error."}
 
         prompt = self.create_attrition_prediction_prompt(employee_data)
 
         try:
-            response = self.model.generate_content(prompt)
-            response_text = response.text
-            json_str = response_text[response_text.find('{'):response_text.rfind('}') + 1]
-            return json.loads(json_str)
+            return generate_structured(self._generate, prompt, ATTRITION_SCHEMA, self.max_field_reasks)
         except Exception as e:
             print(f"[ERROR] Attrition prediction failed: {e}")
             return {"attrition_probability": 0.5, "error": str(e)}
+
+    def attrition_cache_key(self, employee_data: dict) -> str:
+        """Key on the summary itself, so only employees whose aggregates changed are predicted again"""
+        return ResultCache.make_key('attrition', self.ATTRITION_PROMPT_VERSION, self.backend.model_name, employee_data)
+
+    def _predict_attrition_pack(self, pack: list) -> dict:
+        prompt = self.create_packed_attrition_prompt(pack)
+        response = self._generate(prompt, response_schema=PACKED_ATTRITION_SCHEMA)
+        return parse_json_array(response.text, 'item_index')
+
+    @staticmethod
+    def _is_valid_attrition(result: dict) -> bool:
+        return not conform(result, ATTRITION_SCHEMA)
+
+    def predict_attrition_batch(self, employees: list, max_concurrency: int = None,
+                                bypass_cache: bool = False) -> list:
+        """Predict attrition for many employee summaries; results are in input order"""
+        max_concurrency = max_concurrency or self.max_concurrency
+        results = {}
+        pending = []
+        for i, employee_data in enumerate(employees):
+            cached = None if bypass_cache else self.attrition_cache.get(self.attrition_cache_key(employee_data))
+            if cached is not None:
+                results[i] = cached
+            else:
+                pending.append((i, self.format_employee_data(employee_data)))
+
+        if pending and not self.model_ready:
+            for i, _ in pending:
+                results[i] = {"error": "LLM model not initialized due to configuration error."}
+            pending = []
+
+        budget = max(1, self.pack_token_budget - estimate_tokens(self.create_packed_attrition_prompt([])))
+        packs = pack_items(pending, budget, self.max_pack_size)
+        print(f"Predicting attrition for {len(pending)} employees in {len(packs)} packed requests "
+              f"({len(results)} unchanged and cached)")
+
+        def predict_one(i, _):
+            return self.predict_attrition(employees[i])
+
+        def run_pack(pack):
+            pack_results = resolve_pack(pack, self._predict_attrition_pack, self._is_valid_attrition, predict_one)
+            for i, result in pack_results.items():
+                result.pop('item_index', None)
+                if 'error' not in result:
+                    self.attrition_cache.set(self.attrition_cache_key(employees[i]), result)
+            return pack_results
+
+        for pack_results in map_bounded(run_pack, packs, max_concurrency):
+            results.update(pack_results)
+        return [results[i] for i in range(len(employees))]
@@ -1,12 +1,43 @@
 # src/sentiment_analysis/sentiment_pipeline.py
+import ast
+import os
 import pandas as pd
 from .data_processor import SentimentDataProcessor
+from .feedback_dedup import FeedbackDeduplicator
 from .llm_sentiment_analyzer import LLMSentimentAnalyzer
+from .tier_router import LLM_TIER, LOCAL_TIER, SentimentTierRouter
+from src.utils.metrics import get_metrics
+from src.utils.result_cache import ResultCache
+
+# Attrition predictions are compared month to month, so they outlive the default 7-day result cache
+ATTRITION_CACHE_PATH = os.path.join('.cache', 'attrition_predictions.sqlite')
+ATTRITION_CACHE_TTL_SECONDS = 180 * 24 * 3600
+
+LLM_RESULT_COLUMNS = [
+    'llm_sentiment_score', 'llm_sentiment_label', 'attrition_risk_level',
+    'attrition_risk_score', 'engagement_level', 'key_themes', 'llm_error'
+]
 
 class SentimentAnalysisPipeline:
-    def __init__(self):
+    def __init__(self, use_cache: bool = True, packed_analysis: bool = False, deduplicate: bool = True,
+                 near_duplicate_threshold: float = None, tier_router: SentimentTierRouter = None):
         self.data_processor = SentimentDataProcessor()
-        self.llm_analyzer = LLMSentimentAnalyzer()
+        # Opt-in: decides which rows TextBlob can settle without the LLM; None sends every row to the LLM
+        self.tier_router = tier_router
+        self.llm_analyzer = LLMSentimentAnalyzer(
+            cache=ResultCache(enabled=use_cache),
+            attrition_cache=ResultCache(
+                path=os.getenv('ATTRITION_CACHE_PATH', ATTRITION_CACHE_PATH),
+                ttl_seconds=ATTRITION_CACHE_TTL_SECONDS,
+                enabled=use_cache
+            )
+        )
+        # Send several feedback items per LLM request; best for short survey comments
+        self.packed_analysis = packed_analysis
+        # Only one row per group of identical texts goes to the LLM; near-identical ones too when a
+        # threshold is set (0.9 or stricter is advisable for long comments)
+        self.deduplicator = FeedbackDeduplicator(threshold=near_duplicate_threshold or 1.0) if deduplicate else None
+        self.near_duplicates = bool(near_duplicate_threshold)
     
     def load_feedback_data(self, file_path: str) -> pd.DataFrame:
         """Load employee feedback data"""
@@ -17,51 +48,142 @@ class SentimentAnalysisPipeline:
         else:
             raise ValueError("Unsupported file format")
     
-    def run_sentiment_analysis(self, feedback_df: pd.DataFrame, text_column: str) -> pd.DataFrame:
+    def run_sentiment_analysis(self, feedback_df: pd.DataFrame, text_column: str,
+                               analysis_type: str = 'detailed') -> pd.DataFrame:
         """Run complete sentiment analysis pipeline"""
+        metrics = get_metrics()
         print("Step 1: Processing feedback data...")
-        processed_df = self.data_processor.process_feedback_data(feedback_df, text_column)
+        with metrics.stage('sentiment_analysis', 'preprocess'):
+            processed_df = self.data_processor.process_feedback_data(feedback_df, text_column)
+        
+        if analysis_type == 'basic':
+            tiers = [LOCAL_TIER] * len(processed_df)
+        elif self.tier_router is None:
+            tiers = [LLM_TIER] * len(processed_df)
+        else:
+            tiers = [
+                self.tier_router.route(text, polarity, analysis_type)
+                for text, polarity in zip(processed_df['cleaned_text'], processed_df['textblob_sentiment'])
+            ]
+        llm_rows = [row for row, tier in enumerate(tiers) if tier == LLM_TIER]
+        for tier in (LOCAL_TIER, LLM_TIER):
+            metrics.inc('sentiment_rows_total', tiers.count(tier), tier=tier)
+        print(f"Routing: {len(tiers) - len(llm_rows)} rows resolved locally, {len(llm_rows)} sent to the LLM")
+        
+        feedback_texts = processed_df['processed_text'].iloc[llm_rows].tolist()
+        group_ids = representatives = None
+        if self.deduplicator is not None:
+            # Grouped on the raw text: processed_text has lost stopwords such as "not" and "never"
+            raw_texts = processed_df[text_column].fillna('').astype(str).iloc[llm_rows].tolist()
+            with metrics.stage('sentiment_analysis', 'dedup'):
+                group_ids, representatives, stats = self.deduplicator.group(raw_texts, self.near_duplicates)
+            print(f"Deduplicated {stats['rows']} rows into {stats['groups']} groups "
+                  f"({stats['exact_duplicates']} exact, {stats['near_duplicates']} near duplicates)")
+            feedback_texts = [feedback_texts[row] for row in representatives]
         
         print("Step 2: Running LLM sentiment analysis...")
-        feedback_texts = processed_df['processed_text'].tolist()
-        llm_results = self.llm_analyzer.batch_analyze_sentiments(feedback_texts)
+        with metrics.stage('sentiment_analysis', 'llm_analysis'):
+            llm_results = self.llm_analyzer.batch_analyze_sentiments(feedback_texts, packed=self.packed_analysis)
         
         print("Step 3: Combining results...")
-        # Flatten LLM results into DataFrame columns
-        for i, result in enumerate(llm_results):
-            if 'error' not in result:
-                processed_df.loc[i, 'llm_sentiment_score'] = result.get('sentiment_score', 0)
-                processed_df.loc[i, 'llm_sentiment_label'] = result.get('sentiment_label', 'NEUTRAL')
-                processed_df.loc[i, 'attrition_risk_level'] = result.get('attrition_risk', {}).get('risk_level', 'LOW')
-                processed_df.loc[i, 'attrition_risk_score'] = result.get('attrition_risk', {}).get('risk_score', 0)
-                processed_df.loc[i, 'engagement_level'] = result.get('engagement_level', {}).get('level', 'MEDIUM')
-                processed_df.loc[i, 'key_themes'] = str(result.get('key_themes', []))
-        
-        return processed_df
+        with metrics.stage('sentiment_analysis', 'compile'):
+            if group_ids is not None:
+                # Fan each representative's result back out to every row of its group
+                llm_results = [llm_results[group] for group in group_ids]
+            results = [
+                SentimentTierRouter.local_result(polarity, subjectivity)
+                for polarity, subjectivity in zip(processed_df['textblob_sentiment'], processed_df['textblob_subjectivity'])
+            ]
+            for row, llm_result in zip(llm_rows, llm_results):
+                results[row] = llm_result
+            processed_df = processed_df.assign(analysis_tier=tiers)
+            if group_ids is not None:
+                # Groups cover LLM rows only; locally resolved rows have no group
+                row_groups = [None] * len(tiers)
+                for row, group in zip(llm_rows, group_ids):
+                    row_groups[row] = group
+                processed_df = processed_df.assign(dedup_group_id=pd.array(row_groups, dtype='Int64'))
+            return self.merge_llm_results(processed_df, results)
     
+    @staticmethod
+    def flatten_llm_result(result: dict) -> dict:
+        """Flatten one LLM sentiment result into output columns; errors keep empty values"""
+        if 'error' in result:
+            return {'llm_error': str(result['error'])}
+        attrition_risk = result.get('attrition_risk') or {}
+        engagement = result.get('engagement_level') or {}
+        return {
+            'llm_sentiment_score': result.get('sentiment_score', 0),
+            'llm_sentiment_label': result.get('sentiment_label', 'NEUTRAL'),
+            'attrition_risk_level': attrition_risk.get('risk_level', 'LOW'),
+            'attrition_risk_score': attrition_risk.get('risk_score', 0),
+            'engagement_level': engagement.get('level', 'MEDIUM'),
+            'key_themes': str(result.get('key_themes', [])),
+            'llm_error': ''
+        }
+    
+    def merge_llm_results(self, processed_df: pd.DataFrame, llm_results: list) -> pd.DataFrame:
+        """Attach LLM results to their rows by position"""
+        llm_df = pd.DataFrame(
+            [self.flatten_llm_result(result) for result in llm_results],
+            index=processed_df.index,
+            columns=LLM_RESULT_COLUMNS
+        )
+        llm_df['llm_error'] = llm_df['llm_error'].fillna('')
+        return pd.concat([processed_df.drop(columns=LLM_RESULT_COLUMNS, errors='ignore'), llm_df], axis=1)
+    
+    @staticmethod
+    def parse_themes(values) -> list:
+        """Distinct themes from ``key_themes`` cells (stringified lists), sorted so summaries hash stably"""
+        themes = set()
+        for value in values:
+            try:
+                parsed = ast.literal_eval(value) if isinstance(value, str) and value.startswith('[') else value
+            except (ValueError, SyntaxError):
+                parsed = [value]
+            if isinstance(parsed, (list, tuple)):
+                themes.update(str(theme).strip().lower() for theme in parsed if str(theme).strip())
+        return sorted(themes)
+
+    def build_employee_summaries(self, sentiment_df: pd.DataFrame) -> list:
+        """One summary dict per employee, rounded and normalized so unchanged aggregates give identical summaries"""
+        aggregations = {
+            'llm_sentiment_score': 'mean',
+            'engagement_level': lambda x: x.mode().iloc[0] if not x.mode().empty else 'MEDIUM',
+            'key_themes': self.parse_themes,
+            'feedback_count': 'size',
+        }
+        if 'department' in sentiment_df.columns:
+            aggregations['department'] = lambda x: x.mode().iloc[0] if not x.mode().empty else 'Unknown'
+        employee_summaries = (
+            sentiment_df.assign(feedback_count=1)
+            .groupby('employee_id', sort=True)
+            .agg(aggregations)
+            .reset_index()
+        )
+        summaries = []
+        for employee in employee_summaries.to_dict('records'):
+            summary = {
+                'avg_sentiment': round(float(employee['llm_sentiment_score']), 2)
+                if pd.notna(employee['llm_sentiment_score']) else None,
+                'engagement_level': employee['engagement_level'],
+                'feedback_count': int(employee['feedback_count']),
+                'recent_themes': employee['key_themes'],
+            }
+            if 'department' in employee:
+                summary['department'] = employee['department']
+            summaries.append((employee['employee_id'], summary))
+        return summaries
+
     def generate_attrition_predictions(self, sentiment_df: pd.DataFrame) -> pd.DataFrame:
         """Generate attrition predictions for employees"""
-        # Group by employee if employee_id column exists
-        if 'employee_id' in sentiment_df.columns:
-            employee_summaries = sentiment_df.groupby('employee_id').agg({
-                'llm_sentiment_score': 'mean',
-                'attrition_risk_score': 'mean',
-                'engagement_level': lambda x: x.mode().iloc[0] if not x.empty else 'MEDIUM',
-                'key_themes': lambda x: ', '.join(x.astype(str))
-            }).reset_index()
-            
-            predictions = []
-            for _, employee in employee_summaries.iterrows():
-                employee_data = {
-                    'avg_sentiment': employee['llm_sentiment_score'],
-                    'engagement_level': employee['engagement_level'],
-                    'recent_themes': employee['key_themes'].split(', ')
-                }
-                
-                prediction = self.llm_analyzer.predict_attrition(employee_data)
-                prediction['employee_id'] = employee['employee_id']
-                predictions.append(prediction)
-            
-            return pd.DataFrame(predictions)
-        else:
-            return pd.DataFrame()
\ No newline at end of file
+        if 'employee_id' not in sentiment_df.columns:
+            return pd.DataFrame()
+        
+        with get_metrics().stage('attrition_prediction', 'summarize'):
+            summaries = self.build_employee_summaries(sentiment_df)
+        with get_metrics().stage('attrition_prediction', 'llm_prediction'):
+            predictions = self.llm_analyzer.predict_attrition_batch([summary for _, summary in summaries])
+        for (employee_id, _), prediction in zip(summaries, predictions):
+            prediction['employee_id'] = employee_id
+        return pd.DataFrame(predictions)
\ No newline at end of file
@@ -0,0 +1,70 @@
+# src/sentiment_analysis/tier_router.py
+import re
+from typing import Dict
+
+LOCAL_TIER = 'local'
+LLM_TIER = 'llm'
+
+# Phrases that signal attrition risk, matched as whole words on cleaned text; such rows always go to the LLM
+ATTRITION_KEYWORDS = (
+    'quit', 'quitting', 'resign', 'resigning', 'resignation', 'notice period', 'two weeks notice',
+    'leave the company', 'leaving the company', 'thinking of leaving', 'thinking about leaving',
+    'looking for another job', 'looking for a new job', 'job hunting', 'job search', 'job offer',
+    'other offers', 'burnout', 'burned out', 'burnt out', 'overworked', 'underpaid', 'pay raise denied',
+    'raise denied', 'no raise', 'passed over for promotion', 'no promotion', 'no career growth',
+    'toxic', 'harassment', 'harassed', 'discrimination', 'bullying', 'bullied', 'micromanaged',
+    'micromanagement', 'micromanaging',
+)
+
+
+class SentimentTierRouter:
+    """Decide per feedback row whether TextBlob's score is good enough or the LLM is needed"""
+
+    def __init__(self, polarity_threshold: float = 0.5, max_local_words: int = 25,
+                 neutral_threshold: float = 0.05, max_neutral_words: int = 4,
+                 attrition_keywords=ATTRITION_KEYWORDS):
+        self.polarity_threshold = polarity_threshold
+        self.max_local_words = max_local_words
+        self.neutral_threshold = neutral_threshold
+        self.max_neutral_words = max_neutral_words
+        self.keyword_pattern = re.compile(
+            r'\b(?:' + '|'.join(re.escape(keyword) for keyword in attrition_keywords) + r')\b'
+        ) if attrition_keywords else None
+
+    def is_clear_cut(self, cleaned_text: str, polarity: float) -> bool:
+        words = len(cleaned_text.split())
+        if self.keyword_pattern is not None and self.keyword_pattern.search(cleaned_text):
+            return False
+        if abs(polarity) >= self.polarity_threshold:
+            return words <= self.max_local_words
+        return abs(polarity) <= self.neutral_threshold and words <= self.max_neutral_words
+
+    def route(self, cleaned_text: str, polarity: float, analysis_type: str = 'detailed') -> str:
+        if analysis_type == 'basic':
+            return LOCAL_TIER
+        if analysis_type == 'comprehensive':
+            return LLM_TIER
+        return LOCAL_TIER if self.is_clear_cut(cleaned_text, polarity) else LLM_TIER
+
+    @staticmethod
+    def local_result(polarity: float, subjectivity: float) -> Dict:
+        """A result shaped like the LLM's, derived from TextBlob polarity/subjectivity alone"""
+        score = round(max(-1.0, min(1.0, float(polarity))), 4)
+        risk = round(max(0.0, -score) * 0.6, 4)
+        engagement = round((score + 1) / 2, 4)
+        return {
+            'sentiment_score': score,
+            'sentiment_label': 'POSITIVE' if score > 0.1 else 'NEGATIVE' if score < -0.1 else 'NEUTRAL',
+            # Strong polarity or an objective one-liner ("no comments") are both confident calls
+            'confidence': round(max(abs(score), 1 - float(subjectivity)), 4),
+            'key_themes': [],
+            'attrition_risk': {
+                'risk_level': 'MEDIUM' if risk > 0.33 else 'LOW',
+                'risk_score': risk,
+                'risk_factors': []
+            },
+            'engagement_level': {
+                'level': 'HIGH' if engagement > 0.66 else 'MEDIUM' if engagement > 0.33 else 'LOW',
+                'score': engagement
+            }
+        }
@@ -0,0 +1,94 @@
+# src/utils/concurrency.py
+import logging
+import random
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+from src.utils.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+# Exception class names (matched anywhere in the MRO) of google.api_core, requests and httpx errors
+TRANSIENT_ERROR_NAMES = frozenset((
+    'ResourceExhausted', 'TooManyRequests', 'ServiceUnavailable', 'BadGateway',
+    'DeadlineExceeded', 'InternalServerError', 'GatewayTimeout',
+    'Timeout', 'ConnectTimeout', 'ReadTimeout', 'TimeoutException', 'ConnectionError', 'ConnectError',
+))
+TRANSIENT_STATUS_CODES = frozenset((408, 429, 500, 502, 503, 504))
+
+
+def error_status_code(error: Exception) -> Optional[int]:
+    """HTTP status carried by the error (``code``, ``status_code`` or ``response.status_code``), if any"""
+    for value in (getattr(error, 'code', None), getattr(error, 'status_code', None),
+                  getattr(getattr(error, 'response', None), 'status_code', None)):
+        if isinstance(value, int) and not isinstance(value, bool):
+            return value
+    return None
+
+
+def is_transient_error(error: Exception) -> bool:
+    """Return True for errors worth retrying (quota, overload, network), judged by type and status code"""
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    if any(cls.__name__ in TRANSIENT_ERROR_NAMES for cls in type(error).__mro__):
+        return True
+    return error_status_code(error) in TRANSIENT_STATUS_CODES
+
+
+def retry_with_backoff(func: Callable[[], R], max_retries: int = 3,
+                       base_delay: float = 1.0, max_delay: float = 30.0) -> R:
+    """Call func, retrying transient errors with full-jitter exponential backoff"""
+    attempt = 0
+    while True:
+        try:
+            return func()
+        except Exception as e:
+            if attempt >= max_retries or not is_transient_error(e):
+                raise
+            delay = random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+            attempt += 1
+            get_metrics().inc('retries_total', error=type(e).__name__)
+            logger.warning(f"Transient error ({e}); retry {attempt}/{max_retries} in {delay:.1f}s")
+            time.sleep(delay)
+
+
+def iter_bounded(func: Callable[[T], R], items: Iterable[T],
+                 max_in_flight: int = 8, executor: Executor = None) -> Iterator[Tuple[int, R]]:
+    """Yield (index, result) as calls complete, keeping at most max_in_flight running"""
+    max_in_flight = max(1, max_in_flight)
+    if executor is None:
+        with ThreadPoolExecutor(max_workers=max_in_flight) as own_executor:
+            yield from iter_bounded(func, items, max_in_flight, own_executor)
+        return
+
+    items = iter(items)
+    pending = {}
+    index = 0
+
+    def fill():
+        nonlocal index
+        for item in items:
+            pending[executor.submit(func, item)] = index
+            index += 1
+            if len(pending) >= max_in_flight:
+                break
+
+    fill()
+    while pending:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            yield pending.pop(future), future.result()
+        fill()
+
+
+def map_bounded(func: Callable[[T], R], items: Iterable[T],
+                max_in_flight: int = 8) -> List[R]:
+    """Run func over items concurrently and return results in input order"""
+    results = {}
+    for index, result in iter_bounded(func, items, max_in_flight):
+        results[index] = result
+    return [results[i] for i in range(len(results))]
@@ -0,0 +1,283 @@
+# src/utils/llm_backend.py
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from src.utils.concurrency import error_status_code
+from src.utils.metrics import get_metrics
+from src.utils.rate_limiter import UpstreamScheduler, get_upstream_scheduler
+
+# How long every worker pauses when Gemini reports an exhausted quota despite the scheduler
+QUOTA_BACKOFF_SECONDS = 10.0
+# Quota errors are recognized like transient ones in src/utils/concurrency.py: by type name and status code
+QUOTA_ERROR_NAMES = frozenset(('ResourceExhausted', 'TooManyRequests'))
+
+
+class LLMResponse:
+    """Minimal response object: ``text`` plus token usage when the backend reports it"""
+
+    def __init__(self, text: str, prompt_tokens: int = 0, output_tokens: int = 0):
+        self.text = text
+        self.prompt_tokens = prompt_tokens
+        self.output_tokens = output_tokens
+
+
+class LLMBackend:
+    """Interface shared by every model backend used by the screeners and analyzers"""
+
+    model_name = ''
+
+    def generate(self, prompt: str, response_schema: Dict = None, **kwargs) -> LLMResponse:
+        """Run one completion; ``response_schema`` requests JSON output matching that schema"""
+        raise NotImplementedError
+
+    def available(self) -> bool:
+        """Whether the backend is configured well enough to serve requests"""
+        return True
+
+    def _record_call(self, start: float, response: LLMResponse = None):
+        """Record latency, outcome and token usage of one call started at ``start`` (perf_counter)"""
+        metrics = get_metrics()
+        outcome = 'ok' if response is not None else 'error'
+        metrics.observe('llm_request_duration_seconds', time.perf_counter() - start, model=self.model_name, outcome=outcome)
+        metrics.inc('llm_requests_total', model=self.model_name, outcome=outcome)
+        if response is not None:
+            metrics.inc('llm_tokens_total', response.prompt_tokens, model=self.model_name, kind='prompt')
+            metrics.inc('llm_tokens_total', response.output_tokens, model=self.model_name, kind='output')
+
+
+def is_quota_error(error: Exception) -> bool:
+    if any(cls.__name__ in QUOTA_ERROR_NAMES for cls in type(error).__mro__):
+        return True
+    return error_status_code(error) == 429
+
+
+class GeminiBackend(LLMBackend):
+    """Google Gemini via google.generativeai, paced by the upstream scheduler"""
+
+    def __init__(self, model_name: str = None, scheduler: UpstreamScheduler = None):
+        from config.google_ai_config import GoogleAIConfig
+        self.model_name = model_name or GoogleAIConfig.model_name
+        self.scheduler = scheduler or get_upstream_scheduler(f'gemini:{self.model_name}')
+        self._model = None
+        self._lock = threading.Lock()
+
+    @property
+    def model(self):
+        if self._model is None:
+            from config.google_ai_config import get_shared_model
+            with self._lock:
+                if self._model is None:
+                    self._model = get_shared_model(self.model_name)
+        return self._model
+
+    def available(self) -> bool:
+        try:
+            return self.model is not None
+        except Exception as e:
+            print(f"[ERROR] Failed to initialize GoogleAIConfig: {e}")
+            return False
+
+    def generate(self, prompt: str, response_schema: Dict = None, **kwargs) -> LLMResponse:
+        if response_schema is not None:
+            kwargs['generation_config'] = dict(
+                kwargs.get('generation_config') or {},
+                response_mime_type='application/json',
+                response_schema=response_schema
+            )
+        self.scheduler.acquire()
+        start = time.perf_counter()
+        try:
+            response = self.model.generate_content(prompt, **kwargs)
+        except Exception as e:
+            self._record_call(start)
+            if is_quota_error(e):
+                self.scheduler.backoff(QUOTA_BACKOFF_SECONDS)
+            raise
+        usage = getattr(response, 'usage_metadata', None)
+        result = LLMResponse(
+            response.text,
+            prompt_tokens=getattr(usage, 'prompt_token_count', 0) or 0,
+            output_tokens=getattr(usage, 'candidates_token_count', 0) or 0
+        )
+        self._record_call(start, result)
+        return result
+
+
+class StubBackendError(Exception):
+    """Simulated upstream failure raised by StubBackend"""
+
+    # HTTP status, as on google.api_core's ResourceExhausted
+    code = 429
+
+
+class StubBackend(LLMBackend):
+    """Offline backend returning deterministic, schema-valid JSON with simulated latency and errors"""
+
+    model_name = 'stub'
+
+    def __init__(self, latency_ms: float = 500.0, latency_distribution: str = 'lognormal',
+                 latency_sigma: float = 0.5, error_rate: float = 0.0, malformed_rate: float = 0.0,
+                 seed: Optional[int] = None):
+        self.latency_ms = latency_ms
+        self.latency_distribution = latency_distribution
+        self.latency_sigma = latency_sigma
+        self.error_rate = error_rate
+        self.malformed_rate = malformed_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+
+    def _draw(self) -> Tuple[float, bool, bool]:
+        with self._lock:
+            self.calls += 1
+            if self.latency_distribution == 'constant':
+                latency = self.latency_ms
+            elif self.latency_distribution == 'uniform':
+                latency = self._rng.uniform(0, 2 * self.latency_ms)
+            elif self.latency_distribution == 'exponential':
+                latency = self._rng.expovariate(1.0 / self.latency_ms) if self.latency_ms else 0.0
+            else:
+                latency = self.latency_ms * self._rng.lognormvariate(0, self.latency_sigma)
+            failed = self._rng.random() < self.error_rate
+            malformed = self._rng.random() < self.malformed_rate
+        return latency / 1000.0, failed, malformed
+
+    def generate(self, prompt: str, response_schema: Dict = None, **kwargs) -> LLMResponse:
+        start = time.perf_counter()
+        latency, failed, malformed = self._draw()
+        time.sleep(latency)
+        if failed:
+            self._record_call(start)
+            raise StubBackendError("429 Resource exhausted: simulated quota error")
+        rng = random.Random(hashlib.sha256(prompt.encode('utf-8')).hexdigest())
+        text = json.dumps(self._respond(prompt, rng))
+        if malformed:
+            text = text[:len(text) // 2]
+        response = LLMResponse(text, prompt_tokens=len(prompt) // 4, output_tokens=len(text) // 4)
+        self._record_call(start, response)
+        return response
+
+    def _respond(self, prompt: str, rng: random.Random):
+        resume_ids = re.findall(r'=== RESUME ID: (.+?) ===', prompt)
+        if resume_ids:
+            return [dict(self._screening(rng), resume_id=resume_id) for resume_id in resume_ids]
+        item_indexes = re.findall(r'=== FEEDBACK ITEM (\d+) ===', prompt)
+        if item_indexes:
+            return [dict(self._sentiment(rng), item_index=int(item_index)) for item_index in item_indexes]
+        employee_indexes = re.findall(r'=== EMPLOYEE (\d+) ===', prompt)
+        if employee_indexes:
+            return [dict(self._attrition(rng), item_index=int(item_index)) for item_index in employee_indexes]
+        if 'RESUME TEXT:' in prompt:
+            return self._screening(rng)
+        if 'EMPLOYEE FEEDBACK' in prompt:
+            return self._sentiment(rng)
+        if 'EMPLOYEE DATA' in prompt:
+            return self._attrition(rng)
+        return {}
+
+    @staticmethod
+    def _choice_list(rng: random.Random, options: List[str]) -> List[str]:
+        return rng.sample(options, rng.randint(0, len(options)))
+
+    def _screening(self, rng: random.Random) -> Dict:
+        skills = ['python', 'sql', 'aws', 'docker', 'communication']
+        overall = rng.randint(0, 100)
+        return {
+            "overall_score": overall,
+            "skills_match": {
+                "matched_skills": self._choice_list(rng, skills),
+                "missing_skills": self._choice_list(rng, skills),
+                "skills_score": rng.randint(0, 100)
+            },
+            "experience_match": {
+                "candidate_experience": rng.randint(0, 15),
+                "meets_requirement": rng.random() < 0.5,
+                "experience_score": rng.randint(0, 100)
+            },
+            "education_match": {
+                "candidate_education": self._choice_list(rng, ['bachelor', 'master', 'phd']),
+                "meets_requirement": rng.random() < 0.5,
+                "education_score": rng.randint(0, 100)
+            },
+            "strengths": self._choice_list(rng, ['relevant experience', 'strong skills match', 'leadership']),
+            "concerns": self._choice_list(rng, ['employment gap', 'missing certification']),
+            "recommendation": 'HIRE' if overall >= 75 else 'CONSIDER' if overall >= 50 else 'REJECT'
+        }
+
+    def _sentiment(self, rng: random.Random) -> Dict:
+        score = round(rng.uniform(-1, 1), 2)
+        risk = round(rng.random(), 2)
+        engagement = round(rng.random(), 2)
+        return {
+            "sentiment_score": score,
+            "sentiment_label": 'POSITIVE' if score > 0.2 else 'NEGATIVE' if score < -0.2 else 'NEUTRAL',
+            "confidence": round(rng.uniform(0.5, 1), 2),
+            "key_themes": self._choice_list(rng, ['workload', 'management', 'compensation', 'growth']),
+            "emotional_indicators": self._choice_list(rng, ['frustrated', 'motivated', 'tired']),
+            "attrition_risk": {
+                "risk_level": 'HIGH' if risk > 0.66 else 'MEDIUM' if risk > 0.33 else 'LOW',
+                "risk_score": risk,
+                "risk_factors": self._choice_list(rng, ['low pay', 'limited growth'])
+            },
+            "engagement_level": {
+                "level": 'HIGH' if engagement > 0.66 else 'MEDIUM' if engagement > 0.33 else 'LOW',
+                "score": engagement,
+                "positive_indicators": self._choice_list(rng, ['team support']),
+                "negative_indicators": self._choice_list(rng, ['burnout'])
+            },
+            "actionable_insights": self._choice_list(rng, ['review workload', 'career conversation'])
+        }
+
+    def _attrition(self, rng: random.Random) -> Dict:
+        probability = round(rng.random(), 2)
+        category = 'HIGH' if probability > 0.66 else 'MEDIUM' if probability > 0.33 else 'LOW'
+        return {
+            "attrition_probability": probability,
+            "risk_category": category,
+            "key_risk_factors": self._choice_list(rng, ['low engagement', 'negative sentiment']),
+            "protective_factors": self._choice_list(rng, ['tenure', 'team support']),
+            "recommended_interventions": self._choice_list(rng, ['stay interview', 'compensation review']),
+            "priority_level": 'URGENT' if probability > 0.85 else category,
+            "confidence": round(rng.uniform(0.5, 1), 2)
+        }
+
+
+_backends = {}
+_backends_lock = threading.Lock()
+
+
+def create_backend(name: str) -> LLMBackend:
+    if name == 'gemini':
+        return GeminiBackend()
+    if name == 'stub':
+        seed = os.getenv('LLM_STUB_SEED')
+        return StubBackend(
+            latency_ms=float(os.getenv('LLM_STUB_LATENCY_MS', '500')),
+            latency_distribution=os.getenv('LLM_STUB_LATENCY_DISTRIBUTION', 'lognormal'),
+            latency_sigma=float(os.getenv('LLM_STUB_LATENCY_SIGMA', '0.5')),
+            error_rate=float(os.getenv('LLM_STUB_ERROR_RATE', '0')),
+            malformed_rate=float(os.getenv('LLM_STUB_MALFORMED_RATE', '0')),
+            seed=int(seed) if seed else None
+        )
+    raise ValueError(f"Unknown LLM backend: {name}")
+
+
+def get_backend(name: str = None) -> LLMBackend:
+    """Return the shared backend instance for ``name`` (default: $LLM_BACKEND or gemini)"""
+    name = name or os.getenv('LLM_BACKEND', 'gemini')
+    with _backends_lock:
+        if name not in _backends:
+            _backends[name] = create_backend(name)
+        return _backends[name]
+
+
+def set_backend(backend: LLMBackend, name: str = None):
+    """Register a backend instance as the shared one for ``name`` (e.g. a tuned StubBackend)"""
+    with _backends_lock:
+        _backends[name or os.getenv('LLM_BACKEND', 'gemini')] = backend
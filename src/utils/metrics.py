@@ -0,0 +1,255 @@
+# src/utils/metrics.py
+import atexit
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Tuple
+
+DEFAULT_METRICS_PATH = os.path.join('.cache', 'metrics.sqlite')
+METRIC_PREFIX = 'hr_ai_'
+# Histogram bucket upper bounds in seconds, from a fast local parse to a slow LLM call
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+# Snapshots of processes that have not published for this long are dropped when aggregating
+SNAPSHOT_TTL_SECONDS = 24 * 3600
+
+METRIC_HELP = {
+    'stage_duration_seconds': 'Wall time of one pipeline stage',
+    'document_parse_seconds': 'Time to parse one resume document',
+    'llm_request_duration_seconds': 'Latency of one LLM backend call',
+    'llm_requests_total': 'LLM backend calls by outcome',
+    'llm_tokens_total': 'Tokens sent to and received from the LLM backend',
+    'retries_total': 'Calls retried after a transient error',
+    'llm_reasks_total': 'Follow-up requests for fields missing from a structured response',
+    'upstream_wait_seconds_total': 'Time spent waiting for the upstream quota scheduler',
+    'http_requests_total': 'HTTP requests by endpoint and status',
+    'http_request_duration_seconds': 'HTTP request latency by endpoint',
+    'http_requests_by_hour_total': 'HTTP requests by UTC hour of day',
+    'rate_limited_requests_total': 'HTTP requests rejected by the API rate limiter',
+    'sentiment_rows_total': 'Feedback rows by the tier that analyzed them (local TextBlob or LLM)',
+}
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+class MetricsRegistry:
+    """In-process counters and histograms, optionally published to SQLite for other workers"""
+
+    def __init__(self, path: str = None, publish_interval: float = None, buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+                 publish: bool = None):
+        self.path = path or os.getenv('METRICS_DB', DEFAULT_METRICS_PATH)
+        if publish is None:
+            publish = os.getenv('METRICS_PUBLISH', '').lower() in ('1', 'true', 'yes')
+        self.publishing = publish
+        self.publish_interval = publish_interval or float(os.getenv('METRICS_PUBLISH_INTERVAL', '5'))
+        self.buckets = buckets
+        self.started_at = time.time()
+        self._counters = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._conn = None
+        self._dirty = False
+        self._publisher = None
+        self._pid = None
+
+    def inc(self, name: str, value: float = 1.0, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + value
+            self._dirty = True
+        self._ensure_publisher()
+
+    def observe(self, name: str, value: float, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = {'buckets': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    histogram['buckets'][i] += 1
+            histogram['sum'] += value
+            histogram['count'] += 1
+            self._dirty = True
+        self._ensure_publisher()
+
+    @contextmanager
+    def timer(self, name: str, **labels) -> Iterator[None]:
+        """Observe the wall time of the ``with`` block into histogram ``name``"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def stage(self, pipeline: str, stage: str):
+        return self.timer('stage_duration_seconds', pipeline=pipeline, stage=stage)
+
+    def snapshot(self) -> Dict:
+        """This process's metrics in the serializable form stored per pid"""
+        with self._lock:
+            return {
+                'counters': [[name, list(map(list, labels)), value] for (name, labels), value in self._counters.items()],
+                'histograms': [
+                    [name, list(map(list, labels)), dict(h, buckets=list(h['buckets']))]
+                    for (name, labels), h in self._histograms.items()
+                ],
+            }
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS snapshots ('
+                'pid INTEGER PRIMARY KEY, started_at REAL NOT NULL, updated_at REAL NOT NULL, data TEXT NOT NULL)'
+            )
+            self._conn.commit()
+        return self._conn
+
+    def publish(self):
+        """Write this process's snapshot so other workers can include it"""
+        with self._lock:
+            self._dirty = False
+        data = json.dumps(self.snapshot())
+        with self._db_lock:
+            conn = self._connect()
+            conn.execute(
+                'INSERT OR REPLACE INTO snapshots (pid, started_at, updated_at, data) VALUES (?, ?, ?, ?)',
+                (os.getpid(), self.started_at, time.time(), data)
+            )
+            conn.commit()
+
+    def enable_publishing(self):
+        """Share this process's metrics with the other workers through the SQLite file"""
+        self.publishing = True
+        self._ensure_publisher()
+
+    def _ensure_publisher(self):
+        # Checked per pid: a forked child inherits the parent's object but not its thread
+        if not self.publishing or self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            if self._pid is not None:
+                self._counters, self._histograms, self._conn = {}, {}, None
+            self._pid = os.getpid()
+            self._publisher = threading.Thread(target=self._publish_loop, name='metrics-publisher', daemon=True)
+            self._publisher.start()
+            atexit.register(self._publish_at_exit)
+
+    def _publish_at_exit(self):
+        if self._pid == os.getpid() and self._dirty:
+            self.publish()
+
+    def _publish_loop(self):
+        while True:
+            time.sleep(self.publish_interval)
+            if self._dirty:
+                try:
+                    self.publish()
+                except sqlite3.Error as e:
+                    print(f"Failed to publish metrics: {e}")
+
+    def aggregate(self) -> Dict:
+        """Sum the snapshots of every worker seen in the last day: {'counters': {...}, 'histograms': {...}, 'workers': n}"""
+        if not self.publishing:
+            with self._lock:
+                return {
+                    'counters': dict(self._counters),
+                    'histograms': {key: dict(h, buckets=list(h['buckets'])) for key, h in self._histograms.items()},
+                    'workers': 1,
+                }
+        self.publish()
+        with self._db_lock:
+            conn = self._connect()
+            conn.execute('DELETE FROM snapshots WHERE updated_at < ?', (time.time() - SNAPSHOT_TTL_SECONDS,))
+            conn.commit()
+            rows = conn.execute('SELECT data FROM snapshots').fetchall()
+        counters = {}
+        histograms = {}
+        for (data,) in rows:
+            snapshot = json.loads(data)
+            for name, labels, value in snapshot['counters']:
+                key = (name, tuple(map(tuple, labels)))
+                counters[key] = counters.get(key, 0.0) + value
+            for name, labels, h in snapshot['histograms']:
+                key = (name, tuple(map(tuple, labels)))
+                total = histograms.setdefault(key, {'buckets': [0] * len(self.buckets), 'sum': 0.0, 'count': 0})
+                total['buckets'] = [a + b for a, b in zip(total['buckets'], h['buckets'])]
+                total['sum'] += h['sum']
+                total['count'] += h['count']
+        return {'counters': counters, 'histograms': histograms, 'workers': len(rows)}
+
+    def render_prometheus(self, aggregated: Dict = None) -> str:
+        """Prometheus text exposition format (0.0.4) of the aggregated metrics"""
+        aggregated = aggregated or self.aggregate()
+        lines = []
+        for kind, series in (('counter', aggregated['counters']), ('histogram', aggregated['histograms'])):
+            for name in sorted({name for name, _ in series}):
+                metric = METRIC_PREFIX + name
+                lines.append(f"# HELP {metric} {METRIC_HELP.get(name, name)}")
+                lines.append(f"# TYPE {metric} {kind}")
+                for (series_name, labels), value in sorted(series.items()):
+                    if series_name != name:
+                        continue
+                    if kind == 'counter':
+                        lines.append(f"{metric}{_format_labels(labels)} {_format_value(value)}")
+                        continue
+                    # Bucket counts are already cumulative: observe() counts a value in every bucket it fits
+                    for bound, count in zip(self.buckets, value['buckets']):
+                        lines.append(f"{metric}_bucket{_format_labels(labels + (('le', str(bound)),))} {count}")
+                    lines.append(f"{metric}_bucket{_format_labels(labels + (('le', '+Inf'),))} {value['count']}")
+                    lines.append(f"{metric}_sum{_format_labels(labels)} {_format_value(value['sum'])}")
+                    lines.append(f"{metric}_count{_format_labels(labels)} {value['count']}")
+        lines.append(f"# HELP {METRIC_PREFIX}metrics_workers Worker processes included in these metrics")
+        lines.append(f"# TYPE {METRIC_PREFIX}metrics_workers gauge")
+        lines.append(f"{METRIC_PREFIX}metrics_workers {aggregated['workers']}")
+        return '\n'.join(lines) + '\n'
+
+
+def _format_labels(labels: LabelKey) -> str:
+    if not labels:
+        return ''
+    escaped = (
+        (name, value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')) for name, value in labels
+    )
+    return '{' + ','.join(f'{name}="{value}"' for name, value in escaped) + '}'
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def series_by_label(series: Dict, name: str, label: str) -> Dict[str, float]:
+    """Counter series ``name`` summed per value of ``label``"""
+    totals = {}
+    for (series_name, labels), value in series.items():
+        if series_name == name:
+            key = dict(labels).get(label, '')
+            totals[key] = totals.get(key, 0.0) + value
+    return totals
+
+
+_metrics = None
+_metrics_lock = threading.Lock()
+
+
+def get_metrics() -> MetricsRegistry:
+    """Process-wide metrics registry"""
+    global _metrics
+    with _metrics_lock:
+        if _metrics is None:
+            _metrics = MetricsRegistry()
+        return _metrics
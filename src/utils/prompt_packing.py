@@ -0,0 +1,77 @@
+# src/utils/prompt_packing.py
+from typing import Any, Callable, Dict, Hashable, List, Tuple
+
+from src.utils.structured_output import repair_json
+
+# Rough chars-per-token ratio for English text; good enough for budgeting
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate used for prompt budgeting"""
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+def pack_items(items: List[Tuple[Hashable, str]], token_budget: int, max_items: int) -> List[List[Tuple[Hashable, str]]]:
+    """Greedily group (id, text) items into packs bounded by a token budget and item count"""
+    packs = []
+    current = []
+    current_tokens = 0
+    for item_id, text in items:
+        tokens = estimate_tokens(text)
+        if current and (current_tokens + tokens > token_budget or len(current) >= max_items):
+            packs.append(current)
+            current = []
+            current_tokens = 0
+        current.append((item_id, text))
+        current_tokens += tokens
+    if current:
+        packs.append(current)
+    return packs
+
+
+def parse_json_array(response_text: str, id_field: str) -> Dict[str, dict]:
+    """Parse a JSON array of objects from a model response into {str(id): object}"""
+    entries = repair_json(response_text)
+    if isinstance(entries, dict):
+        entries = [entries]
+    results = {}
+    for entry in entries:
+        if isinstance(entry, dict) and id_field in entry:
+            results[str(entry[id_field])] = entry
+    return results
+
+
+def resolve_pack(pack: List[Tuple[Hashable, str]],
+                 call_pack: Callable[[List[Tuple[Hashable, str]]], Dict[str, dict]],
+                 is_valid: Callable[[dict], bool],
+                 fallback: Callable[[Hashable, str], Any]) -> Dict[Hashable, Any]:
+    """Run one packed call, re-asking only for entries that came back missing or malformed"""
+    if len(pack) == 1:
+        item_id, text = pack[0]
+        return {item_id: fallback(item_id, text)}
+
+    try:
+        response = call_pack(pack)
+    except Exception as e:
+        print(f"Packed call for {len(pack)} items failed: {e}")
+        response = {}
+
+    results = {}
+    missing = []
+    for item_id, text in pack:
+        entry = response.get(str(item_id))
+        if entry is not None and is_valid(entry):
+            results[item_id] = entry
+        else:
+            missing.append((item_id, text))
+
+    if not missing:
+        return results
+    if len(missing) < len(pack):
+        results.update(resolve_pack(missing, call_pack, is_valid, fallback))
+    else:
+        middle = len(pack) // 2
+        results.update(resolve_pack(pack[:middle], call_pack, is_valid, fallback))
+        results.update(resolve_pack(pack[middle:], call_pack, is_valid, fallback))
+    return results
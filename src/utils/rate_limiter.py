@@ -0,0 +1,151 @@
+# src/utils/rate_limiter.py
+import os
+import sqlite3
+import threading
+import time
+from typing import Tuple
+
+from src.utils.metrics import get_metrics
+
+DEFAULT_RATE_LIMIT_PATH = os.path.join('.cache', 'rate_limits.sqlite')
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a reservation would have to wait longer than allowed"""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Rate limit exceeded; retry after {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+
+class SharedTokenBucket:
+    """Token buckets stored in SQLite, so every worker process draws from the same budget"""
+
+    def __init__(self, path: str = None):
+        self.path = path or os.getenv('RATE_LIMIT_DB', DEFAULT_RATE_LIMIT_PATH)
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS buckets ('
+                'key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)'
+            )
+        return self._conn
+
+    def reserve(self, key: str, rate: float, capacity: float, cost: float = 1.0,
+                max_wait: float = 0.0) -> Tuple[bool, float, float]:
+        """Take ``cost`` tokens from bucket ``key``: (granted, wait_seconds, tokens_left)"""
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                row = conn.execute('SELECT tokens, updated_at FROM buckets WHERE key = ?', (key,)).fetchone()
+                tokens = capacity if row is None else min(capacity, row[0] + max(0.0, now - row[1]) * rate)
+                wait = max(0.0, (cost - tokens) / rate) if rate > 0 else 0.0
+                granted = wait <= max_wait
+                if granted:
+                    # May go negative: the caller sleeps ``wait`` for the deficit, queueing callers in arrival order
+                    tokens -= cost
+                conn.execute(
+                    'INSERT OR REPLACE INTO buckets (key, tokens, updated_at) VALUES (?, ?, ?)', (key, tokens, now)
+                )
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+        return granted, wait, tokens
+
+    def drain(self, key: str, rate: float, seconds: float):
+        """Push bucket ``key`` into debt so no caller in any process is granted for ``seconds``"""
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                row = conn.execute('SELECT tokens, updated_at FROM buckets WHERE key = ?', (key,)).fetchone()
+                current = 0.0 if row is None else row[0] + max(0.0, now - row[1]) * rate
+                conn.execute(
+                    'INSERT OR REPLACE INTO buckets (key, tokens, updated_at) VALUES (?, ?, ?)',
+                    (key, min(current, -seconds * rate), now)
+                )
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+
+
+class UpstreamScheduler:
+    """Keeps the request rate to an upstream API under a per-minute quota, across processes"""
+
+    def __init__(self, name: str, requests_per_minute: float, burst: float = None,
+                 max_wait: float = 300.0, bucket: SharedTokenBucket = None):
+        self.key = f'upstream:{name}'
+        self.max_wait = max_wait
+        self.bucket = bucket or SharedTokenBucket()
+        self.waited_seconds = 0.0
+        self.configure(requests_per_minute, burst)
+
+    def configure(self, requests_per_minute: float, burst: float = None):
+        self.requests_per_minute = requests_per_minute
+        self.burst = burst if burst is not None else max(1.0, requests_per_minute // 6)
+        # Refilling at (rpm - burst) / 60 keeps a full burst plus steady traffic under the quota in any minute
+        self.rate = max(requests_per_minute - self.burst, 1.0) / 60.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.requests_per_minute > 0
+
+    def acquire(self):
+        """Block until this process may send one request; raises RateLimitExceeded past ``max_wait``"""
+        if not self.enabled:
+            return
+        granted, wait, _ = self.bucket.reserve(self.key, self.rate, self.burst, max_wait=self.max_wait)
+        if not granted:
+            raise RateLimitExceeded(wait)
+        if wait > 0:
+            self.waited_seconds += wait
+            get_metrics().inc('upstream_wait_seconds_total', wait, upstream=self.key)
+            time.sleep(wait)
+
+    def backoff(self, seconds: float = 10.0):
+        if self.enabled:
+            print(f"Upstream quota hit for {self.key}; pausing all callers for {seconds:.0f}s")
+            self.bucket.drain(self.key, self.rate, seconds)
+
+
+_schedulers = {}
+_schedulers_lock = threading.Lock()
+# Unthrottled unless LLM_REQUESTS_PER_MINUTE is set or the API calls enable_upstream_limits()
+_default_requests_per_minute = 0.0
+
+
+def _configured_limits() -> Tuple[float, float]:
+    rpm = float(os.getenv('LLM_REQUESTS_PER_MINUTE') or _default_requests_per_minute)
+    burst = os.getenv('LLM_REQUEST_BURST')
+    return rpm, float(burst) if burst else None
+
+
+def get_upstream_scheduler(name: str) -> UpstreamScheduler:
+    """Process-wide scheduler for ``name``, configured from LLM_REQUESTS_PER_MINUTE / LLM_REQUEST_BURST"""
+    with _schedulers_lock:
+        if name not in _schedulers:
+            _schedulers[name] = UpstreamScheduler(name, *_configured_limits())
+        return _schedulers[name]
+
+
+def enable_upstream_limits(requests_per_minute: float = 60.0):
+    """Throttle upstream calls of this process at ``requests_per_minute`` unless LLM_REQUESTS_PER_MINUTE overrides it"""
+    global _default_requests_per_minute
+    with _schedulers_lock:
+        _default_requests_per_minute = requests_per_minute
+        limits = _configured_limits()
+        for scheduler in _schedulers.values():
+            scheduler.configure(*limits)
@@ -0,0 +1,106 @@
+# src/utils/result_cache.py
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Optional
+
+DEFAULT_CACHE_PATH = os.path.join('.cache', 'llm_results.sqlite')
+
+
+class ResultCache:
+    """On-disk, content-addressed cache for LLM results with a TTL and LRU eviction"""
+
+    EVICTION_INTERVAL = 64
+
+    def __init__(self, path: str = None, ttl_seconds: float = 7 * 24 * 3600,
+                 max_entries: int = 50000, enabled: bool = True):
+        self.path = path or os.getenv('LLM_CACHE_PATH', DEFAULT_CACHE_PATH)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.enabled = enabled and os.getenv('LLM_CACHE_DISABLED', '').lower() not in ('1', 'true', 'yes')
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._conn = None
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Hash arbitrary JSON-serializable parts into a stable cache key"""
+        payload = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS results ('
+                'key TEXT PRIMARY KEY, value TEXT NOT NULL, '
+                'created_at REAL NOT NULL, last_access REAL NOT NULL)'
+            )
+            self._conn.execute('CREATE INDEX IF NOT EXISTS idx_results_last_access ON results(last_access)')
+            self._conn.commit()
+        return self._conn
+
+    def get(self, key: str) -> Optional[Any]:
+        if not self.enabled:
+            return None
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute('SELECT value, created_at FROM results WHERE key = ?', (key,)).fetchone()
+            if row is None or now - row[1] > self.ttl_seconds:
+                if row is not None:
+                    conn.execute('DELETE FROM results WHERE key = ?', (key,))
+                    conn.commit()
+                self.misses += 1
+                return None
+            conn.execute('UPDATE results SET last_access = ? WHERE key = ?', (now, key))
+            conn.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any):
+        if not self.enabled:
+            return
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                'INSERT OR REPLACE INTO results (key, value, created_at, last_access) VALUES (?, ?, ?, ?)',
+                (key, json.dumps(value, default=str), now, now)
+            )
+            self._writes += 1
+            if self._writes % self.EVICTION_INTERVAL == 0:
+                self._evict(conn, now)
+            conn.commit()
+
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        conn.execute('DELETE FROM results WHERE created_at < ?', (now - self.ttl_seconds,))
+        conn.execute(
+            'DELETE FROM results WHERE key IN ('
+            'SELECT key FROM results ORDER BY last_access DESC LIMIT -1 OFFSET ?)',
+            (self.max_entries,)
+        )
+
+    def clear(self):
+        with self._lock:
+            conn = self._connect()
+            conn.execute('DELETE FROM results')
+            conn.commit()
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'enabled': self.enabled
+        }
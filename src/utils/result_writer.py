@@ -0,0 +1,45 @@
+# src/utils/result_writer.py
+import csv
+import json
+from typing import Dict, Iterable
+
+
+class IncrementalResultWriter:
+    """Append result rows to a CSV or JSONL file (by extension) as they are produced"""
+
+    def __init__(self, output_path: str, append: bool = False):
+        self.output_path = output_path
+        self.append = append
+        self.jsonl = output_path.endswith(('.jsonl', '.ndjson'))
+        self.rows_written = 0
+        self._file = None
+        self._csv_writer = None
+
+    def __enter__(self):
+        self._file = open(self.output_path, 'a' if self.append else 'w', newline='', encoding='utf-8')
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def write(self, row: Dict):
+        if self.jsonl:
+            self._file.write(json.dumps(row, default=str) + '\n')
+        else:
+            if self._csv_writer is None:
+                self._csv_writer = csv.DictWriter(self._file, fieldnames=list(row), extrasaction='ignore')
+                if self._file.tell() == 0:
+                    self._csv_writer.writeheader()
+            self._csv_writer.writerow(row)
+        self._file.flush()
+        self.rows_written += 1
+
+    def write_all(self, rows: Iterable[Dict]) -> int:
+        for row in rows:
+            self.write(row)
+        return self.rows_written
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,245 @@
+# src/utils/structured_output.py
+import json
+import re
+from typing import Any, Callable, Dict, List
+
+from src.utils.metrics import get_metrics
+
+# Schemas use the OpenAPI subset accepted by Gemini's response_schema
+PYTHON_TYPES = {
+    'OBJECT': dict, 'ARRAY': list, 'STRING': str, 'NUMBER': (int, float), 'INTEGER': int, 'BOOLEAN': bool,
+}
+CODE_FENCE = re.compile(r'```(?:json)?\s*(.*?)(?:```|$)', re.DOTALL | re.IGNORECASE)
+PYTHON_LITERALS = {'True': 'true', 'False': 'false', 'None': 'null'}
+# Only the last few cut points are tried when salvaging truncated output
+MAX_CUT_ATTEMPTS = 20
+
+
+def string_enum(*values: str) -> Dict:
+    """STRING schema restricted to ``values`` (Gemini expects ``format: enum`` with ``enum``)"""
+    return {'type': 'STRING', 'format': 'enum', 'enum': list(values)}
+
+
+def _scan(text: str):
+    """Walk JSON-ish text outside strings: (end of first complete value or -1, cut points)"""
+    stack = []
+    in_string = escaped = False
+    cuts = []
+    for i, char in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in '{[':
+            stack.append(char)
+            cuts.append(i + 1)
+        elif char in '}]':
+            if stack:
+                stack.pop()
+            if not stack:
+                return i + 1, cuts
+        elif char == ',':
+            cuts.append(i)
+    return -1, cuts
+
+
+def _close(fragment: str) -> str:
+    """Close an unterminated string and any open objects/arrays at the end of ``fragment``"""
+    stack = []
+    in_string = escaped = False
+    for char in fragment:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in '{[':
+            stack.append('}' if char == '{' else ']')
+        elif char in '}]' and stack:
+            stack.pop()
+    if in_string:
+        fragment += '"'
+    fragment = re.sub(r'[\s,:]+$', '', fragment)
+    # A dangling key without a value ({"a": 1, "b"}) cannot be closed; drop it
+    fragment = re.sub(r'([{,])\s*"[^"]*"$', r'\1', fragment).rstrip(',')
+    return fragment + ''.join(reversed(stack))
+
+
+def _clean(candidate: str) -> str:
+    """Fix defects outside strings: trailing commas and Python literals"""
+    out = []
+    in_string = escaped = False
+    i = 0
+    while i < len(candidate):
+        char = candidate[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+            elif char == '\n':
+                char = '\\n'
+        elif char == '"':
+            in_string = True
+        else:
+            literal = next((k for k in PYTHON_LITERALS if candidate.startswith(k, i)), None)
+            if literal and not candidate[i - 1:i].isalnum():
+                out.append(PYTHON_LITERALS[literal])
+                i += len(literal)
+                continue
+            if char == ',' and re.match(r'\s*[}\]]', candidate[i + 1:]):
+                i += 1
+                continue
+        out.append(char)
+        i += 1
+    return ''.join(out)
+
+
+def repair_json(response_text: str) -> Any:
+    """Parse JSON from a model response, repairing common defects; raises ValueError if nothing parses"""
+    text = response_text or ''
+    fence = CODE_FENCE.search(text)
+    if fence and fence.group(1).strip():
+        text = fence.group(1)
+    starts = [i for i in (text.find('{'), text.find('[')) if i >= 0]
+    if not starts:
+        raise ValueError("No JSON found in model response")
+    text = text[min(starts):]
+
+    end, cuts = _scan(text)
+    if end >= 0:
+        candidates = [text[:end]]
+    else:
+        candidates = [_close(text[:cut]) for cut in reversed(cuts[-MAX_CUT_ATTEMPTS:])]
+    for candidate in candidates:
+        for attempt in (candidate, _clean(candidate)):
+            try:
+                return json.loads(attempt)
+            except json.JSONDecodeError:
+                continue
+    raise ValueError("Could not parse JSON from model response")
+
+
+def _matches(value: Any, schema: Dict) -> bool:
+    expected = PYTHON_TYPES[schema['type']]
+    if isinstance(value, bool) and schema['type'] != 'BOOLEAN':
+        return False
+    if 'enum' in schema and value not in schema['enum']:
+        return False
+    return isinstance(value, expected)
+
+
+def _coerce(value: Any, schema: Dict) -> Any:
+    """Best-effort conversion of near-miss values ("85" -> 85, "true" -> True)"""
+    kind = schema['type']
+    if isinstance(value, str) and 'enum' in schema:
+        # "hire" -> "HIRE"; anything outside the enum stays invalid and is re-asked
+        return next((option for option in schema['enum'] if option.lower() == value.strip().lower()), value)
+    if isinstance(value, str):
+        text = value.strip().rstrip('%')
+        if kind in ('NUMBER', 'INTEGER'):
+            try:
+                number = float(text)
+                return int(number) if kind == 'INTEGER' or number.is_integer() else number
+            except ValueError:
+                return value
+        if kind == 'BOOLEAN' and text.lower() in ('true', 'false', 'yes', 'no'):
+            return text.lower() in ('true', 'yes')
+    if kind == 'ARRAY' and isinstance(value, str):
+        return [item.strip() for item in value.split(',') if item.strip()]
+    return value
+
+
+def conform(result: Any, schema: Dict, path: str = '') -> List[str]:
+    """Coerce ``result`` in place towards ``schema``; return dotted paths of required fields still missing"""
+    if not isinstance(result, dict):
+        return [path] if path else list(schema.get('required', []))
+    missing = []
+    for name in schema.get('required', []):
+        field_schema = schema['properties'][name]
+        field_path = f"{path}.{name}" if path else name
+        if name in result and not _matches(result[name], field_schema):
+            result[name] = _coerce(result[name], field_schema)
+        if field_schema['type'] == 'OBJECT' and isinstance(result.get(name), dict):
+            missing.extend(conform(result[name], field_schema, field_path))
+        elif not _matches(result.get(name), field_schema):
+            missing.append(field_path)
+    return missing
+
+
+def subschema(schema: Dict, paths: List[str]) -> Dict:
+    """Object schema containing only the given dotted paths"""
+    sub = {'type': 'OBJECT', 'properties': {}, 'required': []}
+    for path in paths:
+        source, target = schema, sub
+        parts = path.split('.')
+        for part in parts[:-1]:
+            source = source['properties'][part]
+            if part not in target['properties']:
+                target['properties'][part] = {'type': 'OBJECT', 'properties': {}, 'required': []}
+                target['required'].append(part)
+            target = target['properties'][part]
+        target['properties'][parts[-1]] = source['properties'][parts[-1]]
+        target['required'].append(parts[-1])
+    return sub
+
+
+def merge_fields(result: Dict, patch: Any, paths: List[str]):
+    """Copy the given dotted paths from ``patch`` into ``result`` where present"""
+    for path in paths:
+        parts = path.split('.')
+        value = patch
+        for part in parts:
+            value = value.get(part) if isinstance(value, dict) else None
+        if value is None:
+            continue
+        target = result
+        for part in parts[:-1]:
+            if not isinstance(target.get(part), dict):
+                target[part] = {}
+            target = target[part]
+        target[parts[-1]] = value
+
+
+def create_reask_prompt(prompt: str, missing: List[str]) -> str:
+    return (
+        f"{prompt}\n\n"
+        "Your previous answer was incomplete or malformed. Respond with a JSON object containing "
+        f"ONLY the following fields, using the same format as above: {', '.join(missing)}"
+    )
+
+
+def generate_structured(generate: Callable[..., Any], prompt: str, schema: Dict, max_reasks: int = 1) -> Dict:
+    """Request a JSON object matching ``schema``, re-asking only for fields that come back missing"""
+    try:
+        result = repair_json(generate(prompt, response_schema=schema).text)
+    except ValueError:
+        result = {}
+    if not isinstance(result, dict):
+        result = {}
+    missing = conform(result, schema)
+    for _ in range(max_reasks):
+        if not missing:
+            break
+        print(f"Re-asking for {len(missing)} missing field(s): {', '.join(missing)}")
+        get_metrics().inc('llm_reasks_total')
+        try:
+            patch = repair_json(generate(create_reask_prompt(prompt, missing), response_schema=subschema(schema, missing)).text)
+        except ValueError:
+            continue
+        merge_fields(result, patch, missing)
+        missing = conform(result, schema)
+    if missing:
+        raise ValueError(f"Model response missing required fields: {', '.join(missing)}")
+    return result
@@ -0,0 +1,66 @@
+# tests/test_feedback_dedup.py
+import pytest
+
+from src.sentiment_analysis.feedback_dedup import FeedbackDeduplicator
+
+BASE = ("the new scheduling tool has made planning our sprints much easier and the whole team "
+        "appreciates how quickly managers now respond to requests for time off")
+
+
+@pytest.fixture
+def dedup():
+    return FeedbackDeduplicator(threshold=0.8)
+
+
+def test_exact_duplicates_group_after_whitespace_and_case_normalization(dedup):
+    groups, representatives, stats = dedup.group(['Great team', '  great   TEAM ', 'Bad pay'], near_duplicates=False)
+    assert groups == [0, 0, 1]
+    assert representatives == [0, 2]
+    assert stats == {'rows': 3, 'groups': 2, 'exact_duplicates': 1, 'near_duplicates': 0}
+
+
+def test_near_duplicates_share_a_group(dedup):
+    texts = [BASE, BASE + ' today', 'compensation is below market and nobody explains the bonus formula']
+    groups, representatives, stats = dedup.group(texts)
+    assert groups == [0, 0, 1]
+    assert representatives == [0, 2]
+    assert stats['near_duplicates'] == 1
+
+
+def test_near_duplicates_disabled_keeps_texts_apart(dedup):
+    groups, _, stats = dedup.group([BASE, BASE + ' today'], near_duplicates=False)
+    assert groups == [0, 1]
+    assert stats['near_duplicates'] == 0
+
+
+def test_negated_texts_are_never_merged(dedup):
+    positive = BASE + ' and i am happy with my manager'
+    negated = BASE + " and i am not happy with my manager"
+    # Similar enough to merge if the negation did not differ
+    similarity = (dedup.signature(dedup.normalize(positive)) == dedup.signature(dedup.normalize(negated))).mean()
+    assert similarity >= dedup.threshold
+    groups, _, stats = dedup.group([positive, negated])
+    assert groups == [0, 1]
+    assert stats['near_duplicates'] == 0
+
+
+def test_negations_counts_contractions():
+    assert FeedbackDeduplicator.negations("i don't think it's not fine") == {'dont': 1, 'not': 1}
+
+
+def test_signatures_are_deterministic_for_a_seed():
+    text = FeedbackDeduplicator.normalize(BASE)
+    first = FeedbackDeduplicator(seed=3).signature(text)
+    assert (first == FeedbackDeduplicator(seed=3).signature(text)).all()
+    assert not (first == FeedbackDeduplicator(seed=4).signature(text)).all()
+
+
+def test_empty_texts_group_together_without_near_matching(dedup):
+    groups, representatives, _ = dedup.group(['', ' ', BASE])
+    assert groups == [0, 0, 1]
+    assert representatives == [0, 2]
+
+
+def test_num_perm_must_divide_into_bands():
+    with pytest.raises(ValueError):
+        FeedbackDeduplicator(num_perm=10, bands=3)
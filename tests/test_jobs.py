@@ -0,0 +1,175 @@
+# tests/test_jobs.py
+import json
+import time
+
+import pytest
+
+from api import jobs
+from api.jobs import JobStore, JobWorkerPool, compact_results, iter_unique_results
+from api.models import BatchJobStatus
+
+
+@pytest.fixture
+def store(tmp_path):
+    return JobStore(str(tmp_path))
+
+
+def expire_lease(store, job_id):
+    store._connect().execute('UPDATE jobs SET lease_expires_at = ? WHERE job_id = ?', (time.time() - 1, job_id))
+
+
+def read_rows(path):
+    with open(path, encoding='utf-8') as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+
+def test_claim_takes_oldest_pending_job_once(store):
+    first = store.create('sentiment_analysis', {}, 1)
+    second = store.create('sentiment_analysis', {}, 1)
+    assert store.claim('w1')['job_id'] == first
+    claimed = store.claim('w2')
+    assert claimed['job_id'] == second
+    assert claimed['status'] == BatchJobStatus.PROCESSING.value
+    assert claimed['attempts'] == 1
+    assert store.claim('w3') is None
+    assert store.counts() == {'active_jobs': 2, 'queue_size': 0}
+
+
+def test_expired_lease_is_requeued_and_reclaimed(store):
+    job_id = store.create('sentiment_analysis', {}, 1)
+    store.claim('w1')
+    assert store.requeue_expired() == 0
+    assert store.owns(job_id, 'w1')
+    expire_lease(store, job_id)
+    assert not store.owns(job_id, 'w1')
+    assert store.requeue_expired() == 1
+    reclaimed = store.claim('w2')
+    assert reclaimed['job_id'] == job_id
+    assert reclaimed['attempts'] == 2
+    # The old worker can neither renew nor finish the job any more
+    assert not store.renew(job_id, 'w1')
+    assert not store.finish(job_id, 'w1', BatchJobStatus.COMPLETED, 1)
+    assert store.finish(job_id, 'w2', BatchJobStatus.COMPLETED, 1)
+
+
+def test_job_is_failed_after_max_attempts(tmp_path):
+    store = JobStore(str(tmp_path), max_attempts=2)
+    job_id = store.create('sentiment_analysis', {}, 1)
+    store.claim('w1')
+    expire_lease(store, job_id)
+    assert store.fail_exhausted() == []
+    assert store.requeue_expired() == 1
+    assert store.claim('w2')['attempts'] == 2
+    expire_lease(store, job_id)
+    assert [row['job_id'] for row in store.fail_exhausted()] == [job_id]
+    assert store.requeue_expired() == 0
+    row = store.get(job_id)
+    assert row['status'] == BatchJobStatus.FAILED.value
+    assert row['error_message'] == 'Gave up after 2 attempts: the worker stopped responding'
+    assert row['completed_at'] is not None
+    assert store.claim('w3') is None
+
+
+def test_recover_expired_fails_exhausted_job_and_requeues_others(tmp_path, monkeypatch):
+    store = JobStore(str(tmp_path), max_attempts=2)
+    delivered = []
+    monkeypatch.setattr(jobs, 'deliver_callback', lambda url, payload: delivered.append(payload) or 'delivered')
+    wedged = store.create('sentiment_analysis', {}, 1, callback_url='http://example.test/hook')
+    interrupted = store.create('sentiment_analysis', {}, 1)
+    store.claim('w1')
+    store.claim('w2')
+    # The wedged job is on its last allowed attempt
+    store._connect().execute('UPDATE jobs SET attempts = 2 WHERE job_id = ?', (wedged,))
+    expire_lease(store, wedged)
+    expire_lease(store, interrupted)
+
+    assert JobWorkerPool(store, num_workers=1).recover_expired() == 1
+    assert store.get(interrupted)['status'] == BatchJobStatus.PENDING.value
+    assert store.get(wedged)['status'] == BatchJobStatus.FAILED.value
+    assert store.get(wedged)['callback_status'] == 'delivered'
+    assert delivered[0]['status'] == BatchJobStatus.FAILED.value
+
+
+def test_release_does_not_use_up_attempts(tmp_path):
+    store = JobStore(str(tmp_path), max_attempts=1)
+    job_id = store.create('sentiment_analysis', {}, 1)
+    for _ in range(3):
+        store.claim('w1')
+        store.release(job_id, 'w1', 0)
+    store.claim('w1')
+    expire_lease(store, job_id)
+    assert [row['job_id'] for row in store.fail_exhausted()] == [job_id]
+
+
+def test_release_returns_job_to_queue_with_progress(store):
+    job_id = store.create('sentiment_analysis', {}, 10)
+    store.claim('w1')
+    store.release(job_id, 'w1', 4)
+    row = store.get(job_id)
+    assert row['status'] == BatchJobStatus.PENDING.value
+    assert row['processed_items'] == 4
+
+
+def test_unique_results_keep_first_row_per_item(tmp_path):
+    path = str(tmp_path / 'job.jsonl')
+    with open(path, 'w', encoding='utf-8') as file:
+        for item_index, value in ((0, 'a'), (1, 'b'), (0, 'duplicate'), (2, 'c')):
+            file.write(json.dumps({'item_index': item_index, 'value': value}) + '\n')
+    assert [json.loads(line)['value'] for line in iter_unique_results(path)] == ['a', 'b', 'c']
+    assert compact_results(path) == 1
+    assert [row['value'] for row in read_rows(path)] == ['a', 'b', 'c']
+    assert compact_results(path) == 0
+
+
+def test_completed_items_cuts_torn_last_line(tmp_path):
+    path = str(tmp_path / 'job.jsonl')
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write('{"item_index": 0}\n{"item_index": 1}\n{"item_ind')
+    assert JobWorkerPool.completed_items(path) == {0, 1}
+    with open(path, encoding='utf-8') as file:
+        assert file.read().endswith('}\n')
+
+
+def fake_handler(fail_on=(), calls=None):
+    def handler(input_data):
+        def process_item(index):
+            if calls is not None:
+                calls.append(index)
+            if index in fail_on:
+                raise RuntimeError(f'bad item {index}')
+            return {'value': input_data['texts'][index].upper()}
+        return len(input_data['texts']), process_item
+    return handler
+
+
+def test_run_job_resumes_and_records_item_errors(store, monkeypatch):
+    calls = []
+    monkeypatch.setitem(jobs.JOB_HANDLERS, 'fake', fake_handler(fail_on={2}, calls=calls))
+    job_id = store.create('fake', {'texts': ['a', 'b', 'c', 'd']}, 4)
+    with open(store.result_path(job_id), 'w', encoding='utf-8') as file:
+        file.write(json.dumps({'item_index': 0, 'value': 'A'}) + '\n')
+    pool = JobWorkerPool(store, num_workers=1, item_concurrency=2)
+    pool.run_job(store.claim('w1'), 'w1')
+
+    assert sorted(calls) == [1, 2, 3]
+    rows = {row['item_index']: row for row in read_rows(store.result_path(job_id))}
+    assert rows[3]['value'] == 'D'
+    assert rows[2]['error'] == 'bad item 2'
+    row = store.get(job_id)
+    assert row['status'] == BatchJobStatus.COMPLETED.value
+    assert row['processed_items'] == 4
+    assert row['error_message'] == '1 item(s) failed'
+
+
+def test_run_job_stops_writing_after_losing_lease(store, monkeypatch):
+    monkeypatch.setitem(jobs.JOB_HANDLERS, 'fake', fake_handler())
+    job_id = store.create('fake', {'texts': ['a', 'b']}, 2)
+    job = store.claim('w1')
+    expire_lease(store, job_id)
+    store.requeue_expired()
+    store.claim('w2')
+    JobWorkerPool(store, num_workers=1).run_job(job, 'w1')
+
+    assert JobWorkerPool.completed_items(store.result_path(job_id)) == set()
+    assert store.get(job_id)['worker_id'] == 'w2'
+    assert store.get(job_id)['status'] == BatchJobStatus.PROCESSING.value
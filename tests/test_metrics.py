@@ -0,0 +1,81 @@
+# tests/test_metrics.py
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.jobs import JobStore
+from api.routes import health_router
+from src.utils.metrics import MetricsRegistry
+
+BUCKETS = (0.1, 1.0, 10.0)
+
+
+@pytest.fixture
+def registry(tmp_path):
+    return MetricsRegistry(path=str(tmp_path / 'metrics.sqlite'), buckets=BUCKETS, publish=False)
+
+
+def test_counter_lines(registry):
+    registry.inc('llm_requests_total', outcome='ok')
+    registry.inc('llm_requests_total', 2, outcome='error')
+    registry.inc('retries_total', 0.5)
+    lines = registry.render_prometheus().splitlines()
+    assert lines[:4] == [
+        '# HELP hr_ai_llm_requests_total LLM backend calls by outcome',
+        '# TYPE hr_ai_llm_requests_total counter',
+        'hr_ai_llm_requests_total{outcome="error"} 2',
+        'hr_ai_llm_requests_total{outcome="ok"} 1',
+    ]
+    assert 'hr_ai_retries_total 0.5' in lines
+
+
+def test_histogram_buckets_are_cumulative(registry):
+    for value in (0.05, 0.5, 5.0, 50.0):
+        registry.observe('stage_duration_seconds', value, pipeline='resume', stage='parse')
+    lines = registry.render_prometheus().splitlines()
+    labels = 'pipeline="resume",stage="parse"'
+    start = lines.index('# TYPE hr_ai_stage_duration_seconds histogram')
+    assert lines[start + 1:start + 7] == [
+        f'hr_ai_stage_duration_seconds_bucket{{{labels},le="0.1"}} 1',
+        f'hr_ai_stage_duration_seconds_bucket{{{labels},le="1.0"}} 2',
+        f'hr_ai_stage_duration_seconds_bucket{{{labels},le="10.0"}} 3',
+        f'hr_ai_stage_duration_seconds_bucket{{{labels},le="+Inf"}} 4',
+        f'hr_ai_stage_duration_seconds_sum{{{labels}}} 55.55',
+        f'hr_ai_stage_duration_seconds_count{{{labels}}} 4',
+    ]
+
+
+def test_label_values_are_escaped(registry):
+    registry.inc('http_requests_total', endpoint='/a"b\\c\nd', status=200)
+    text = registry.render_prometheus()
+    assert 'hr_ai_http_requests_total{endpoint="/a\\"b\\\\c\\nd",status="200"} 1\n' in text
+
+
+def test_workers_gauge_ends_the_output(registry):
+    text = registry.render_prometheus()
+    assert text.endswith(
+        '# HELP hr_ai_metrics_workers Worker processes included in these metrics\n'
+        '# TYPE hr_ai_metrics_workers gauge\n'
+        'hr_ai_metrics_workers 1\n'
+    )
+
+
+def test_metrics_endpoint(registry, tmp_path, monkeypatch):
+    store = JobStore(str(tmp_path / 'jobs'))
+    store.create('sentiment_analysis', {'texts': []}, total_items=1)
+    monkeypatch.setattr(health_router, 'get_metrics', lambda: registry)
+    monkeypatch.setattr(health_router, 'get_job_store', lambda: store)
+    registry.inc('rate_limited_requests_total')
+    app = FastAPI()
+    app.include_router(health_router.router, prefix='/api/v1')
+
+    response = TestClient(app).get('/api/v1/metrics')
+    assert response.status_code == 200
+    assert response.headers['content-type'] == 'text/plain; version=0.0.4; charset=utf-8'
+    lines = response.text.splitlines()
+    assert 'hr_ai_rate_limited_requests_total 1' in lines
+    assert 'hr_ai_metrics_workers 1' in lines
+    assert lines[-4:] == [
+        '# TYPE hr_ai_active_jobs gauge', 'hr_ai_active_jobs 0',
+        '# TYPE hr_ai_queue_size gauge', 'hr_ai_queue_size 1',
+    ]
@@ -0,0 +1,62 @@
+# tests/test_prompt_packing.py
+from src.utils.prompt_packing import pack_items, parse_json_array, resolve_pack
+
+
+def is_valid(entry):
+    return 'score' in entry
+
+
+def fallback(item_id, text):
+    return {'score': 0, 'fallback': True}
+
+
+def test_pack_items_respects_budget_and_count():
+    items = [(i, 'x' * 40) for i in range(5)]  # 10 tokens each
+    assert [len(pack) for pack in pack_items(items, token_budget=25, max_items=10)] == [2, 2, 1]
+    assert [len(pack) for pack in pack_items(items, token_budget=1000, max_items=3)] == [3, 2]
+
+
+def test_pack_items_gives_oversized_item_its_own_pack():
+    items = [(0, 'short'), (1, 'x' * 400), (2, 'short')]
+    assert [[item_id for item_id, _ in pack] for pack in pack_items(items, 10, 10)] == [[0], [1], [2]]
+
+
+def test_parse_json_array_keys_by_id_and_skips_entries_without_it():
+    text = '[{"item_index": 0, "score": 1}, {"score": 2}, {"item_index": 1, "sco'
+    assert parse_json_array(text, 'item_index') == {'0': {'item_index': 0, 'score': 1}, '1': {'item_index': 1}}
+
+
+def test_resolve_pack_reasks_only_missing_entries():
+    calls = []
+
+    def call_pack(pack):
+        ids = [item_id for item_id, _ in pack]
+        calls.append(ids)
+        # First call drops item 2 and returns item 1 malformed
+        if len(calls) == 1:
+            return {'0': {'score': 10}, '1': {'oops': True}, '3': {'score': 13}}
+        return {str(item_id): {'score': 20 + item_id} for item_id in ids}
+
+    pack = [(i, f'text {i}') for i in range(4)]
+    results = resolve_pack(pack, call_pack, is_valid, fallback)
+    assert calls == [[0, 1, 2, 3], [1, 2]]
+    assert results == {0: {'score': 10}, 1: {'score': 21}, 2: {'score': 22}, 3: {'score': 13}}
+
+
+def test_resolve_pack_splits_failed_pack_and_falls_back_to_single_calls():
+    calls = []
+
+    def call_pack(pack):
+        calls.append([item_id for item_id, _ in pack])
+        raise RuntimeError('packed call failed')
+
+    results = resolve_pack([(i, f'text {i}') for i in range(4)], call_pack, is_valid, fallback)
+    assert calls == [[0, 1, 2, 3], [0, 1], [2, 3]]
+    assert results == {i: {'score': 0, 'fallback': True} for i in range(4)}
+
+
+def test_resolve_pack_single_item_uses_fallback_only():
+    def call_pack(pack):
+        raise AssertionError('single items are not packed')
+
+    assert resolve_pack([('a', 'text')], call_pack, is_valid, fallback) == {'a': {'score': 0, 'fallback': True}}
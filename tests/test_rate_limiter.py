@@ -0,0 +1,133 @@
+# tests/test_rate_limiter.py
+import pytest
+
+from src.utils import rate_limiter
+from src.utils.llm_backend import QUOTA_BACKOFF_SECONDS, GeminiBackend, StubBackendError, is_quota_error
+from src.utils.rate_limiter import RateLimitExceeded, SharedTokenBucket, UpstreamScheduler
+
+
+@pytest.fixture
+def bucket_path(tmp_path):
+    return str(tmp_path / 'rate_limits.sqlite')
+
+
+def test_reserve_grants_burst_then_refuses(bucket_path):
+    bucket = SharedTokenBucket(bucket_path)
+    for expected_left in (2, 1, 0):
+        granted, wait, left = bucket.reserve('key', rate=0.001, capacity=3)
+        assert granted and wait == 0
+        assert left == pytest.approx(expected_left, abs=0.01)
+    granted, wait, left = bucket.reserve('key', rate=1.0, capacity=3)
+    assert not granted
+    assert 0 < wait <= 1.0
+    # A refused reservation leaves the bucket untouched
+    assert left == pytest.approx(0, abs=0.01)
+
+
+def test_reserve_within_max_wait_goes_into_debt(bucket_path):
+    bucket = SharedTokenBucket(bucket_path)
+    bucket.reserve('key', rate=1.0, capacity=1)
+    granted, wait, left = bucket.reserve('key', rate=1.0, capacity=1, max_wait=5)
+    assert granted
+    assert wait == pytest.approx(1.0, abs=0.05)
+    assert left == pytest.approx(-1.0, abs=0.05)
+    granted, wait, _ = bucket.reserve('key', rate=1.0, capacity=1, max_wait=5)
+    assert granted
+    assert wait == pytest.approx(2.0, abs=0.05)
+
+
+def test_buckets_are_shared_between_instances_and_separate_by_key(bucket_path):
+    first, second = SharedTokenBucket(bucket_path), SharedTokenBucket(bucket_path)
+    assert first.reserve('a', rate=0.001, capacity=1)[0]
+    assert not second.reserve('a', rate=0.001, capacity=1)[0]
+    assert second.reserve('b', rate=0.001, capacity=1)[0]
+
+
+def test_drain_blocks_every_caller(bucket_path):
+    bucket = SharedTokenBucket(bucket_path)
+    bucket.drain('key', rate=1.0, seconds=10)
+    granted, wait, _ = SharedTokenBucket(bucket_path).reserve('key', rate=1.0, capacity=5)
+    assert not granted
+    assert wait == pytest.approx(11.0, abs=0.05)
+
+
+def test_scheduler_raises_past_max_wait(bucket_path):
+    scheduler = UpstreamScheduler('test', requests_per_minute=61, burst=1, max_wait=0.5,
+                                  bucket=SharedTokenBucket(bucket_path))
+    assert scheduler.rate == pytest.approx(1.0)
+    scheduler.acquire()
+    with pytest.raises(RateLimitExceeded) as error:
+        scheduler.acquire()
+    assert error.value.retry_after == pytest.approx(1.0, abs=0.05)
+
+
+def test_scheduler_disabled_without_quota(bucket_path):
+    scheduler = UpstreamScheduler('test', requests_per_minute=0, bucket=SharedTokenBucket(bucket_path))
+    assert not scheduler.enabled
+    for _ in range(100):
+        scheduler.acquire()
+
+
+def test_enable_upstream_limits_reconfigures_existing_schedulers(monkeypatch, bucket_path):
+    monkeypatch.delenv('LLM_REQUESTS_PER_MINUTE', raising=False)
+    monkeypatch.delenv('LLM_REQUEST_BURST', raising=False)
+    monkeypatch.setattr(rate_limiter, '_schedulers', {})
+    monkeypatch.setattr(rate_limiter, '_default_requests_per_minute', 0.0)
+    scheduler = rate_limiter.get_upstream_scheduler('test')
+    assert not scheduler.enabled
+    rate_limiter.enable_upstream_limits(60)
+    assert scheduler.enabled
+    assert scheduler.burst == 10
+    monkeypatch.setenv('LLM_REQUESTS_PER_MINUTE', '0')
+    rate_limiter.enable_upstream_limits(60)
+    assert not scheduler.enabled
+
+
+class ResourceExhausted(Exception):
+    """Stands in for google.api_core.exceptions.ResourceExhausted, matched by name like the real one"""
+
+    code = 429
+
+
+class FakeModel:
+    def __init__(self, error):
+        self.error = error
+
+    def generate_content(self, prompt, **kwargs):
+        raise self.error
+
+
+class RecordingScheduler:
+    def __init__(self):
+        self.backoffs = []
+
+    def acquire(self):
+        pass
+
+    def backoff(self, seconds):
+        self.backoffs.append(seconds)
+
+
+@pytest.mark.parametrize('error, expected', [
+    (ResourceExhausted('quota exceeded'), True),
+    (StubBackendError('simulated'), True),
+    (type('HTTPError', (Exception,), {'status_code': 429})('too many requests'), True),
+    (ValueError('row 429 failed validation'), False),
+    (RuntimeError('quota field missing from response'), False),
+    (type('HTTPError', (Exception,), {'status_code': 503})('unavailable'), False),
+])
+def test_is_quota_error_uses_type_and_status_code(error, expected):
+    assert is_quota_error(error) is expected
+
+
+@pytest.mark.parametrize('error, backoffs', [
+    (ResourceExhausted('quota exceeded'), [QUOTA_BACKOFF_SECONDS]),
+    (ValueError('prompt mentions 429 items'), []),
+])
+def test_gemini_backend_backs_off_only_on_quota_errors(error, backoffs):
+    scheduler = RecordingScheduler()
+    backend = GeminiBackend(model_name='test-model', scheduler=scheduler)
+    backend._model = FakeModel(error)
+    with pytest.raises(type(error)):
+        backend.generate('prompt')
+    assert scheduler.backoffs == backoffs
@@ -0,0 +1,79 @@
+# tests/test_result_cache.py
+import time
+
+import pytest
+
+from src.resume_screening.llm_screener import LLMResumeScreener
+from src.utils.llm_backend import StubBackend
+from src.utils.result_cache import ResultCache
+
+JOB = {'skills': ['python'], 'experience_years': 3, 'education': []}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResultCache(path=str(tmp_path / 'cache.sqlite'), ttl_seconds=60, max_entries=3)
+
+
+def test_get_returns_stored_value_and_counts_hits(cache):
+    assert cache.get('key') is None
+    cache.set('key', {'score': 1})
+    assert cache.get('key') == {'score': 1}
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 1
+
+
+def test_entries_expire_after_ttl(cache):
+    cache.set('key', {'score': 1})
+    cache._connect().execute('UPDATE results SET created_at = ?', (time.time() - 61,))
+    assert cache.get('key') is None
+    assert cache._connect().execute('SELECT COUNT(*) FROM results').fetchone()[0] == 0
+
+
+def test_least_recently_used_entries_are_evicted(cache, monkeypatch):
+    monkeypatch.setattr(ResultCache, 'EVICTION_INTERVAL', 1)
+    for key in ('a', 'b', 'c'):
+        cache.set(key, key)
+        time.sleep(0.01)
+    cache.get('a')
+    cache.set('d', 'd')
+    assert [cache.get(key) for key in ('a', 'b', 'c', 'd')] == ['a', None, 'c', 'd']
+
+
+def test_disabled_cache_stores_nothing(tmp_path):
+    cache = ResultCache(path=str(tmp_path / 'cache.sqlite'), enabled=False)
+    cache.set('key', 1)
+    assert cache.get('key') is None
+
+
+def test_make_key_is_stable_and_order_independent_for_dicts():
+    assert ResultCache.make_key('a', {'x': 1, 'y': 2}) == ResultCache.make_key('a', {'y': 2, 'x': 1})
+    assert ResultCache.make_key('a', 1) != ResultCache.make_key('a', '2')
+
+
+def make_screener(cache, model_name='stub'):
+    backend = StubBackend(latency_ms=0)
+    backend.model_name = model_name
+    return LLMResumeScreener(cache=cache, backend=backend)
+
+
+def test_screening_key_changes_with_prompt_model_job_and_text(cache, monkeypatch):
+    screener = make_screener(cache)
+    key = screener.cache_key('resume text', JOB)
+    assert key == make_screener(cache).cache_key('resume text', JOB)
+    assert key != make_screener(cache, 'other-model').cache_key('resume text', JOB)
+    assert key != screener.cache_key('other resume text', JOB)
+    assert key != screener.cache_key('resume text', dict(JOB, experience_years=5))
+    assert key != screener.cache_key('resume text', JOB, packed=True)
+    monkeypatch.setattr(LLMResumeScreener, 'PROMPT_VERSION', LLMResumeScreener.PROMPT_VERSION + '-next')
+    assert key != screener.cache_key('resume text', JOB)
+
+
+def test_screening_reuses_cached_result_until_model_changes(cache):
+    screener = make_screener(cache)
+    first = screener.screen_resume('Python developer with 5 years of experience', JOB)
+    assert screener.screen_resume('Python developer with 5 years of experience', JOB) == first
+    assert screener.backend.calls == 1
+    other = make_screener(cache, 'other-model')
+    other.screen_resume('Python developer with 5 years of experience', JOB)
+    assert other.backend.calls == 1
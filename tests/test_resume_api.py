@@ -0,0 +1,45 @@
+# tests/test_resume_api.py
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.jobs import resume_screening_handler
+from api.routes.resume_router import router
+
+RESUME = ("Jane Doe\njane@example.com\nSenior software engineer with 6 years of experience in Python, "
+          "Django, PostgreSQL and AWS. Bachelor of Science in Computer Science.")
+JOB = {
+    'title': 'Backend Engineer',
+    'description': 'We are hiring a backend engineer to build Python services on AWS with PostgreSQL databases.',
+    'required_skills': ['Python', 'AWS'],
+    'experience_years': 3,
+}
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(router, prefix='/api/v1/resume')
+    return TestClient(app)
+
+
+@pytest.mark.parametrize('criteria', [None, 'omitted'])
+def test_screen_accepts_null_or_missing_criteria(client, criteria):
+    body = {'job_description': JOB, 'resumes': [{'content': RESUME, 'filename': 'jane.txt'}],
+            'include_analysis': False}
+    if criteria != 'omitted':
+        body['criteria'] = criteria
+    response = client.post('/api/v1/resume/screen', json=body)
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert data['total_resumes'] == 1
+    assert data['summary']['minimum_score'] == 0.5
+    assert data['results'][0]['filename'] == 'jane.txt'
+
+
+def test_screening_job_handler_accepts_null_criteria():
+    total, process_item = resume_screening_handler({
+        'job_description': JOB, 'resumes': [{'content': RESUME}], 'criteria': None, 'include_analysis': False
+    })
+    assert total == 1
+    assert process_item(0)['filename'] == 'resume_1'
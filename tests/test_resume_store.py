@@ -0,0 +1,68 @@
+# tests/test_resume_store.py
+import os
+import time
+
+import pytest
+
+from src.resume_screening.resume_store import ParsedResumeStore
+from src.resume_screening.screening_pipeline import ResumeScreeningPipeline
+
+
+@pytest.fixture
+def folder(tmp_path):
+    folder = tmp_path / 'resumes'
+    folder.mkdir()
+    for name in ('a.txt', 'b.txt'):
+        (folder / name).write_text(f'resume {name}', encoding='utf-8')
+    return folder
+
+
+def make_store(tmp_path, **kwargs):
+    return ParsedResumeStore(str(tmp_path / 'store.sqlite'), parser_version='1', **kwargs)
+
+
+def test_saved_parse_is_found_under_any_path_spelling(tmp_path, folder, monkeypatch):
+    store = make_store(tmp_path)
+    path = str(folder / 'a.txt')
+    assert store.lookup([path]) == ({}, [path])
+    store.save(path, {'text': 'parsed a'}, 0.1)
+    monkeypatch.chdir(tmp_path)
+    relative = os.path.join('.', 'resumes', 'a.txt')
+    assert store.lookup([relative]) == ({relative: {'text': 'parsed a'}}, [])
+
+
+def test_parser_version_change_invalidates(tmp_path, folder):
+    path = str(folder / 'a.txt')
+    make_store(tmp_path).save(path, {'text': 'parsed a'}, 0.1)
+    store = ParsedResumeStore(str(tmp_path / 'store.sqlite'), parser_version='2')
+    assert store.lookup([path]) == ({}, [path])
+
+
+def test_expired_parses_are_ignored_and_pruned(tmp_path, folder):
+    store = make_store(tmp_path, ttl_seconds=60)
+    path = str(folder / 'a.txt')
+    store.lookup([path])
+    store.save(path, {'text': 'parsed a'}, 0.1)
+    store._connect().execute('UPDATE parsed SET parsed_at = ?', (time.time() - 120,))
+    assert store.lookup([path]) == ({}, [path])
+    store.prune(str(folder), [path])
+    assert store._connect().execute('SELECT COUNT(*) FROM parsed').fetchone()[0] == 0
+
+
+def test_prune_forgets_deleted_files(tmp_path, folder):
+    store = make_store(tmp_path)
+    paths = [str(folder / 'a.txt'), str(folder / 'b.txt')]
+    store.lookup(paths)
+    for path in paths:
+        store.save(path, {'text': path}, 0.1)
+    os.remove(paths[1])
+    assert store.prune(str(folder) + os.sep, paths[:1]) == 1
+    assert store._connect().execute('SELECT COUNT(*) FROM parsed').fetchone()[0] == 1
+
+
+def test_pipeline_store_is_opt_in(monkeypatch):
+    monkeypatch.delenv('RESUME_STORE', raising=False)
+    assert ResumeScreeningPipeline(use_cache=False).resume_store is None
+    monkeypatch.setenv('RESUME_STORE', '1')
+    assert ResumeScreeningPipeline(use_cache=False).resume_store is not None
+    assert ResumeScreeningPipeline(use_cache=False, use_resume_store=False).resume_store is None
@@ -0,0 +1,50 @@
+# tests/test_screening_pipeline.py
+import pytest
+
+from src.resume_screening.screening_pipeline import ResumeScreeningPipeline
+from src.utils.llm_backend import StubBackend
+
+RESUMES = {
+    'alice.txt': 'Alice\nalice@example.com\n7 years of experience with Python, Django, PostgreSQL and AWS.',
+    'bob.txt': 'Bob\nbob@example.com\n3 years of experience with Java, Spring Boot and MySQL.',
+    'carol.txt': 'Carol\ncarol@example.com\n5 years of experience with Python, pandas, SQL and Tableau.',
+    'dave.txt': 'Dave\ndave@example.com\n2 years of experience with Photoshop and Figma.',
+}
+JOBS = {
+    'backend': 'Backend engineer with 5 years of experience in Python, Django, PostgreSQL and AWS.',
+    'analyst': 'Data analyst with 3 years of experience in SQL, pandas and Tableau.',
+}
+
+
+@pytest.fixture
+def pipeline(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    folder = tmp_path / 'resumes'
+    folder.mkdir()
+    for filename, text in RESUMES.items():
+        (folder / filename).write_text(text, encoding='utf-8')
+    pipeline = ResumeScreeningPipeline(use_cache=False, use_resume_store=False)
+    pipeline.llm_screener._backend = StubBackend(latency_ms=0)
+    return pipeline, str(folder)
+
+
+def test_multi_job_screening_keeps_not_shortlisted_rows(pipeline):
+    pipeline, folder = pipeline
+    results = pipeline.run_multi_job_screening(folder, JOBS, top_k_per_job=2)
+    for job_id, df in results.items():
+        assert len(df) == len(RESUMES)
+        assert df['llm_screened'].sum() == 2
+        not_shortlisted = df[~df['llm_screened']]
+        assert (not_shortlisted['recommendation'] == 'NOT_SHORTLISTED').all()
+        assert (not_shortlisted['overall_score'] == 0).all()
+        assert not_shortlisted['local_score'].notna().all()
+        assert set(df['job_id']) == {job_id}
+
+
+def test_single_and_multi_job_screening_give_same_rows(pipeline):
+    pipeline, folder = pipeline
+    single = pipeline.run_screening(folder, JOBS['backend'], top_k=2)
+    multi = pipeline.run_multi_job_screening(folder, {'backend': JOBS['backend']}, top_k_per_job=2)['backend']
+    assert len(single) == len(multi) == len(RESUMES)
+    assert (sorted(single.loc[single['recommendation'] == 'NOT_SHORTLISTED', 'filename'])
+            == sorted(multi.loc[multi['recommendation'] == 'NOT_SHORTLISTED', 'filename']))
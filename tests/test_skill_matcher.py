@@ -0,0 +1,67 @@
+# tests/test_skill_matcher.py
+import pytest
+
+from src.resume_screening.job_parser import JobDescriptionParser
+from src.resume_screening.skill_matcher import SkillMatcher, get_skill_matcher
+
+
+@pytest.fixture(scope='module')
+def matcher():
+    return get_skill_matcher()
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('React developer', ['react']),
+    ('Excel and Word power user', ['excel']),
+    ('Worked in sales for 5 years', ['sales']),
+    ('Built APIs with Flask and Express', ['flask', 'express']),
+    ('Pipelines on Snowflake and Redshift, jobs in Spark', ['snowflake', 'redshift', 'spark']),
+    ('Deployed charts with Helm; tested with Jest', ['helm', 'jest']),
+    ('Oracle DBA, some Spring', ['oracle', 'spring']),
+])
+def test_core_skills_match_on_their_own(matcher, text, expected):
+    assert matcher.find_skills(text) == expected
+
+
+def test_longest_form_wins_and_token_boundaries_hold(matcher):
+    assert matcher.find_skills('JavaScript, C++ and C# with Node.js') == ['javascript', 'c++', 'c#', 'node.js']
+    assert matcher.find_skills('javascripting') == []
+
+
+def test_aliases_map_to_canonical_names(matcher):
+    assert matcher.find_skills('Golang services, ReactJS front end') == ['go', 'react']
+    assert matcher.find_skills('Shipped a react-native app') == ['react native']
+
+
+@pytest.mark.parametrize('text', [
+    'Swift delivery of every project',
+    'Removed rust from old pipes',
+    'Go to the office twice a week',
+    'Lean on the team when needed',
+])
+def test_ambiguous_words_in_prose_do_not_match(matcher, text):
+    assert matcher.find_skills(text) == []
+
+
+def test_ambiguous_words_match_in_skill_context_or_as_proper_nouns(matcher):
+    assert matcher.find_skills('Skills: python, rust, docker') == ['python', 'rust', 'docker']
+    assert matcher.find_skills('Built iOS apps in Swift') == ['swift']
+    # An ambiguous neighbour is not context
+    assert matcher.find_skills('swift rust') == []
+
+
+def test_job_description_keeps_core_and_capitalized_skills():
+    requirements = JobDescriptionParser().extract_requirements(
+        'We need a React developer who knows Excel. Services are written in Rust.'
+    )
+    assert requirements['skills'] == ['react', 'excel', 'rust']
+
+
+def test_csv_taxonomy_reads_ambiguous_column(tmp_path):
+    path = tmp_path / 'skills.csv'
+    path.write_text('name,category,aliases,ambiguous\nmaven,tools,apache maven,\nant,tools,apache ant,true\n',
+                    encoding='utf-8')
+    matcher = SkillMatcher.from_file(str(path))
+    assert matcher.find_skills('an ant walked by') == []
+    assert matcher.find_skills('built with maven and ant') == ['maven', 'ant']
+    assert matcher.find_skills('Apache Ant') == ['ant']
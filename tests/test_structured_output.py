@@ -0,0 +1,83 @@
+# tests/test_structured_output.py
+import pytest
+
+from src.utils.structured_output import conform, generate_structured, repair_json, string_enum
+
+SCHEMA = {
+    'type': 'OBJECT',
+    'properties': {
+        'score': {'type': 'INTEGER'},
+        'label': string_enum('HIRE', 'REJECT'),
+        'details': {
+            'type': 'OBJECT',
+            'properties': {'ok': {'type': 'BOOLEAN'}, 'tags': {'type': 'ARRAY', 'items': {'type': 'STRING'}}},
+            'required': ['ok', 'tags'],
+        },
+    },
+    'required': ['score', 'label', 'details'],
+}
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+def test_repair_json_strips_fences_and_prose():
+    assert repair_json('Sure! ```json\n{"a": 1}\n``` hope this helps') == {'a': 1}
+
+
+def test_repair_json_fixes_trailing_commas_and_python_literals():
+    assert repair_json('{"a": [1, 2,], "b": True, "c": None,}') == {'a': [1, 2], 'b': True, 'c': None}
+
+
+def test_repair_json_escapes_raw_newlines_in_strings():
+    assert repair_json('{"a": "line one\nline two"}') == {'a': 'line one\nline two'}
+
+
+def test_repair_json_drops_truncated_member():
+    assert repair_json('{"a": 1, "b": "unfinish') == {'a': 1}
+    assert repair_json('[{"id": 1}, {"id": 2}, {"id"')[:2] == [{'id': 1}, {'id': 2}]
+
+
+def test_repair_json_raises_without_json():
+    with pytest.raises(ValueError):
+        repair_json('no json here')
+
+
+def test_conform_coerces_near_misses():
+    result = {'score': '85', 'label': ' hire ', 'details': {'ok': 'yes', 'tags': 'a, b'}}
+    assert conform(result, SCHEMA) == []
+    assert result == {'score': 85, 'label': 'HIRE', 'details': {'ok': True, 'tags': ['a', 'b']}}
+
+
+def test_conform_reports_missing_and_invalid_paths():
+    result = {'score': 'high', 'label': 'MAYBE', 'details': {'ok': True}}
+    assert conform(result, SCHEMA) == ['score', 'label', 'details.tags']
+
+
+def test_conform_rejects_bool_for_number():
+    assert conform({'score': True, 'label': 'HIRE', 'details': {'ok': True, 'tags': []}}, SCHEMA) == ['score']
+
+
+def test_generate_structured_reasks_only_missing_fields():
+    calls = []
+
+    def generate(prompt, response_schema=None):
+        calls.append(response_schema)
+        if len(calls) == 1:
+            return FakeResponse('{"score": 70, "label": "REJECT", "details": {"ok": false}}')
+        return FakeResponse('{"details": {"tags": ["python"]}}')
+
+    result = generate_structured(generate, 'prompt', SCHEMA)
+    assert result == {'score': 70, 'label': 'REJECT', 'details': {'ok': False, 'tags': ['python']}}
+    assert calls[1]['required'] == ['details']
+    assert calls[1]['properties']['details']['required'] == ['tags']
+
+
+def test_generate_structured_raises_when_still_missing():
+    with pytest.raises(ValueError, match='label'):
+        generate_structured(lambda prompt, response_schema=None: FakeResponse('{"score": 1}'), 'prompt',
+                            {'type': 'OBJECT', 'properties': {'score': {'type': 'INTEGER'},
+                                                              'label': {'type': 'STRING'}},
+                             'required': ['score', 'label']})
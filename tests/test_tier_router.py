@@ -0,0 +1,72 @@
+# tests/test_tier_router.py
+import pandas as pd
+import pytest
+
+from src.sentiment_analysis.sentiment_pipeline import SentimentAnalysisPipeline
+from src.sentiment_analysis.tier_router import LLM_TIER, LOCAL_TIER, SentimentTierRouter
+from src.utils.llm_backend import StubBackend
+
+FEEDBACK = [
+    'I love this amazing team',
+    'I am thinking of leaving the company',
+    'no comments',
+    'The workload is heavy and deadlines keep moving',
+]
+
+
+@pytest.fixture
+def router():
+    return SentimentTierRouter()
+
+
+def test_strongly_polar_short_text_is_local(router):
+    assert router.route('i love this amazing team', 0.6) == LOCAL_TIER
+
+
+def test_attrition_phrase_always_goes_to_llm(router):
+    assert router.route('great pay but i am thinking of leaving', 0.8) == LLM_TIER
+    assert router.route('burnout', 0.0) == LLM_TIER
+
+
+def test_keywords_match_whole_words_only(router):
+    # "quite" and "toxicology" contain keywords but are not attrition signals
+    assert router.route('quite an amazing team', 0.6) == LOCAL_TIER
+    assert router.route('toxicology lab is excellent', 0.9) == LOCAL_TIER
+
+
+def test_neutral_one_liner_is_local_but_long_or_mixed_text_is_not(router):
+    assert router.route('no comments', 0.0) == LOCAL_TIER
+    assert router.route('the workload is heavy and deadlines keep moving', 0.0) == LLM_TIER
+    assert router.route('okay', 0.2) == LLM_TIER
+    assert router.route(' '.join(['great'] * 30), 0.9) == LLM_TIER
+
+
+def test_analysis_type_overrides_routing(router):
+    assert router.route('i am thinking of leaving', -0.9, 'basic') == LOCAL_TIER
+    assert router.route('no comments', 0.0, 'comprehensive') == LLM_TIER
+
+
+def test_local_result_matches_llm_shape():
+    result = SentimentTierRouter.local_result(-0.8, 0.9)
+    assert result['sentiment_label'] == 'NEGATIVE'
+    assert result['attrition_risk']['risk_level'] == 'MEDIUM'
+    assert result['engagement_level']['level'] == 'LOW'
+    assert result['confidence'] == pytest.approx(0.8)
+
+
+def run_pipeline(monkeypatch, tmp_path, tier_router):
+    monkeypatch.chdir(tmp_path)
+    pipeline = SentimentAnalysisPipeline(use_cache=False, tier_router=tier_router)
+    pipeline.llm_analyzer._backend = StubBackend(latency_ms=0)
+    return pipeline.run_sentiment_analysis(pd.DataFrame({'feedback': FEEDBACK}), 'feedback')
+
+
+def test_pipeline_sends_every_row_to_llm_without_router(monkeypatch, tmp_path):
+    results = run_pipeline(monkeypatch, tmp_path, None)
+    assert results['analysis_tier'].tolist() == [LLM_TIER] * 4
+
+
+def test_pipeline_routes_rows_with_router(monkeypatch, tmp_path):
+    results = run_pipeline(monkeypatch, tmp_path, SentimentTierRouter())
+    assert results['analysis_tier'].tolist() == [LOCAL_TIER, LLM_TIER, LOCAL_TIER, LLM_TIER]
+    assert (results['llm_error'] == '').all()
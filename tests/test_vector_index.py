@@ -0,0 +1,63 @@
+# tests/test_vector_index.py
+import numpy as np
+import pytest
+
+from src.resume_screening.vector_index import HashingVectorizer, ResumeVectorIndex
+
+RESUMES = [
+    {'id': 'python', 'text': 'Python developer building Django REST APIs on PostgreSQL and AWS'},
+    {'id': 'frontend', 'text': 'Frontend engineer with React, TypeScript and CSS design systems'},
+    {'id': 'data', 'text': 'Data analyst using Python pandas SQL and Tableau dashboards'},
+    {'id': 'nurse', 'text': 'Registered nurse with intensive care and patient triage experience'},
+    {'id': 'devops', 'text': 'DevOps engineer running Kubernetes, Terraform and AWS pipelines'},
+]
+QUERY = 'Backend Python engineer for Django APIs with PostgreSQL on AWS'
+
+
+@pytest.fixture
+def index():
+    return ResumeVectorIndex().build(RESUMES)
+
+
+def test_rank_puts_best_match_first_and_unrelated_last(index):
+    ranking = index.rank(QUERY)
+    assert ranking[0][0] == 'python'
+    assert ranking[-1][0] == 'nurse'
+    scores = [score for _, score in ranking]
+    assert scores == sorted(scores, reverse=True)
+
+
+@pytest.mark.parametrize('top_k', [1, 2, 3, 5, 10])
+def test_top_k_is_prefix_of_full_ranking(index, top_k):
+    full = index.rank(QUERY)
+    assert index.rank(QUERY, top_k) == full[:top_k]
+
+
+def test_similarities_are_cosine_per_resume_and_query(index):
+    similarities = index.similarities([QUERY, 'intensive care nurse'])
+    assert similarities.shape == (len(RESUMES), 2)
+    assert np.all((similarities >= 0) & (similarities <= 1.0001))
+    assert similarities[:, 1].argmax() == 3
+    # Rows are L2-normalized, so a resume is its own closest match with similarity 1
+    assert index.similarities([RESUMES[1]['text']])[1, 0] == pytest.approx(1.0, abs=1e-5)
+
+
+def test_empty_index_ranks_nothing():
+    index = ResumeVectorIndex().build([])
+    assert index.similarities(['query']).shape == (0, 1)
+    assert index.rank('query', 3) == []
+
+
+def test_vectorizer_is_stable_across_instances():
+    first = HashingVectorizer().transform(['python django developer'])
+    second = HashingVectorizer().transform(['python django developer'])
+    assert (first != second).nnz == 0
+    assert first.nnz == 5  # three unigrams and two bigrams
+
+
+def test_save_and_load_round_trip(index, tmp_path):
+    path = str(tmp_path / 'index')
+    index.save(path)
+    loaded = ResumeVectorIndex.load(path)
+    assert loaded.ids == index.ids
+    assert loaded.rank(QUERY, 3) == index.rank(QUERY, 3)